@@ -0,0 +1,484 @@
+# bench_generators.py
+#
+# Benchmark dei generatori su progetti sintetici (da 10 a 100k entita').
+# Uso:
+#   python bench_generators.py                     # confronta con bench_baseline.json
+#   python bench_generators.py --reference main    # confronta con main, stessa macchina
+#   python bench_generators.py --sizes 10 1000 -r 5
+#   python bench_generators.py --save-baseline     # aggiorna la baseline
+#
+# Per ogni dimensione N il progetto ha N task, N eventi della schedule
+# table e N allarmi. Si misurano i generatori di task, schedule table e
+# allarmi e la pipeline completa (generate_project): tempo migliore su
+# piu' ripetizioni e picco di memoria (tracemalloc, in un'esecuzione a parte).
+# I tempi si confrontano sempre con una misura fatta sulla stessa macchina:
+# - --reference REV: la revisione git REV viene misurata nella stessa
+#   esecuzione (estratta con git archive in una cartella temporanea)
+# - baseline salvata: i suoi tempi sono riscalati con il rapporto fra i
+#   tempi di un carico di calibrazione fisso misurato ora e al salvataggio
+# NON importa PySide6.
+
+import argparse
+import io
+import json
+import platform
+import shutil
+import subprocess
+import sys
+import tarfile
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Dict, List
+
+from project_generator import DEFAULT_TEMPLATES_DIR, GENERATOR_FAMILIES, generate_project
+
+
+DEFAULT_SIZES = [10, 100, 1000, 10000, 100000]
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_BASELINE = SCRIPT_DIR / "bench_baseline.json"
+
+# Regressione: tempo o memoria oltre baseline * (1 + soglia)...
+DEFAULT_THRESHOLD = 0.25
+# ...e oltre questi margini assoluti (sotto sono solo rumore di misura)
+MIN_DELTA_MS = 2.0
+MIN_DELTA_KIB = 64.0
+
+# Non lineare: costo per entita' oltre questo fattore rispetto al minimo
+# misurato sulle dimensioni >= LINEARITY_MIN_SIZE
+LINEARITY_FACTOR = 2.0
+LINEARITY_MIN_SIZE = 1000
+
+# Fasi misurate: le famiglie con tabelle + la pipeline completa
+STAGES = ["tasks", "schedule", "alarms", "end_to_end"]
+
+# Carico di calibrazione: righe formattate come quelle dei generatori
+CALIBRATION_LINES = 200_000
+
+
+# ----------------------------------------------------------------------
+# Progetti sintetici
+# ----------------------------------------------------------------------
+def synthesize_project(n_tasks: int, n_events: int = None, n_alarms: int = None) -> Dict:
+    """
+    Ritorna un progetto (layout di save_project_as) con n_tasks task,
+    n_events eventi della schedule table e n_alarms allarmi (default:
+    quanti i task). Gli allarmi alternano ACTIVATE_TASK / TRIGGER_CALLBACK.
+    """
+    if n_events is None:
+        n_events = n_tasks
+    if n_alarms is None:
+        n_alarms = n_tasks
+    n_ref = max(n_tasks, 1)
+
+    tasks = [
+        {"id": str(i), "name": f"Task_{i}", "priority": str(1 + i % 8)}
+        for i in range(n_tasks)
+    ]
+    schedule = [
+        {"task_id": i % n_ref, "task_name": f"Task_{i % n_ref}", "period_ms": 10 * (1 + i % 10)}
+        for i in range(n_events)
+    ]
+    alarms = []
+    for i in range(n_alarms):
+        if i % 2:
+            alarms.append({
+                "alarm_id": i, "alarm_type": "ONE_SHOT", "alarm_action": "TRIGGER_CALLBACK",
+                "period_ms": 100, "task_id": None, "callback": f"MyAlarmCallback_{i}",
+            })
+        else:
+            alarms.append({
+                "alarm_id": i, "alarm_type": "CYCLIC", "alarm_action": "ACTIVATE_TASK",
+                "period_ms": 100, "task_id": i % n_ref, "callback": None,
+            })
+
+    return {
+        "version": 1,
+        "os": {
+            "scheduler_freq": "1000",
+            "tick_ms": "1",
+            "ready_queue": "100",
+            "hooks": {"startup": True, "shutdown": True, "pre_task": True,
+                      "post_task": True, "error": True},
+        },
+        "tasks": tasks,
+        "schedule": schedule,
+        "alarms": alarms,
+    }
+
+
+# ----------------------------------------------------------------------
+# Misure
+# ----------------------------------------------------------------------
+def _stage_functions(project: Dict, tpl: str) -> Dict:
+    """{fase: fn(out_dir)} per ogni fase misurata."""
+    families = dict(GENERATOR_FAMILIES)
+    stages = {
+        family: (lambda out, fn=families[family]: fn(project, tpl, out))
+        for family in STAGES if family in families
+    }
+    # output in una sottocartella: la cartella del giro resta una cartella
+    # vera da cancellare anche se l'output diventa un link simbolico
+    # (commit_staged_files con versioned)
+    stages["end_to_end"] = lambda out: generate_project(
+        project, output_dir=str(Path(out) / "generated"), templates_dir=tpl
+    )
+    return stages
+
+
+def _best_ms(fn, work_dir: Path, repeat: int) -> float:
+    """Tempo migliore (ms) su repeat esecuzioni, ognuna in una cartella vuota."""
+    best = None
+    for i in range(repeat):
+        out = work_dir / f"run_{i}"
+        out.mkdir()
+        t0 = time.perf_counter()
+        fn(str(out))
+        ms = (time.perf_counter() - t0) * 1000.0
+        shutil.rmtree(out)
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def _peak_kib(fn, work_dir: Path) -> float:
+    """Picco di memoria allocata (KiB) durante fn, escluso il progetto in ingresso."""
+    out = work_dir / "run_mem"
+    out.mkdir()
+    tracemalloc.start()
+    try:
+        start = tracemalloc.get_traced_memory()[0]
+        tracemalloc.reset_peak()
+        fn(str(out))
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+        shutil.rmtree(out)
+    return (peak - start) / 1024.0
+
+
+def calibrate_ms(repeat: int = 5) -> float:
+    """
+    Tempo migliore (ms) di un carico fisso in Python puro (formattazione e
+    join di righe, come i generatori): misura la velocita' della macchina.
+    """
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        "".join(f"  {{{i},     (COUNTER_INIT + {i % 7}),    {i % 97}}}, \n"
+                for i in range(CALIBRATION_LINES))
+        ms = (time.perf_counter() - t0) * 1000.0
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def run_benchmarks(sizes: List[int], repeat: int = 3, templates_dir: str = None,
+                   log=None) -> Dict:
+    """
+    Esegue il benchmark per ogni dimensione in sizes.
+    Ritorna {"meta": {...}, "results": {"N": {fase: {"ms", "peak_kib"}}}}.
+    """
+    tpl = str(templates_dir or DEFAULT_TEMPLATES_DIR)
+    results = {}
+
+    with tempfile.TemporaryDirectory(prefix="chaos-bench-") as tmp:
+        work_dir = Path(tmp)
+        for n in sizes:
+            project = synthesize_project(n)
+            stages = _stage_functions(project, tpl)
+
+            # un giro a vuoto: template in cache, import gia' fatti
+            _best_ms(stages["end_to_end"], work_dir, 1)
+
+            results[str(n)] = {}
+            for stage in STAGES:
+                fn = stages[stage]
+                results[str(n)][stage] = {
+                    "ms": round(_best_ms(fn, work_dir, repeat), 3),
+                    "peak_kib": round(_peak_kib(fn, work_dir), 1),
+                }
+            if log is not None:
+                log(f"  N={n} done")
+
+    return {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "machine": platform.machine(),
+            "repeat": repeat,
+            "calibration_ms": round(calibrate_ms(), 3),
+        },
+        "results": results,
+    }
+
+
+def extract_revision(rev: str, dest: str) -> Path:
+    """
+    Estrae (git archive) la cartella di questo script alla revisione git
+    rev dentro dest e ritorna il percorso della copia.
+    """
+    top = subprocess.run(
+        ["git", "rev-parse", "--show-toplevel"], cwd=str(SCRIPT_DIR),
+        capture_output=True, text=True,
+    )
+    if top.returncode != 0:
+        raise RuntimeError(f"not a git checkout: {top.stderr.strip()}")
+    top = Path(top.stdout.strip()).resolve()
+    rel = SCRIPT_DIR.relative_to(top).as_posix()
+
+    archive = subprocess.run(
+        ["git", "archive", "--format=tar", rev, "--", rel], cwd=str(top),
+        capture_output=True,
+    )
+    if archive.returncode != 0:
+        raise RuntimeError(f"cannot extract '{rev}': {archive.stderr.decode(errors='replace').strip()}")
+    with tarfile.open(fileobj=io.BytesIO(archive.stdout)) as tar:
+        if hasattr(tarfile, "data_filter"):
+            tar.extractall(dest, filter="data")
+        else:
+            tar.extractall(dest)
+    ref_dir = Path(dest) / rel
+    if not (ref_dir / "bench_generators.py").exists():
+        raise RuntimeError(f"'{rev}' has no bench_generators.py")
+    return ref_dir
+
+
+def run_reference(ref_dir: Path, sizes: List[int], repeat: int = 3) -> Dict:
+    """
+    Esegue il bench_generators.py di una revisione estratta (extract_revision)
+    con le stesse dimensioni; ritorna i risultati nel formato di run_benchmarks.
+    """
+    out = ref_dir / "reference.json"
+    if out.exists():
+        out.unlink()
+    # baseline inesistente: lo script della revisione non confronta nulla
+    proc = subprocess.run(
+        [sys.executable, "bench_generators.py", "--sizes", *map(str, sizes), "-r", str(repeat),
+         "--json", str(out), "--baseline", str(ref_dir / "no_baseline.json")],
+        cwd=str(ref_dir), capture_output=True, text=True,
+    )
+    if not out.exists():
+        raise RuntimeError(f"reference benchmark failed:\n{proc.stderr.strip()}")
+    return json.loads(out.read_text(encoding="utf-8"))
+
+
+def best_of(runs: List[Dict]) -> Dict:
+    """Unisce piu' esecuzioni: per ogni fase il tempo e il picco minimi."""
+    merged = json.loads(json.dumps(runs[0]))
+    for run in runs[1:]:
+        if "calibration_ms" in merged["meta"] and "calibration_ms" in run["meta"]:
+            merged["meta"]["calibration_ms"] = min(merged["meta"]["calibration_ms"],
+                                                   run["meta"]["calibration_ms"])
+        for n, stages in run["results"].items():
+            for stage, r in stages.items():
+                best = merged["results"][n][stage]
+                best["ms"] = min(best["ms"], r["ms"])
+                best["peak_kib"] = min(best["peak_kib"], r["peak_kib"])
+    return merged
+
+
+# ----------------------------------------------------------------------
+# Analisi: linearita' e confronto con la baseline
+# ----------------------------------------------------------------------
+def check_linearity(results: Dict) -> List[str]:
+    """
+    Per ogni fase confronta il costo per entita' (us/entita') delle
+    dimensioni >= LINEARITY_MIN_SIZE: se cresce oltre LINEARITY_FACTOR
+    volte il minimo, la generazione non scala linearmente.
+    """
+    problems = []
+    sizes = sorted(int(n) for n in results["results"] if int(n) >= LINEARITY_MIN_SIZE)
+    if len(sizes) < 2:
+        return problems
+    for stage in STAGES:
+        per_entity = {n: results["results"][str(n)][stage]["ms"] * 1000.0 / n for n in sizes}
+        best = min(per_entity.values())
+        for n, us in per_entity.items():
+            if best > 0 and us > best * LINEARITY_FACTOR:
+                problems.append(
+                    f"{stage}: {us:.2f} us/entity at N={n} "
+                    f"(best {best:.2f} us/entity): not linear"
+                )
+    return problems
+
+
+def machine_scale(results: Dict, baseline: Dict) -> float:
+    """
+    Rapporto fra la velocita' della macchina di results e quella di
+    baseline (calibration_ms); 1.0 se una delle due non e' stata calibrata.
+    """
+    cur = results.get("meta", {}).get("calibration_ms")
+    base = baseline.get("meta", {}).get("calibration_ms")
+    if not cur or not base:
+        return 1.0
+    return cur / base
+
+
+def compare_with_baseline(results: Dict, baseline: Dict,
+                          threshold: float = DEFAULT_THRESHOLD,
+                          scale: float = 1.0) -> List[str]:
+    """
+    Ritorna la lista delle regressioni (tempo o memoria oltre la soglia)
+    rispetto a baseline, per le dimensioni presenti in entrambi.
+    scale: fattore per i tempi della baseline (vedi machine_scale); la
+    memoria non dipende dalla macchina e non viene riscalata.
+    """
+    regressions = []
+    for n, stages in results["results"].items():
+        base_stages = baseline.get("results", {}).get(n)
+        if base_stages is None:
+            continue
+        for stage, cur in stages.items():
+            base = base_stages.get(stage)
+            if base is None:
+                continue
+            base = dict(base, ms=base["ms"] * scale)
+            checks = (("ms", "ms", MIN_DELTA_MS), ("peak_kib", "KiB peak", MIN_DELTA_KIB))
+            for key, unit, min_delta in checks:
+                limit = base[key] * (1.0 + threshold)
+                if cur[key] > limit and cur[key] - base[key] > min_delta:
+                    growth = f" (+{(cur[key] / base[key] - 1.0) * 100.0:.0f}%)" if base[key] else ""
+                    regressions.append(
+                        f"N={n} {stage}: {cur[key]:.1f} {unit} vs reference {base[key]:.1f}{growth}"
+                    )
+    return regressions
+
+
+def format_table(results: Dict) -> str:
+    lines = [f"{'N':>8}  {'stage':<11} {'ms':>10} {'us/entity':>10} {'peak KiB':>10}"]
+    for n, stages in results["results"].items():
+        for stage, r in stages.items():
+            lines.append(
+                f"{n:>8}  {stage:<11} {r['ms']:>10.2f} "
+                f"{r['ms'] * 1000.0 / int(n):>10.2f} {r['peak_kib']:>10.1f}"
+            )
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Linea di comando
+# ----------------------------------------------------------------------
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="bench_generators",
+        description="Benchmark the CHAOS configuration generators on synthetic projects.",
+    )
+    parser.add_argument(
+        "--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+        help="number of tasks / schedule events / alarms per project "
+             f"(default: {' '.join(map(str, DEFAULT_SIZES))})",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=3,
+        help="timed runs per stage, the best one is kept (default: 3)",
+    )
+    parser.add_argument(
+        "-t", "--templates-dir", default=str(DEFAULT_TEMPLATES_DIR),
+        help="folder containing the templates (default: templates/ next to this script)",
+    )
+    parser.add_argument(
+        "--baseline", default=str(DEFAULT_BASELINE),
+        help="baseline JSON file (default: bench_baseline.json next to this script)",
+    )
+    parser.add_argument(
+        "--reference", metavar="REV",
+        help="benchmark the git revision REV in the same run and compare against it "
+             "instead of the baseline file",
+    )
+    parser.add_argument(
+        "--rounds", type=int, default=None,
+        help="benchmark rounds, the best time per stage is kept; with --reference "
+             "the reference and the working tree alternate (default: 3 with "
+             "--reference, otherwise 1)",
+    )
+    parser.add_argument(
+        "--save-baseline", action="store_true",
+        help="write the results to the baseline file instead of comparing",
+    )
+    parser.add_argument(
+        "--threshold", type=float, default=DEFAULT_THRESHOLD,
+        help="relative slowdown/memory growth reported as a regression "
+             f"(default: {DEFAULT_THRESHOLD})",
+    )
+    parser.add_argument(
+        "--json", metavar="PATH",
+        help="also write the results to this JSON file",
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+    if args.reference and args.save_baseline:
+        print("error: --reference and --save-baseline cannot be combined", file=sys.stderr)
+        return 2
+
+    # Con --reference le esecuzioni della revisione e del working tree si
+    # alternano: un rallentamento temporaneo della macchina colpisce
+    # entrambe; per ogni fase vale il migliore dei giri
+    rounds = args.rounds or (3 if args.reference else 1)
+    runs, refs = [], []
+    with tempfile.TemporaryDirectory(prefix="chaos-bench-ref-") as tmp:
+        ref_dir = None
+        if args.reference:
+            try:
+                ref_dir = extract_revision(args.reference, tmp)
+            except RuntimeError as e:
+                print(f"error: {e}", file=sys.stderr)
+                return 2
+        for i in range(rounds):
+            if ref_dir is not None:
+                print(f"round {i + 1}/{rounds}: benchmarking {args.reference}...", file=sys.stderr)
+                try:
+                    refs.append(run_reference(ref_dir, args.sizes, args.repeat))
+                except RuntimeError as e:
+                    print(f"error: {e}", file=sys.stderr)
+                    return 2
+            print(f"round {i + 1}/{rounds}: benchmarking sizes {args.sizes} "
+                  f"({args.repeat} runs each)...", file=sys.stderr)
+            runs.append(run_benchmarks(
+                args.sizes, repeat=args.repeat, templates_dir=args.templates_dir,
+                log=lambda msg: print(msg, file=sys.stderr),
+            ))
+    results = best_of(runs)
+    reference = best_of(refs) if refs else None
+    print(format_table(results))
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+    status = 0
+    for problem in check_linearity(results):
+        print(f"warning: {problem}")
+        status = 1
+
+    if args.save_baseline:
+        Path(args.baseline).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        print(f"baseline written to {args.baseline}")
+        return status
+
+    if reference is not None:
+        # stessa macchina, stessa esecuzione: tempi confrontati cosi' come sono
+        label = args.reference
+        regressions = compare_with_baseline(results, reference, args.threshold)
+    else:
+        baseline_path = Path(args.baseline)
+        if not baseline_path.exists():
+            print(f"no baseline at {baseline_path}: run with --save-baseline to create one")
+            return status
+        baseline = json.loads(baseline_path.read_text(encoding="utf-8"))
+        scale = machine_scale(results, baseline)
+        label = f"{baseline_path.name}, times x{scale:.2f} for this machine"
+        regressions = compare_with_baseline(results, baseline, args.threshold, scale)
+
+    for r in regressions:
+        print(f"REGRESSION {r}")
+    if regressions:
+        status = 1
+    else:
+        print(f"no regressions over {args.threshold * 100:.0f}% against {label}")
+    return status
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,282 @@
+# chaos_gen.py
+#
+# Generatore headless (senza GUI) dei file di configurazione CHAOS.
+# Uso:
+#   python chaos_gen.py progetto.chaos_cfg -o generated
+#   python chaos_gen.py --batch boards/ "variants/*.chaos_cfg" -o out -j 8
+#
+# NON importa PySide6: pensato per CI / build firmware.
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+from project_generator import (
+    DEFAULT_TEMPLATES_DIR, OUTPUT_FILES, load_project_file, generate_project,
+    find_project_files, generate_batch, GenerationError, project_counts,
+    apply_project_options
+)
+from instrumentation import Instrumentation, env_report_path, ENV_REPORT
+from schedule_normalizer import normalized_project
+from tick_advisor import advise_tick, format_tick_advice
+from footprint import TARGET_PROFILES, DEFAULT_PROFILE, estimate_footprint, format_footprint
+
+
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="chaos-gen",
+        description="Generate CHAOS RTOS configuration files from a .chaos_cfg project.",
+    )
+    parser.add_argument(
+        "project", nargs="+",
+        help="path of the .chaos_cfg project file "
+             "(with --batch: files, folders or glob patterns)",
+    )
+    parser.add_argument(
+        "-o", "--output-dir", default="generated",
+        help="output folder for the generated files (default: generated); "
+             "with --batch each project goes to <output-dir>/<project name>",
+    )
+    parser.add_argument(
+        "--batch", action="store_true",
+        help="generate many projects in parallel, one process per project",
+    )
+    parser.add_argument(
+        "-j", "--jobs", type=int, default=None,
+        help="number of worker processes in batch mode (default: CPU count)",
+    )
+    parser.add_argument(
+        "--parallel", choices=["thread", "process"], default=None,
+        help="run the OS, task, schedule-table and alarm generators concurrently",
+    )
+    parser.add_argument(
+        "-t", "--templates-dir", default=str(DEFAULT_TEMPLATES_DIR),
+        help="folder containing the templates (default: templates/ next to this script)",
+    )
+    parser.add_argument(
+        "--versioned-output", action="store_true",
+        help="keep the output folder as a symbolic link to a hidden version folder "
+             "(.<name>.v-...) and switch all files with one rename; an existing "
+             "symbolic link not created by chaos-gen is refused",
+    )
+    parser.add_argument(
+        "--normalize", action="store_true",
+        help="merge duplicate and harmonically redundant schedule-table entries and "
+             "report them (by default only if the project enables it)",
+    )
+    parser.add_argument(
+        "--presort-tasks", action="store_true",
+        help="emit Tasks[] already sorted by priority (higher value first), so the "
+             "OS only checks the order at init",
+    )
+    parser.add_argument(
+        "--auto-tick", action="store_true",
+        help="use the longest OS tick that keeps every period exact (within the "
+             "scheduler timer limits) and rescale the schedule-table offsets",
+    )
+    parser.add_argument(
+        "--optimize-offsets", action="store_true",
+        help="choose the schedule-table counter offsets that minimize the peak "
+             "load per tick before generating (needs NumPy)",
+    )
+    parser.add_argument(
+        "--tight-ready-queue", action="store_true",
+        help="set MAX_READY_TASKS to the worst-case ready-queue depth computed "
+             "from the schedule table, alarms and task WCET (needs NumPy; refused "
+             "without WCET; ActivateTask calls at runtime are not counted)",
+    )
+    parser.add_argument(
+        "--target", choices=sorted(TARGET_PROFILES), default=None,
+        help="target profile (pointer/enum size, alignment) for the RAM/ROM "
+             f"footprint estimate (default: {DEFAULT_PROFILE}; not with --batch)",
+    )
+    parser.add_argument(
+        "--perf-report", metavar="PATH", default=None,
+        help="write a JSON report with duration, peak memory, entity counts and "
+             f"bytes written per stage (default: ${ENV_REPORT} if set; not with --batch)",
+    )
+    parser.add_argument(
+        "-q", "--quiet", action="store_true",
+        help="only print errors and the final summary",
+    )
+    return parser
+
+
+# Opzioni che producono un report per progetto: non supportate con --batch
+BATCH_UNSUPPORTED = [
+    ("optimize_offsets", "--optimize-offsets"),
+    ("tight_ready_queue", "--tight-ready-queue"),
+    ("target", "--target"),
+    ("perf_report", "--perf-report"),
+]
+
+
+def project_options(args) -> dict:
+    """Opzioni che modificano il progetto (vedi apply_project_options)."""
+    return {
+        "auto_tick": args.auto_tick,
+        "normalize": args.normalize,
+        "presort_tasks": args.presort_tasks,
+    }
+
+
+def run_batch(args) -> int:
+    t0 = time.perf_counter()
+    files = find_project_files(args.project)
+    if not files:
+        print("chaos-gen: no .chaos_cfg project found", file=sys.stderr)
+        return 2
+
+    results = generate_batch(
+        files,
+        output_root=args.output_dir,
+        templates_dir=args.templates_dir,
+        jobs=args.jobs,
+        options=dict(project_options(args), parallel=args.parallel,
+                     versioned_output=args.versioned_output),
+    )
+
+    failed = [r for r in results if not r["ok"]]
+    for r in results:
+        if r["ok"] and args.quiet:
+            continue
+        status = "OK  " if r["ok"] else "FAIL"
+        line = (
+            f"{status} {r['elapsed_ms']:8.1f} ms  {len(r['changed'])} changed  "
+            f"{r['project']} -> {r['output_dir']}"
+        )
+        if r["error"]:
+            line += f"\n     {r['error']}"
+        for w in r["warnings"]:
+            line += f"\n     warning: {w}"
+        print(line)
+
+    print(
+        f"{len(results) - len(failed)} ok, {len(failed)} failed, "
+        f"{len(results)} projects in {(time.perf_counter() - t0) * 1000:.1f} ms"
+    )
+    return 1 if failed else 0
+
+
+def main(argv=None) -> int:
+    parser = build_arg_parser()
+    args = parser.parse_args(argv)
+
+    if args.batch:
+        unsupported = [flag for attr, flag in BATCH_UNSUPPORTED if getattr(args, attr)]
+        if unsupported:
+            parser.error(f"{', '.join(unsupported)} cannot be used with --batch")
+        return run_batch(args)
+    if args.perf_report is None:
+        args.perf_report = env_report_path()
+    if args.target is None:
+        args.target = DEFAULT_PROFILE
+    if len(args.project) != 1:
+        parser.error("more than one project given: use --batch")
+    project_path = args.project[0]
+
+    # Misure per fase solo se richiesto il report (tracemalloc rallenta)
+    instrumentation = Instrumentation(trace_memory=True) if args.perf_report else None
+
+    t0 = time.perf_counter()
+    try:
+        if instrumentation is not None:
+            with instrumentation.stage("load_project") as record:
+                project = load_project_file(project_path)
+                record["counts"] = project_counts(project)
+        else:
+            project = load_project_file(project_path)
+    except (OSError, ValueError) as e:
+        print(f"chaos-gen: error loading project '{project_path}': {e}", file=sys.stderr)
+        return 2
+
+    # Tick prima della normalizzazione: le entry si confrontano in tick
+    if args.auto_tick and not args.quiet:
+        print(format_tick_advice(advise_tick(project)))
+    project = apply_project_options(project, project_options(args))
+
+    # Normalizzazione prima di ottimizzazioni e analisi: lavorano sulla
+    # schedule table che verra' davvero generata
+    project, merges = normalized_project(project)
+    if not args.quiet:
+        for merge in merges:
+            print(f"schedule table: {merge['message']}")
+
+    if args.optimize_offsets:
+        # import solo se richiesto: il resto della CLI non richiede NumPy
+        from schedule_analysis import optimize_offsets, format_offset_report
+
+        result = optimize_offsets(project)
+        if result["optimized"]:
+            for entry, offset in zip(project.get("schedule", []), result["offsets"]):
+                if offset is not None:
+                    entry["offset"] = offset
+        if not args.quiet:
+            print(format_offset_report(result))
+
+    if args.tight_ready_queue:
+        from schedule_analysis import ready_queue_depth
+
+        result = ready_queue_depth(project)
+        if result["depth"] is None:
+            reason = "CPU utilization >= 100%" if result["overload"] else "hyperperiod too long"
+            print(f"chaos-gen: warning: worst-case ready-queue depth not available ({reason}), "
+                  "MAX_READY_TASKS unchanged", file=sys.stderr)
+        elif result["method"] == "releases":
+            # senza WCET si assume che ogni task termini nel tick di
+            # attivazione: non e' un caso peggiore, come nota la GUI
+            print("chaos-gen: warning: no task has a WCET, the ready-queue depth assumes every "
+                  "task finishes in its release tick; MAX_READY_TASKS unchanged", file=sys.stderr)
+        else:
+            os_cfg = project.setdefault("os", {})
+            # mai una coda vuota (es. nessuna attivazione da tabella)
+            depth = max(result["depth"], 1)
+            if not args.quiet:
+                print(f"MAX_READY_TASKS: {os_cfg.get('ready_queue', '100')} -> {depth} "
+                      f"(worst case at tick {result['tick']})")
+            print("chaos-gen: note: MAX_READY_TASKS bounds only the activations from the schedule "
+                  "table and alarms, not tasks activated at runtime with ActivateTask",
+                  file=sys.stderr)
+            os_cfg["ready_queue"] = str(depth)
+
+    warnings = []
+    try:
+        changed = generate_project(
+            project,
+            output_dir=args.output_dir,
+            templates_dir=args.templates_dir,
+            warnings=warnings,
+            parallel=args.parallel,
+            instrumentation=instrumentation,
+            versioned_output=args.versioned_output,
+        )
+    except GenerationError as e:
+        for family, err in e.errors.items():
+            print(f"chaos-gen: {family} generation failed: {err}", file=sys.stderr)
+        return 1
+    except (OSError, RuntimeError) as e:
+        print(f"chaos-gen: generation failed: {e}", file=sys.stderr)
+        return 1
+    finally:
+        if instrumentation is not None:
+            instrumentation.write_report(args.perf_report)
+
+    for w in warnings:
+        print(f"chaos-gen: warning: {w}", file=sys.stderr)
+
+    if not args.quiet:
+        changed_set = set(changed)
+        for name in OUTPUT_FILES:
+            path = str(Path(args.output_dir) / name)
+            print(f"{'updated  ' if path in changed_set else 'unchanged'} {path}")
+        print(format_footprint(estimate_footprint(project, args.target)))
+    print(
+        f"{len(changed)} of {len(OUTPUT_FILES)} files changed "
+        f"in {(time.perf_counter() - t0) * 1000:.1f} ms"
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
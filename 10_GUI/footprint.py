@@ -0,0 +1,155 @@
+# footprint.py
+#
+# Stima dell'occupazione di memoria (RAM/ROM) delle tabelle generate:
+#   TbcType Tasks[], SchedTblType SchedTable[], SchedTblListType
+#   SchedTableList[], AlarmType Alarm_ID_N, AlarmListType AlarmList[],
+#   ready queue (MAX_READY_TASKS), TaskNumber / AutoStartTaskNumber
+# per un profilo di target (dimensione dei puntatori, degli enum e
+# allineamento massimo). Solo i dati di configurazione: il codice del
+# kernel non e' contato.
+# Questo modulo NON deve importare PySide6 (usato anche da chaos_gen.py).
+
+from typing import Dict, List
+
+from generator_utils import as_int
+
+
+# ----------------------------------------------------------------------
+# Profili di target
+#   ptr:   puntatori a dati e a funzione (byte)
+#   enum:  dimensione di un enum (es. -fshort-enums -> 1)
+#   align: allineamento massimo dei campi (1 = struct impaccate)
+# ----------------------------------------------------------------------
+TARGET_PROFILES = {
+    "cortex-m": {"label": "ARM Cortex-M (32-bit)", "ptr": 4, "enum": 4, "align": 4},
+    "cortex-m-short-enums": {"label": "ARM Cortex-M, -fshort-enums", "ptr": 4, "enum": 1, "align": 4},
+    "pic32": {"label": "PIC32 (MIPS, 32-bit)", "ptr": 4, "enum": 4, "align": 4},
+    "pic24-dspic": {"label": "PIC24 / dsPIC (16-bit)", "ptr": 2, "enum": 2, "align": 2},
+    "msp430": {"label": "MSP430 (16-bit)", "ptr": 2, "enum": 2, "align": 2},
+    "avr": {"label": "AVR (8-bit)", "ptr": 2, "enum": 2, "align": 1},
+    "pic18": {"label": "PIC18 / PIC16, XC8 (8-bit)", "ptr": 2, "enum": 1, "align": 1},
+    "host-64": {"label": "64-bit host (simulation)", "ptr": 8, "enum": 4, "align": 8},
+}
+
+DEFAULT_PROFILE = "cortex-m"
+
+# Dimensione (byte) dei campi interi delle strutture del kernel: i tipi
+# sono quelli del kernel, non dipendono dai valori del progetto (SetAlarm
+# puo' impostare a runtime timeout piu' grandi di quelli configurati)
+FIELD_TYPES = {
+    "task_id": 2,         # ID dei task
+    "priority": 1,        # priorita' dei task
+    "sched_counter": 4,   # contatori della schedule table
+    "sched_timeout": 4,   # timeout della schedule table
+    "alarm_id": 2,        # ID degli allarmi
+    "alarm_counter": 4,   # contatori degli allarmi
+    "alarm_timeout": 4,   # timeout degli allarmi
+    "table_id": 2,        # ID della schedule table
+    "count": 2,           # numero di eventi / task (uint16_t)
+}
+
+# Campi delle strutture, nell'ordine delle colonne dei template.
+# Tipi: "ptr" (puntatore / puntatore a funzione), "enum" o una chiave di FIELD_TYPES
+STRUCT_LAYOUTS = {
+    "TbcType": ["task_id", "ptr", "enum", "priority"],
+    "SchedTblType": ["task_id", "sched_counter", "sched_timeout"],
+    "SchedTblListType": ["table_id", "count", "enum", "ptr"],
+    "AlarmType": ["enum", "alarm_counter", "alarm_timeout", "enum", "task_id", "ptr"],
+    "AlarmListType": ["alarm_id", "enum", "ptr"],
+}
+
+
+def struct_size(fields: List[str], profile: Dict, types: Dict = None) -> int:
+    """
+    sizeof della struct con le regole di layout del C: ogni campo e'
+    allineato alla sua dimensione (al massimo profile["align"]) e la
+    struct e' riempita fino a un multiplo dell'allineamento del campo piu' grande.
+    """
+    types = types or FIELD_TYPES
+    offset = 0
+    struct_align = 1
+    for field in fields:
+        size = profile[field] if field in ("ptr", "enum") else types[field]
+        align = min(size, profile["align"])
+        offset += -offset % align
+        offset += size
+        struct_align = max(struct_align, align)
+    return offset + (-offset % struct_align)
+
+
+def _count_tasks(tasks: List[Dict]) -> int:
+    """Righe di Tasks[]: i task senza nome non vengono generati."""
+    return sum(1 for t in tasks if (t.get("name") or "").strip())
+
+
+def _ready_queue_size(project: Dict) -> int:
+    return max(0, as_int((project.get("os", {}) or {}).get("ready_queue", "100")))
+
+
+def estimate_footprint(project: Dict, profile: str = DEFAULT_PROFILE,
+                       types: Dict = None) -> Dict:
+    """
+    project: dict con il layout di save_project_as
+    profile: chiave di TARGET_PROFILES
+    types:   dimensioni dei campi interi (default FIELD_TYPES)
+
+    Ritorna:
+        {"profile": str, "tables": [{"name", "type", "count", "size",
+         "ram", "rom"}], "ram": int, "rom": int}
+    Le variabili inizializzate e modificabili (.data) occupano RAM e,
+    per i valori iniziali, anche ROM; le const solo ROM; la ready queue
+    (non inizializzata, .bss) solo RAM.
+    """
+    target = TARGET_PROFILES[profile]
+    types = dict(FIELD_TYPES, **(types or {}))
+
+    n_tasks = _count_tasks(project.get("tasks", []) or [])
+    n_events = len(project.get("schedule", []) or [])
+    n_alarms = len(project.get("alarms", []) or [])
+
+    # (nome, tipo, numero di elementi, dimensione elemento, sezione)
+    rows = [
+        ("Tasks[]", "TbcType", n_tasks, struct_size(STRUCT_LAYOUTS["TbcType"], target, types), "data"),
+        ("TaskNumber, AutoStartTaskNumber", "const uint16_t", 2, 2, "const"),
+        ("SchedTable[]", "SchedTblType", n_events,
+         struct_size(STRUCT_LAYOUTS["SchedTblType"], target, types), "data"),
+        ("SchedTableList[]", "SchedTblListType", 1,
+         struct_size(STRUCT_LAYOUTS["SchedTblListType"], target, types), "data"),
+        ("Alarm_ID_N", "AlarmType", n_alarms, struct_size(STRUCT_LAYOUTS["AlarmType"], target, types), "data"),
+        ("AlarmList[]", "AlarmListType", n_alarms,
+         struct_size(STRUCT_LAYOUTS["AlarmListType"], target, types), "data"),
+        # ready queue: un puntatore al TbcType per posto
+        ("ready queue", "TbcType *", _ready_queue_size(project), target["ptr"], "bss"),
+    ]
+
+    tables = []
+    for name, ctype, count, size, section in rows:
+        total = count * size
+        tables.append({
+            "name": name,
+            "type": ctype,
+            "count": count,
+            "size": size,
+            "ram": total if section in ("data", "bss") else 0,
+            "rom": total if section in ("data", "const") else 0,
+        })
+
+    return {
+        "profile": profile,
+        "tables": tables,
+        "ram": sum(t["ram"] for t in tables),
+        "rom": sum(t["rom"] for t in tables),
+    }
+
+
+def format_footprint(result: Dict) -> str:
+    lines = [
+        f"memory footprint ({TARGET_PROFILES[result['profile']]['label']}):",
+        f"  {'table':<34} {'count':>6} {'each':>5} {'RAM':>8} {'ROM':>8}",
+    ]
+    for t in result["tables"]:
+        lines.append(
+            f"  {t['name']:<34} {t['count']:>6} {t['size']:>5} {t['ram']:>8} {t['rom']:>8}"
+        )
+    lines.append(f"  {'total (bytes)':<34} {'':>6} {'':>5} {result['ram']:>8} {result['rom']:>8}")
+    return "\n".join(lines)
@@ -0,0 +1,71 @@
+# generation_worker.py
+#
+# Generazione del codice in background (QThreadPool) per non bloccare la GUI.
+# Il lavoro vero e' in project_generator.generate_project; qui si inoltrano
+# progresso / esito alla GUI tramite signal.
+
+import threading
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from project_generator import generate_project, GenerationError, GenerationCancelled
+
+
+class GenerationSignals(QObject):
+    # done, total, file appena generati
+    progress = Signal(int, int, str)
+    # {"changed": [...], "warnings": [...], "timings": {stage: ms}}
+    finished = Signal(object)
+    # {famiglia: eccezione}
+    failed = Signal(object)
+    cancelled = Signal()
+
+
+class GenerationWorker(QRunnable):
+    def __init__(self, project: dict, output_dir: str, templates_dir: str,
+                 instrumentation=None):
+        super().__init__()
+        self.project = project
+        self.output_dir = output_dir
+        self.templates_dir = templates_dir
+        # Instrumentation (opzionale) dove registrare le fasi della generazione
+        self.instrumentation = instrumentation
+        self.signals = GenerationSignals()
+        self._cancel = threading.Event()
+
+    # ------------------------------------------------------------------
+    # Chiamato dal thread GUI (pulsante Cancel)
+    # ------------------------------------------------------------------
+    def cancel(self):
+        self._cancel.set()
+
+    def run(self):
+        warnings = []
+        timings = {}
+        try:
+            changed = generate_project(
+                self.project,
+                output_dir=self.output_dir,
+                templates_dir=self.templates_dir,
+                warnings=warnings,
+                parallel="thread",
+                progress=self.signals.progress.emit,
+                cancel=self._cancel,
+                timings=timings,
+                instrumentation=self.instrumentation,
+            )
+        except GenerationCancelled:
+            self.signals.cancelled.emit()
+            return
+        except GenerationError as e:
+            self.signals.failed.emit(e.errors)
+            return
+        except Exception as e:
+            self.signals.failed.emit({"generation": e})
+            return
+
+        self.signals.finished.emit({
+            "changed": changed,
+            "warnings": warnings,
+            "timings": timings,
+        })
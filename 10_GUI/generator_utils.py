@@ -0,0 +1,430 @@
+# generator_utils.py
+#
+# Funzioni di supporto comuni ai generatori os_*_cfg_generator.py
+
+import hashlib
+import os
+import re
+import shutil
+import time
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+
+def _encode_output(text: str) -> bytes:
+    """
+    Bytes esattamente come li scriverebbe Path.write_text(text, "utf-8")
+    (in modalita' testo '\\n' diventa os.linesep, es. CRLF su Windows).
+    """
+    if os.linesep != "\n":
+        text = text.replace("\n", os.linesep)
+    return text.encode("utf-8")
+
+
+# ----------------------------------------------------------------------
+# Sostituzione dei #define (un solo passaggio per molti simboli)
+# ----------------------------------------------------------------------
+@lru_cache(maxsize=64)
+def _define_pattern(names: Tuple[str, ...]):
+    r"""
+    Un'unica regex per tutti i nomi richiesti:
+        (^\s*#define\s+(NOME_1|NOME_2|...)\s+).*$
+    compilata una volta e riusata (cache per insieme di nomi).
+    """
+    alternatives = "|".join(re.escape(n) for n in names)
+    return re.compile(rf"(^\s*#define\s+({alternatives})\s+).*$", re.MULTILINE)
+
+
+def replace_defines(text: str, defines: Dict[str, str]) -> Tuple[str, List[str]]:
+    """
+    Sostituisce in un solo passaggio tutte le righe:
+        #define NAME <qualcosa>
+    con:
+        #define NAME value
+    per ogni NAME -> value di defines, lasciando il resto invariato.
+
+    Ritorna (testo, lista dei define richiesti ma non trovati nel testo).
+    """
+    if not defines:
+        return text, []
+
+    found = set()
+
+    def _sub(m):
+        name = m.group(2)
+        found.add(name)
+        # il valore e' inserito cosi' com'e' (niente escape come con \g<1>)
+        return m.group(1) + str(defines[name])
+
+    text = _define_pattern(tuple(sorted(defines))).sub(_sub, text)
+    missing = [name for name in defines if name not in found]
+    return text, missing
+
+
+def report_missing_defines(warnings: List[str], template_path: str,
+                           missing: List[str]) -> None:
+    """
+    Aggiunge a warnings (se non None) un messaggio per ogni define
+    richiesto ma assente dal template.
+    """
+    if warnings is None:
+        return
+    for name in missing:
+        warnings.append(f"{Path(template_path).name}: '#define {name}' non trovato nel template")
+
+
+# ----------------------------------------------------------------------
+# Periodi: da ms (come configurati nella GUI) a tick OS (Timeout generato)
+# ----------------------------------------------------------------------
+def parse_tick_ms(value) -> float:
+    """Durata del tick OS in ms (campo "tick_ms" della pagina OS, default 1)."""
+    try:
+        tick_ms = float(str(value).strip())
+    except ValueError:
+        return 1.0
+    return tick_ms if tick_ms > 0 else 1.0
+
+
+def project_tick_ms(project: Dict) -> float:
+    """Durata del tick OS in ms di un progetto (layout di save_project_as)."""
+    return parse_tick_ms((project.get("os", {}) or {}).get("tick_ms", "1"))
+
+
+def as_int(value, default: int = 0) -> int:
+    """Intero da un campo del progetto (stringa o numero); default se non valido."""
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def ms_to_ticks(period_ms: int, tick_ms: float) -> int:
+    """Periodo in tick (arrotondato, minimo 1); 0 se il periodo e' <= 0."""
+    if period_ms <= 0:
+        return 0
+    if tick_ms == 1:
+        return period_ms
+    return max(1, int(round(period_ms / tick_ms)))
+
+
+def report_inexact_periods(warnings: List[str], file_name: str, inexact: List[int],
+                           tick_ms: float) -> None:
+    """
+    Un solo avviso (non uno per riga) per i periodi in ms che non sono
+    multipli del tick: inexact = periodi trovati (al massimo qualche esempio).
+    """
+    if warnings is None or not inexact:
+        return
+    examples = ", ".join(f"{p} ms" for p in inexact[:3])
+    warnings.append(
+        f"{file_name}: periodi non multipli del tick di {tick_ms:g} ms, arrotondati "
+        f"(es. {examples})"
+    )
+
+
+# Dimensione dei blocchi per letture/scritture in streaming
+_BLOCK_SIZE = 1 << 16
+
+
+def _file_digest(path: Path) -> bytes:
+    """sha256 del file letto a blocchi (memoria costante)."""
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(_BLOCK_SIZE), b""):
+            h.update(block)
+    return h.digest()
+
+
+def _same_file(path: Path, size: int, digest: bytes) -> bool:
+    """True se path esiste e ha la dimensione e l'hash indicati."""
+    try:
+        if path.stat().st_size != size:
+            return False
+    except FileNotFoundError:
+        return False
+    return _file_digest(path) == digest
+
+
+def write_lines_if_changed(path: str, chunks: Iterable[str]) -> bool:
+    """
+    Scrive in streaming i pezzi di testo chunks (righe, blocchi...) in un
+    file temporaneo accanto a path, calcolando l'hash durante la scrittura.
+    Il file finale viene sostituito (os.replace) SOLO se il contenuto e'
+    diverso da quello gia' presente su disco; se e' identico non viene
+    toccato, cosi' il suo mtime resta invariato e make non ricompila le
+    unita' che lo includono.
+
+    chunks puo' essere un generatore: il file non viene mai costruito per
+    intero in memoria, qualunque sia la dimensione delle tabelle.
+
+    Ritorna True se il file e' stato (ri)scritto, False se invariato.
+    """
+    out_path = Path(path)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = out_path.with_name(out_path.name + ".tmp")
+
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp_path, "wb") as f:
+            # i pezzi piccoli (righe) vengono accorpati in blocchi da ~64 KiB
+            # prima di codifica/hash/scrittura: memoria limitata, poche chiamate
+            pending = []
+            pending_len = 0
+            for chunk in chunks:
+                pending.append(chunk)
+                pending_len += len(chunk)
+                if pending_len >= _BLOCK_SIZE:
+                    data = _encode_output("".join(pending))
+                    h.update(data)
+                    size += len(data)
+                    f.write(data)
+                    pending = []
+                    pending_len = 0
+            data = _encode_output("".join(pending))
+            h.update(data)
+            size += len(data)
+            f.write(data)
+
+        if _same_file(out_path, size, h.digest()):
+            tmp_path.unlink()
+            return False
+
+        os.replace(tmp_path, out_path)
+        return True
+    except BaseException:
+        # nessun .tmp lasciato in giro se il generatore del contenuto fallisce
+        if tmp_path.exists():
+            tmp_path.unlink()
+        raise
+
+
+def write_if_changed(path: str, text: str) -> bool:
+    """
+    Come write_lines_if_changed, per un testo gia' completo.
+    Ritorna True se il file e' stato (ri)scritto, False se invariato.
+    """
+    return write_lines_if_changed(path, (text,))
+
+
+# ----------------------------------------------------------------------
+# Commit "a stadi": i file vengono generati in una cartella temporanea e
+# resi visibili nella cartella finale tutti insieme, solo quando TUTTI
+# sono pronti.
+#
+# Default: output_dir resta una cartella vera e ogni file cambiato la
+# raggiunge con un os.replace (atomico file per file).
+#
+# versioned=True (opzionale): output_dir e' un link simbolico a una
+# cartella "versione" accanto a lui (.<nome>.v-...): il commit prepara una
+# nuova versione completa e ripunta il link con un solo os.replace. Chi
+# legge output_dir vede sempre il set vecchio o quello nuovo per intero,
+# mai un misto. La prima volta una cartella output_dir vera viene spostata
+# in una versione e sostituita dal link; un link simbolico non creato dal
+# generatore non viene mai ripuntato (RuntimeError). Dove i link simbolici
+# non si possono creare (es. Windows senza privilegi) si torna al default.
+# ----------------------------------------------------------------------
+def _fsync_dir(path: Path) -> None:
+    # Su Windows non si puo' aprire una cartella per fsync: si ignora
+    if not hasattr(os, "O_DIRECTORY"):
+        return
+    fd = os.open(str(path), os.O_RDONLY | os.O_DIRECTORY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _version_prefix(out: Path) -> str:
+    return f".{out.name}.v-"
+
+
+def _version_path(out: Path) -> Path:
+    return out.parent / f"{_version_prefix(out)}{time.time_ns():x}-{os.getpid()}"
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    """dst con lo stesso contenuto e mtime di src (hard link se possibile)."""
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copy2(src, dst)
+
+
+def _symlink_out(target: Path, out: Path) -> None:
+    """Punta out a target (relativo, stessa cartella) con una sola rinomina."""
+    tmp = out.parent / f".{out.name}.link-{os.getpid()}"
+    if tmp.is_symlink() or tmp.exists():
+        tmp.unlink()
+    os.symlink(target.name, tmp, target_is_directory=True)
+    os.replace(tmp, out)
+
+
+def _current_version(out: Path):
+    """
+    Cartella versione puntata da out, None se out non esiste.
+    Una cartella out vera viene prima spostata in una versione e
+    sostituita dal link. OSError se i link simbolici non si possono creare,
+    RuntimeError se out e' un link che non punta a una versione.
+    """
+    if out.is_symlink():
+        target = os.readlink(out)
+        if os.path.dirname(target) or not target.startswith(_version_prefix(out)):
+            raise RuntimeError(
+                f"{out} e' un link simbolico a '{target}', non creato dal generatore: "
+                "non viene ripuntato"
+            )
+        return out.parent / target
+    if not out.exists():
+        return None
+    # prova prima a creare un link: senza permessi la cartella resta com'e'
+    probe = out.parent / f".{out.name}.probe-{os.getpid()}"
+    os.symlink(out.name, probe, target_is_directory=True)
+    probe.unlink()
+    version = _version_path(out)
+    os.rename(out, version)
+    _symlink_out(version, out)
+    return version
+
+
+def _replace_per_file(to_move, out: Path) -> None:
+    # un os.replace per file: atomico solo file per file
+    out.mkdir(parents=True, exist_ok=True)
+    for src, dst in to_move:
+        os.replace(src, dst)
+    _fsync_dir(out)
+
+
+def _swap_version(to_move, out: Path, old) -> None:
+    """Nuova versione (file cambiati + resto di old) e swap del link out."""
+    version = _version_path(out)
+    version.mkdir()
+    try:
+        for src, _ in to_move:
+            os.replace(src, version / src.name)
+        if old is not None:
+            for entry in old.iterdir():
+                dst = version / entry.name
+                if dst.exists():
+                    continue
+                if entry.is_dir() and not entry.is_symlink():
+                    shutil.copytree(entry, dst, symlinks=True, copy_function=_link_or_copy)
+                else:
+                    _link_or_copy(entry, dst)
+        _fsync_dir(version)
+
+        # una sola rinomina per tutto il set
+        _symlink_out(version, out)
+    except BaseException:
+        shutil.rmtree(version, ignore_errors=True)
+        raise
+    _fsync_dir(out.parent)
+
+    # la vecchia versione non e' piu' raggiungibile da output_dir (chi ha
+    # gia' aperto un file continua a leggerlo)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+
+def commit_staged_files(staging_dir: str, output_dir: str,
+                        names: List[str], versioned: bool = False) -> List[str]:
+    """
+    Porta i file names da staging_dir a output_dir, solo quelli cambiati:
+    - i file identici a quelli gia' presenti non vengono toccati
+      (contenuto e mtime invariati)
+    - gli altri vengono prima sincronizzati su disco tutti, poi spostati
+      in output_dir con un os.replace per file
+    versioned: output_dir come link simbolico a una versione, ripuntato con
+    una sola rinomina (vedi sopra); i file invariati passano nella nuova
+    versione come hard link.
+
+    Ritorna la lista (path in output_dir) dei file effettivamente aggiornati.
+    """
+    staging = Path(staging_dir)
+    out = Path(output_dir)
+
+    to_move = []
+    for name in names:
+        src = staging / name
+        dst = out / name
+        if not _same_file(dst, src.stat().st_size, _file_digest(src)):
+            to_move.append((src, dst))
+
+    if not to_move:
+        return []
+
+    # 1) tutti i dati su disco prima di toccare la cartella finale
+    for src, _ in to_move:
+        with open(src, "rb+") as f:
+            os.fsync(f.fileno())
+    _fsync_dir(staging)
+
+    # 2) commit
+    out.parent.mkdir(parents=True, exist_ok=True)
+    old = None
+    if versioned:
+        try:
+            old = _current_version(out)
+        except OSError:
+            versioned = False
+    if versioned:
+        _swap_version(to_move, out, old)
+    else:
+        _replace_per_file(to_move, out)
+
+    return [str(dst) for _, dst in to_move]
+
+
+# ----------------------------------------------------------------------
+# Cache dei template (chiave: path assoluto, validata con mtime/size)
+# ----------------------------------------------------------------------
+class Template:
+    """
+    Template letto da disco una sola volta per processo:
+        text:  contenuto completo
+        lines: righe (con '\\n'), tupla immutabile condivisa
+    Le posizioni delle ancore ("EXPORTED Defines", "TASK List", '{', '};', ...)
+    vengono calcolate da una funzione indexer(lines) e memorizzate per
+    indexer, cosi' le generazioni successive non riscansionano il file.
+    """
+
+    def __init__(self, text: str):
+        self.text = text
+        self.lines = tuple(text.splitlines(keepends=True))
+        self._anchors = {}
+
+    def anchors(self, indexer):
+        try:
+            return self._anchors[indexer]
+        except KeyError:
+            pass
+        # se l'indexer alza RuntimeError (ancora mancante) non si memorizza nulla
+        result = indexer(self.lines)
+        self._anchors[indexer] = result
+        return result
+
+
+_TEMPLATE_CACHE = {}
+
+
+def load_template(path: str) -> Template:
+    """
+    Ritorna il Template per path, rileggendolo dal disco solo se il file
+    e' cambiato (mtime o dimensione diversi) dall'ultima lettura.
+    """
+    key = os.path.abspath(path)
+    st = os.stat(key)
+    stamp = (st.st_mtime_ns, st.st_size)
+
+    entry = _TEMPLATE_CACHE.get(key)
+    if entry is not None and entry[0] == stamp:
+        return entry[1]
+
+    tpl = Template(Path(key).read_text(encoding="utf-8"))
+    _TEMPLATE_CACHE[key] = (stamp, tpl)
+    return tpl
+
+
+def clear_template_cache() -> None:
+    _TEMPLATE_CACHE.clear()
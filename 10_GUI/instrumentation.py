@@ -0,0 +1,221 @@
+# instrumentation.py
+#
+# Misure per fase (caricamento progetto, get_*/set_* delle pagine,
+# generatori, commit): durata, picco di memoria (tracemalloc), numero di
+# entita' e byte scritti. Report JSON su richiesta o automatico se la
+# variabile d'ambiente CHAOS_PERF_REPORT contiene il path del file.
+# Questo modulo NON deve importare PySide6 (usato anche da chaos_gen.py).
+
+import os
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from typing import Deque, Dict, List, Optional
+
+
+# Path del report JSON scritto automaticamente dopo ogni caricamento /
+# generazione; se impostata attiva anche la misura della memoria
+ENV_REPORT = "CHAOS_PERF_REPORT"
+
+# Record tenuti in memoria (i piu' recenti): la GUI misura ogni
+# caricamento e generazione per tutta la sessione
+MAX_RECORDS = 1000
+
+
+def env_report_path() -> Optional[str]:
+    return os.environ.get(ENV_REPORT) or None
+
+
+class Instrumentation:
+    """
+    Raccoglie un record per ogni fase misurata:
+        {"id", "parent_id", "stage", "ms", "peak_kib", "counts",
+         "bytes_written", "error"}
+    Le fasi possono essere annidate (parent_id = fase che le contiene,
+    per thread). peak_kib e' None se la memoria non viene tracciata
+    (trace_memory=False: tracemalloc rallenta sensibilmente Python).
+
+    tracemalloc e' unico per processo (un solo picco, azzerato da ogni
+    fase): la memoria e' misurata solo per le fasi di un thread alla
+    volta, quello che ha aperto per primo una fase ancora in corso (es.
+    il worker della generazione). Le fasi degli altri thread nel
+    frattempo hanno peak_kib None. Se tracemalloc e' stato avviato da
+    questa classe viene fermato alla fine della fase piu' esterna: tra
+    una misura e l'altra (o con trace_memory spento) Python non rallenta.
+
+    Sono tenuti solo gli ultimi max_records record.
+    """
+
+    def __init__(self, trace_memory: bool = False, max_records: int = MAX_RECORDS):
+        self.trace_memory = trace_memory
+        self.records: Deque[Dict] = deque(maxlen=max_records)
+        self._lock = threading.Lock()
+        self._local = threading.local()
+        self._next_id = 0
+        self._memory_owner = None  # thread che usa tracemalloc (vedi sopra)
+        self._started_tracing = False  # tracemalloc avviato da stage()
+
+    def _stack(self) -> List[Dict]:
+        stack = getattr(self._local, "stack", None)
+        if stack is None:
+            stack = self._local.stack = []
+        return stack
+
+    def _new_record(self, name: str, counts: Dict) -> Dict:
+        stack = self._stack()
+        with self._lock:
+            self._next_id += 1
+            record = {
+                "id": self._next_id,
+                "parent_id": stack[-1]["record"]["id"] if stack else None,
+                "stage": name,
+                "ms": None,
+                "peak_kib": None,
+                "counts": dict(counts),
+                "bytes_written": None,
+                "error": None,
+            }
+        return record
+
+    def _claim_memory(self) -> Optional[bool]:
+        """
+        True se questo thread prende ora tracemalloc, False se lo aveva
+        gia', None se e' in uso da un altro thread.
+        """
+        me = threading.get_ident()
+        with self._lock:
+            if self._memory_owner is None:
+                self._memory_owner = me
+                return True
+            return False if self._memory_owner == me else None
+
+    def _release_memory(self) -> None:
+        with self._lock:
+            self._memory_owner = None
+
+    def _append(self, record: Dict) -> None:
+        with self._lock:
+            self.records.append(record)
+
+    @contextmanager
+    def stage(self, name: str, **counts):
+        """
+        with instr.stage("generate_os_task_cfg", tasks=len(tasks)) as rec:
+            ...
+            rec["bytes_written"] = n
+
+        Il record e' registrato anche se il blocco alza un'eccezione
+        (error = messaggio), l'eccezione viene poi propagata.
+        """
+        record = self._new_record(name, counts)
+        stack = self._stack()
+
+        claimed = self._claim_memory() if self.trace_memory else None
+        tracing = claimed is not None
+        if claimed and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracing = True
+        if tracing:
+            current, peak = tracemalloc.get_traced_memory()
+            # il picco della fase esterna fin qui non va perso col reset
+            if stack and stack[-1]["tracing"]:
+                stack[-1]["max"] = max(stack[-1]["max"], peak)
+            tracemalloc.reset_peak()
+        frame = {"record": record, "start": current if tracing else 0, "max": 0,
+                 "tracing": tracing}
+        stack.append(frame)
+
+        t0 = time.perf_counter()
+        try:
+            yield record
+        except BaseException as e:
+            record["error"] = str(e) or type(e).__name__
+            raise
+        finally:
+            record["ms"] = round((time.perf_counter() - t0) * 1000.0, 3)
+            stack.pop()
+            if tracing and tracemalloc.is_tracing():
+                frame_peak = max(frame["max"], tracemalloc.get_traced_memory()[1])
+                record["peak_kib"] = round((frame_peak - frame["start"]) / 1024.0, 1)
+                if stack and stack[-1]["tracing"]:
+                    stack[-1]["max"] = max(stack[-1]["max"], frame_peak)
+            if claimed:
+                # fase piu' esterna del thread che misura la memoria
+                if self._started_tracing:
+                    tracemalloc.stop()
+                    self._started_tracing = False
+                self._release_memory()
+            self._append(record)
+
+    def add(self, name: str, ms: float, bytes_written: int = None, parent: Dict = None,
+            **counts) -> Dict:
+        """
+        Registra una fase misurata altrove (es. in un processo del pool,
+        dove questo oggetto non e' raggiungibile): niente picco di memoria.
+        parent: record della fase che la contiene, se non e' quella aperta
+        con stage() in questo thread (es. fasi eseguite a blocchi dal
+        ciclo degli eventi Qt).
+        """
+        record = self._new_record(name, counts)
+        if parent is not None:
+            record["parent_id"] = parent["id"]
+        record["ms"] = round(ms, 3)
+        record["bytes_written"] = bytes_written
+        self._append(record)
+        return record
+
+    def clear(self) -> None:
+        with self._lock:
+            self.records.clear()
+
+    # ------------------------------------------------------------------
+    # Report
+    # ------------------------------------------------------------------
+    def report(self) -> Dict:
+        with self._lock:
+            records = list(self.records)
+        return {
+            "trace_memory": self.trace_memory,
+            "stages": sorted(records, key=lambda r: r["id"]),
+        }
+
+    def write_report(self, path: str) -> None:
+        # json / pathlib solo qui: il modulo e' importato all'avvio della GUI
+        import json
+        from pathlib import Path
+
+        Path(path).write_text(json.dumps(self.report(), indent=2) + "\n", encoding="utf-8")
+
+    def last(self, name: str) -> Optional[Dict]:
+        """Ultimo record (il piu' recente) della fase name."""
+        with self._lock:
+            matches = [r for r in self.records if r["stage"] == name]
+        return max(matches, key=lambda r: r["id"]) if matches else None
+
+    def children(self, record: Dict) -> List[Dict]:
+        with self._lock:
+            return sorted(
+                (r for r in self.records if r["parent_id"] == record["id"]),
+                key=lambda r: r["id"],
+            )
+
+    def summary_line(self, name: str) -> str:
+        """
+        Una riga con durata totale, fasi interne, picco di memoria e byte
+        scritti dell'ultima esecuzione di name, es.:
+            generate: 41.2 ms (generate_os_cfg 0.9, ..., commit 3.1) | 18.2 KiB written
+        """
+        record = self.last(name)
+        if record is None:
+            return ""
+        parts = [f"{name}: {record['ms']:.1f} ms"]
+        inner = ", ".join(f"{r['stage']} {r['ms']:.1f}" for r in self.children(record))
+        if inner:
+            parts[0] += f" ({inner})"
+        if record["peak_kib"] is not None:
+            parts.append(f"peak {record['peak_kib']:.0f} KiB")
+        if record["bytes_written"] is not None:
+            parts.append(f"{record['bytes_written'] / 1024.0:.1f} KiB written")
+        return " | ".join(parts)
@@ -0,0 +1,36 @@
+# load_worker.py
+#
+# Lettura e parsing di un file .chaos_cfg in background (QThreadPool): con
+# progetti grandi json.load non blocca la GUI. Le tabelle vengono poi
+# riempite a blocchi dal wizard, nel thread GUI.
+
+import time
+
+from PySide6.QtCore import QObject, QRunnable, Signal
+
+from project_generator import load_project_file
+
+
+class ProjectLoadSignals(QObject):
+    # (dict del progetto, ms di lettura + parsing)
+    finished = Signal(object, float)
+    # messaggio di errore
+    failed = Signal(str)
+
+
+class ProjectLoadWorker(QRunnable):
+    def __init__(self, path: str):
+        super().__init__()
+        self.path = path
+        self.signals = ProjectLoadSignals()
+
+    def run(self):
+        t0 = time.perf_counter()
+        try:
+            project = load_project_file(self.path)
+            if not isinstance(project, dict):
+                raise ValueError("the file does not contain a CHAOS project")
+        except Exception as e:
+            self.signals.failed.emit(str(e))
+            return
+        self.signals.finished.emit(project, (time.perf_counter() - t0) * 1000.0)
@@ -1,103 +1,19 @@
 # os_alarms_cfg_generator.py
 
-from pathlib import Path
+from itertools import chain
 from typing import List, Dict
-import re
 
-
-def _replace_define(text: str, name: str, value: str) -> str:
-    """
-    Sostituisce:
-        #define NAME <qualcosa>
-    con:
-        #define NAME value
-    lasciando invariato il resto.
-    """
-    pattern = rf"(^\s*#define\s+{name}\s+).*$"
-    replacement = rf"\g<1>{value}"
-    return re.sub(pattern, replacement, text, flags=re.MULTILINE)
+from generator_utils import (
+    write_if_changed, write_lines_if_changed, load_template,
+    replace_defines, report_missing_defines, as_int, ms_to_ticks, report_inexact_periods
+)
 
 
-def generate_os_alarms_cfg(
-    template_h: str,
-    template_c: str,
-    output_h: str,
-    output_c: str,
-    alarms: List[Dict],
-) -> None:
+def _index_alarms_c(c_lines) -> Dict:
     """
-    template_h: path al template os_alarms_cfg.h
-    template_c: path al template os_alarms_cfg.c
-    output_h:   path del .h generato
-    output_c:   path del .c generato
-    alarms: lista di dict provenienti da get_alarms(), es:
-        {
-            "alarm_id": int,
-            "alarm_type": "ONE_SHOT" | "CYCLIC",
-            "alarm_action": "ACTIVATE_TASK" | "TRIGGER_CALLBACK",
-            "period_ms": int,
-            "task_id": int | None,
-            "callback": str | None,
-        }
+    Posizioni (nel template .c) del blocco delle strutture AlarmType e
+    dell'array AlarmList con le sue righe '{' / '};'.
     """
-
-    # Normalizza
-    norm_alarms = []
-    for a in alarms:
-        try:
-            alarm_id = int(a.get("alarm_id", 0))
-        except ValueError:
-            alarm_id = 0
-
-        alarm_type = a.get("alarm_type") or "ONE_SHOT"
-        alarm_action = a.get("alarm_action") or "ACTIVATE_TASK"
-        try:
-            period_ms = int(a.get("period_ms", 0))
-        except ValueError:
-            period_ms = 0
-
-        task_id = a.get("task_id")
-        if task_id is None:
-            task_id_expr = "0"
-        else:
-            try:
-                task_id_expr = str(int(task_id))
-            except ValueError:
-                task_id_expr = "0"
-
-        callback = a.get("callback")
-        if callback:
-            callback_expr = callback
-        else:
-            callback_expr = "NULL"
-
-        norm_alarms.append({
-            "alarm_id": alarm_id,
-            "alarm_type": alarm_type,
-            "alarm_action": alarm_action,
-            "period_ms": period_ms,
-            "task_id_expr": task_id_expr,
-            "callback_expr": callback_expr,
-        })
-
-    # ---------------------------------------------------------------------
-    # HEADER: os_alarms_cfg.h (solo ALARMS_NUMB)
-    # ---------------------------------------------------------------------
-    h_text = Path(template_h).read_text(encoding="utf-8")
-    h_text = _replace_define(h_text, "ALARMS_NUMB", f"{len(norm_alarms)}u")
-
-    out_h_path = Path(output_h)
-    out_h_path.parent.mkdir(parents=True, exist_ok=True)
-    out_h_path.write_text(h_text, encoding="utf-8")
-
-    # ---------------------------------------------------------------------
-    # SOURCE: os_alarms_cfg.c
-    # ---------------------------------------------------------------------
-    c_text = Path(template_c).read_text(encoding="utf-8")
-    c_lines = c_text.splitlines(keepends=True)
-
-    # =================== 1) Blocchi AlarmType Alarm_ID_X ==================
-
     # Nel template abbiamo:
     # /* Alarm structure initialization */
     # AlarmType MyAlarm =
@@ -120,44 +36,6 @@ def generate_os_alarms_cfg(
     if start_struct_idx is None or alarm_list_decl_idx is None:
         raise RuntimeError("Impossibile trovare blocco 'Alarm structure initialization' o 'AlarmListType AlarmList' in os_alarms_cfg.c template")
 
-    # Genera i blocchi AlarmType Alarm_ID_X
-    struct_lines = []
-
-    for a in norm_alarms:
-        aid = a["alarm_id"]
-        name = f"Alarm_ID_{aid}"
-        action = a["alarm_action"]
-        alarm_type = a["alarm_type"]
-        timeout = a["period_ms"]
-        counter = "COUNTER_INIT"
-        task_id_expr = a["task_id_expr"]
-        callback_expr = a["callback_expr"]
-
-        struct_lines.append("/* Alarm structure initialization */\n")
-        struct_lines.append(f"AlarmType {name} =\n\n")
-        struct_lines.append("  /* --------------------------------------- Alarm ------------------------------------------- */     \n")
-        struct_lines.append("  /* ----------------------------------------------------------------------------------------- */\n")
-        struct_lines.append("  /* Action          Counter          Timeout           Type          TaskID          Callback */\n")
-        struct_lines.append("  /* ----------------------------------------------------------------------------------------- */   \n")
-        struct_lines.append(
-            f"  {{{action},   {counter},    {timeout},           {alarm_type},          {task_id_expr},          {callback_expr}}};   \n"
-        )
-        struct_lines.append("  /* ----------------------------------------------------------------------------------------- */\n\n")
-
-    # Sostituisci blocco da start_struct_idx fino alla riga prima di AlarmList
-    c_lines = c_lines[:start_struct_idx] + struct_lines + c_lines[alarm_list_decl_idx:]
-
-    # =================== 2) Array AlarmList[ALARMS_NUMB] ==================
-
-    # Riloccalizza indice dichiarazione AlarmList dopo la modifica
-    for i, line in enumerate(c_lines):
-        if "AlarmListType AlarmList" in line:
-            alarm_list_decl_idx = i
-            break
-
-    if alarm_list_decl_idx is None:
-        raise RuntimeError("Impossibile trovare 'AlarmListType AlarmList' dopo la sostituzione in os_alarms_cfg.c")
-
     # Trova '{' e '};'
     brace_open_idx = None
     brace_close_idx = None
@@ -178,28 +56,158 @@ def generate_os_alarms_cfg(
     if brace_close_idx is None:
         raise RuntimeError("Impossibile trovare '};' per AlarmList in os_alarms_cfg.c")
 
-    # Corpo dell'array
-    body_lines = []
-    body_lines.append("  /* ---------------- Alarm List --------------- */   \n")
-    body_lines.append("  /* ------------------------------------------- */\n")
-    body_lines.append("  /* AlarmID         AlarmState         AlarmPtr */\n")
-    body_lines.append("  /* ------------------------------------------- */     \n")
+    return {
+        "start_struct": start_struct_idx,
+        "alarm_list_decl": alarm_list_decl_idx,
+        "brace_open": brace_open_idx,
+        "brace_close": brace_close_idx,
+    }
+
 
-    for a in norm_alarms:
+# -------------------------------------------------------------------------
+# Emettitori: generano le righe una alla volta (nessuna lista intermedia)
+# -------------------------------------------------------------------------
+def _emit_alarm_structs(alarms: List[Dict], alarm_ids: List[int]):
+    # =================== 1) Blocchi AlarmType Alarm_ID_X ==================
+    # alarm_ids raccoglie gli ID per AlarmList (una sola normalizzazione)
+    for a in alarms:
         aid = a["alarm_id"]
-        body_lines.append(
-            f"  {{{aid},         ALARM_ACTIVE,      &Alarm_ID_{aid}}},\n"
-        )
-
-    body_lines.append("  /* ------------------------------------------- */\n")
-
-    # Sostituisci il contenuto tra '{' e '};'
-    c_lines = (
-        c_lines[:brace_open_idx + 1] +
-        body_lines +
-        c_lines[brace_close_idx:]
-    )
-
-    out_c_path = Path(output_c)
-    out_c_path.parent.mkdir(parents=True, exist_ok=True)
-    out_c_path.write_text("".join(c_lines), encoding="utf-8")
+        alarm_ids.append(aid)
+        name = f"Alarm_ID_{aid}"
+        action = a["alarm_action"]
+        alarm_type = a["alarm_type"]
+        timeout = a["timeout"]
+        counter = "COUNTER_INIT"
+        task_id_expr = a["task_id_expr"]
+        callback_expr = a["callback_expr"]
+
+        yield "/* Alarm structure initialization */\n"
+        yield f"AlarmType {name} =\n\n"
+        yield "  /* --------------------------------------- Alarm ------------------------------------------- */     \n"
+        yield "  /* ----------------------------------------------------------------------------------------- */\n"
+        yield "  /* Action          Counter          Timeout           Type          TaskID          Callback */\n"
+        yield "  /* ----------------------------------------------------------------------------------------- */   \n"
+        yield f"  {{{action},   {counter},    {timeout},           {alarm_type},          {task_id_expr},          {callback_expr}}};   \n"
+        yield "  /* ----------------------------------------------------------------------------------------- */\n\n"
+
+
+def _emit_alarm_list_body(alarm_ids: List[int]):
+    # =================== 2) Array AlarmList[ALARMS_NUMB] ==================
+    yield "  /* ---------------- Alarm List --------------- */   \n"
+    yield "  /* ------------------------------------------- */\n"
+    yield "  /* AlarmID         AlarmState         AlarmPtr */\n"
+    yield "  /* ------------------------------------------- */     \n"
+
+    for aid in alarm_ids:
+        yield f"  {{{aid},         ALARM_ACTIVE,      &Alarm_ID_{aid}}},\n"
+
+    yield "  /* ------------------------------------------- */\n"
+
+
+def _normalize_alarms(alarms: List[Dict], tick_ms: float = 1.0, inexact: List[int] = None):
+    """
+    Normalizza gli allarmi uno alla volta (generatore: nessuna copia
+    dell'intera tabella in memoria). timeout = periodo in tick OS;
+    inexact (opzionale) raccoglie qualche periodo non multiplo del tick.
+    """
+    # tick di 1 ms (caso comune): Timeout = periodo, sempre esatto
+    ms_tick = tick_ms == 1
+    for a in alarms:
+        alarm_id = as_int(a.get("alarm_id", 0))
+
+        alarm_type = a.get("alarm_type") or "ONE_SHOT"
+        alarm_action = a.get("alarm_action") or "ACTIVATE_TASK"
+        period_ms = as_int(a.get("period_ms", 0))
+        if ms_tick:
+            timeout = period_ms if period_ms > 0 else 0
+        else:
+            timeout = ms_to_ticks(period_ms, tick_ms)
+            if (inexact is not None and len(inexact) < 3 and timeout * tick_ms != period_ms
+                    and period_ms not in inexact):
+                inexact.append(period_ms)
+
+        task_id_expr = str(as_int(a.get("task_id")))
+
+        callback = a.get("callback")
+        if callback:
+            callback_expr = callback
+        else:
+            callback_expr = "NULL"
+
+        yield {
+            "alarm_id": alarm_id,
+            "alarm_type": alarm_type,
+            "alarm_action": alarm_action,
+            "period_ms": period_ms,
+            "timeout": timeout,
+            "task_id_expr": task_id_expr,
+            "callback_expr": callback_expr,
+        }
+
+
+def generate_os_alarms_cfg(
+    template_h: str,
+    template_c: str,
+    output_h: str,
+    output_c: str,
+    alarms: List[Dict],
+    warnings: List[str] = None,
+    tick_ms: float = 1.0,
+) -> List[str]:
+    """
+    template_h: path al template os_alarms_cfg.h
+    template_c: path al template os_alarms_cfg.c
+    output_h:   path del .h generato
+    output_c:   path del .c generato
+    alarms: lista di dict provenienti da get_alarms(), es:
+        {
+            "alarm_id": int,
+            "alarm_type": "ONE_SHOT" | "CYCLIC",
+            "alarm_action": "ACTIVATE_TASK" | "TRIGGER_CALLBACK",
+            "period_ms": int,
+            "task_id": int | None,
+            "callback": str | None,
+        }
+    warnings: lista (opzionale) per i messaggi sui define non trovati e
+              sui periodi non multipli del tick
+    tick_ms:  tick OS in ms: il Timeout generato e' period_ms / tick_ms
+
+    Ritorna la lista dei file effettivamente riscritti.
+    """
+
+    # ---------------------------------------------------------------------
+    # SOURCE: os_alarms_cfg.c
+    # ---------------------------------------------------------------------
+    c_tpl = load_template(template_c)
+    c_lines = c_tpl.lines
+    c_idx = c_tpl.anchors(_index_alarms_c)  # ancore in cache
+
+    # Sostituisci (sul template originale) il blocco da start_struct fino
+    # alla riga prima di AlarmList e il contenuto tra '{' e '};'.
+    # Le strutture e la lista sono emesse in streaming direttamente nel file;
+    # la lista usa gli ID raccolti mentre si emettono le strutture.
+    inexact = []
+    alarm_ids = []
+    c_changed = write_lines_if_changed(output_c, chain(
+        c_lines[:c_idx["start_struct"]],
+        _emit_alarm_structs(_normalize_alarms(alarms, tick_ms, inexact), alarm_ids),
+        c_lines[c_idx["alarm_list_decl"]:c_idx["brace_open"] + 1],
+        _emit_alarm_list_body(alarm_ids),
+        c_lines[c_idx["brace_close"]:],
+    ))
+    report_inexact_periods(warnings, "os_alarms_cfg.c", inexact, tick_ms)
+
+    # ---------------------------------------------------------------------
+    # HEADER: os_alarms_cfg.h (solo ALARMS_NUMB)
+    # ---------------------------------------------------------------------
+    h_text = load_template(template_h).text
+    h_text, missing = replace_defines(h_text, {"ALARMS_NUMB": f"{len(alarms)}u"})
+    report_missing_defines(warnings, template_h, missing)
+
+    changed = []
+    if write_if_changed(output_h, h_text):
+        changed.append(output_h)
+    if c_changed:
+        changed.append(output_c)
+
+    return changed
@@ -1,25 +1,16 @@
 # os_cfg_generator.py
 
-import re
-from pathlib import Path
-
-def _replace_define(text: str, name: str, value: str) -> str:
-    """
-    Sostituisce la riga:
-        #define NAME <qualcosa>
-    con:
-        #define NAME value
-    mantenendo il resto del file invariato.
-    """
-    pattern = rf"(^\s*#define\s+{name}\s+).*$"
-    # NOTA: usare \g<1> per evitare ambiguità con valori che iniziano per cifra!
-    replacement = rf"\g<1>{value}"
-    return re.sub(pattern, replacement, text, flags=re.MULTILINE)
+from typing import List
 
+from generator_utils import (
+    write_if_changed, load_template, replace_defines, report_missing_defines
+)
+from type_selection import check_cast
 
 
 def generate_os_cfg(template_path: str, output_path: str,
-                    os_config: dict, hooks: dict) -> None:
+                    os_config: dict, hooks: dict,
+                    warnings: List[str] = None) -> List[str]:
     """
     template_path: path al template os_cfg.h (quello originale)
     output_path:  path del file generato (può anche essere la cartella del progetto)
@@ -27,6 +18,8 @@ def generate_os_cfg(template_path: str, output_path: str,
         'scheduler_freq': '1000',
         'tick_ms': '1',
         'ready_queue': '100',
+        'sort_algorithm': 'INSERTION_SORT',   # opzionale
+        'sort_option': 'SORT_INIT_ONLY',      # opzionale
     }
     hooks: {
         'startup': bool,
@@ -35,61 +28,48 @@ def generate_os_cfg(template_path: str, output_path: str,
         'post_task': bool,
         'error': bool,
     }
+    warnings: lista (opzionale) a cui aggiungere i messaggi per i define
+              non trovati nel template e per i valori che non stanno nel
+              cast a uint16_t
+
+    Ritorna la lista dei file effettivamente riscritti (vuota se invariato).
     """
-    text = Path(template_path).read_text(encoding="utf-8")
+    text = load_template(template_path).text
 
     # --- Valori numerici OS ---
     sched_freq = os_config.get("scheduler_freq", "1000")
     tick_ms = os_config.get("tick_ms", "1")
     ready_queue = os_config.get("ready_queue", "100")
 
-    text = _replace_define(
-        text,
-        "SCHED_TIMER_FREQ_HZ",
-        f"((uint16_t)({sched_freq}))",
-    )
-    text = _replace_define(
-        text,
-        "DESIRED_SCHED_PERIOD_MS",
-        f"((uint16_t)({tick_ms}))",
-    )
-    text = _replace_define(
-        text,
-        "MAX_READY_TASKS",
-        f"{ready_queue}u",
-    )
-
     # --- Hooks → STD_TRUE / STD_FALSE ---
     def hv(flag: bool) -> str:
         return "STD_TRUE" if flag else "STD_FALSE"
 
-    text = _replace_define(
-        text,
-        "ENABLE_STARTUP_HOOK",
-        hv(hooks.get("startup", False)),
-    )
-    text = _replace_define(
-        text,
-        "ENABLE_SHUTDOWN_HOOK",
-        hv(hooks.get("shutdown", False)),
-    )
-    text = _replace_define(
-        text,
-        "ENABLE_PRE_TASK_HOOK",
-        hv(hooks.get("pre_task", False)),
-    )
-    text = _replace_define(
-        text,
-        "ENABLE_POST_TASK_HOOK",
-        hv(hooks.get("post_task", False)),
-    )
-    text = _replace_define(
-        text,
-        "ENABLE_ERROR_HOOK",
-        hv(hooks.get("error", False)),
-    )
+    # Tutti i define in un solo passaggio sul testo
+    defines = {
+        "SCHED_TIMER_FREQ_HZ": f"((uint16_t)({sched_freq}))",
+        "DESIRED_SCHED_PERIOD_MS": f"((uint16_t)({tick_ms}))",
+        "MAX_READY_TASKS": f"{ready_queue}u",
+        "ENABLE_STARTUP_HOOK": hv(hooks.get("startup", False)),
+        "ENABLE_SHUTDOWN_HOOK": hv(hooks.get("shutdown", False)),
+        "ENABLE_PRE_TASK_HOOK": hv(hooks.get("pre_task", False)),
+        "ENABLE_POST_TASK_HOOK": hv(hooks.get("post_task", False)),
+        "ENABLE_ERROR_HOOK": hv(hooks.get("error", False)),
+    }
+    # Ordinamento di Tasks[]: se non indicato resta quello del template
+    if os_config.get("sort_algorithm"):
+        defines["SORT_ALGORITHM"] = os_config["sort_algorithm"]
+    if os_config.get("sort_option"):
+        defines["SORT_OPTION"] = os_config["sort_option"]
+    text, missing = replace_defines(text, defines)
+    report_missing_defines(warnings, template_path, missing)
+
+    # I valori sono emessi con un cast a uint16_t: segnala se non ci stanno
+    check_cast(warnings, "os_cfg.h", "SCHED_TIMER_FREQ_HZ", sched_freq, "uint16_t")
+    check_cast(warnings, "os_cfg.h", "DESIRED_SCHED_PERIOD_MS", tick_ms, "uint16_t")
 
-    # Scrivi il file generato
-    out_path = Path(output_path)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(text, encoding="utf-8")
+    # Scrivi il file generato (solo se cambiato)
+    changed = []
+    if write_if_changed(output_path, text):
+        changed.append(output_path)
+    return changed
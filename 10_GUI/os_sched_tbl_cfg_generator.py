@@ -1,70 +1,19 @@
 # os_sched_tbl_cfg_generator.py
 
-import re
-from pathlib import Path
+from itertools import chain
 from typing import List, Dict
 
+from generator_utils import (
+    write_if_changed, write_lines_if_changed, load_template,
+    replace_defines, report_missing_defines, as_int, ms_to_ticks, report_inexact_periods
+)
 
-def _replace_define(text: str, name: str, value: str) -> str:
-    """
-    Sostituisce la riga:
-        #define NAME <qualcosa>
-    con:
-        #define NAME value
-    lasciando il resto del file invariato.
-    """
-    pattern = rf"(^\s*#define\s+{name}\s+).*$"
-    replacement = rf"\g<1>{value}"  # importante usare \g<1> !
-    return re.sub(pattern, replacement, text, flags=re.MULTILINE)
 
-
-def generate_os_sched_tbl_cfg(
-    template_h: str,
-    template_c: str,
-    output_h: str,
-    output_c: str,
-    schedule_entries: List[Dict[str, int]],
-) -> None:
+def _index_sched_c(c_lines) -> Dict:
     """
-    template_h: path al template os_sched_tbl_cfg.h
-    template_c: path al template os_sched_tbl_cfg.c
-    output_h:   path del .h generato
-    output_c:   path del .c generato
-    schedule_entries: lista di dict:
-        [{\"task_id\": int, \"period_ms\": int}, ...]
+    Posizioni (nel template .c) della dichiarazione SchedTable e delle
+    righe '{' / '};' che delimitano il corpo dell'array.
     """
-
-    # Normalizza: garantiamo int
-    norm_entries = []
-    for e in schedule_entries:
-        try:
-            tid = int(e.get("task_id", 0))
-        except ValueError:
-            tid = 0
-        try:
-            per = int(e.get("period_ms", 0))
-        except ValueError:
-            per = 0
-        norm_entries.append({"task_id": tid, "period_ms": per})
-
-    evt_n = len(norm_entries)
-
-    # -------------------------------------------------------------------------
-    # HEADER: os_sched_tbl_cfg.h  (solo SCHED_EVT_NUMBER)
-    # -------------------------------------------------------------------------
-    h_text = Path(template_h).read_text(encoding="utf-8")
-    h_text = _replace_define(h_text, "SCHED_EVT_NUMBER", f"{evt_n}u")
-
-    out_h_path = Path(output_h)
-    out_h_path.parent.mkdir(parents=True, exist_ok=True)
-    out_h_path.write_text(h_text, encoding="utf-8")
-
-    # -------------------------------------------------------------------------
-    # SOURCE: os_sched_tbl_cfg.c  (SchedTblType SchedTable[...] = { ... })
-    # -------------------------------------------------------------------------
-    c_text = Path(template_c).read_text(encoding="utf-8")
-    c_lines = c_text.splitlines(keepends=True)
-
     # Trova la dichiarazione dell'array SchedTable
     array_idx = None
     brace_open_idx = None
@@ -96,27 +45,106 @@ def generate_os_sched_tbl_cfg(
     if brace_close_idx is None:
         raise RuntimeError("Impossibile trovare '};' per SchedTable nel template .c")
 
-    # Corpo array: lo rigeneriamo
-    body_lines = []
-    body_lines.append("  /* ------------------------------------------------ */\n")
-    body_lines.append("  /* TaskID          Counter          Timeout  */\n")
-    body_lines.append("  /* ------------------------------------------------ */   \n")
-    body_lines.append("  /* ----------------- Sched. Table ----------------- */   \n")
-
-    for e in norm_entries:
-        body_lines.append(
-            f"  {{{e['task_id']},     COUNTER_INIT,    {e['period_ms']}}}, \n"
-        )
-
-    body_lines.append("  /* ------------------------------------------------ */\n")
-
-    # Sostituisci tutto tra '{' e '};' (esclusi)
-    c_lines = (
-        c_lines[:brace_open_idx + 1] +
-        body_lines +
-        c_lines[brace_close_idx:]
-    )
-
-    out_c_path = Path(output_c)
-    out_c_path.parent.mkdir(parents=True, exist_ok=True)
-    out_c_path.write_text("".join(c_lines), encoding="utf-8")
+    return {"brace_open": brace_open_idx, "brace_close": brace_close_idx}
+
+
+def _emit_sched_table_body(entries: List[Dict]):
+    # Corpo array: lo rigeneriamo (una riga alla volta)
+    yield "  /* ------------------------------------------------ */\n"
+    yield "  /* TaskID          Counter          Timeout  */\n"
+    yield "  /* ------------------------------------------------ */   \n"
+    yield "  /* ----------------- Sched. Table ----------------- */   \n"
+
+    for e in entries:
+        # offset del contatore (fase di attivazione): solo se diverso da 0
+        if e["offset"]:
+            yield f"  {{{e['task_id']},     (COUNTER_INIT + {e['offset']}),    {e['timeout']}}}, \n"
+        else:
+            yield f"  {{{e['task_id']},     COUNTER_INIT,    {e['timeout']}}}, \n"
+
+    yield "  /* ------------------------------------------------ */\n"
+
+
+def _normalize_entries(schedule_entries: List[Dict], tick_ms: float = 1.0,
+                       inexact: List[int] = None):
+    """
+    Normalizza le entry una alla volta (garantiamo int). timeout = periodo
+    in tick OS; inexact (opzionale) raccoglie qualche periodo che non e'
+    multiplo del tick.
+    """
+    # tick di 1 ms (caso comune): Timeout = periodo, sempre esatto
+    ms_tick = tick_ms == 1
+    for e in schedule_entries:
+        tid = as_int(e.get("task_id", 0))
+        per = as_int(e.get("period_ms", 0))
+        if ms_tick:
+            timeout = per if per > 0 else 0
+        else:
+            timeout = ms_to_ticks(per, tick_ms)
+            if (inexact is not None and len(inexact) < 3 and timeout * tick_ms != per
+                    and per not in inexact):
+                inexact.append(per)
+        off = e.get("offset")
+        # il contatore (in tick) deve restare sotto il Timeout
+        off = as_int(off) % timeout if off and timeout > 0 else 0
+        yield {"task_id": tid, "timeout": timeout, "offset": off}
+
+
+def generate_os_sched_tbl_cfg(
+    template_h: str,
+    template_c: str,
+    output_h: str,
+    output_c: str,
+    schedule_entries: List[Dict[str, int]],
+    warnings: List[str] = None,
+    tick_ms: float = 1.0,
+) -> List[str]:
+    """
+    template_h: path al template os_sched_tbl_cfg.h
+    template_c: path al template os_sched_tbl_cfg.c
+    output_h:   path del .h generato
+    output_c:   path del .c generato
+    schedule_entries: lista di dict:
+        [{\"task_id\": int, \"period_ms\": int, \"offset\": int}, ...]
+        (offset opzionale: valore iniziale del contatore, COUNTER_INIT + offset)
+    warnings: lista (opzionale) per i messaggi sui define non trovati e
+              sui periodi non multipli del tick
+    tick_ms:  tick OS in ms: il Timeout generato e' period_ms / tick_ms
+              (con il tick di 1 ms coincide con il periodo in ms)
+
+    Ritorna la lista dei file effettivamente riscritti.
+    """
+
+    evt_n = len(schedule_entries)
+
+    # -------------------------------------------------------------------------
+    # SOURCE: os_sched_tbl_cfg.c  (SchedTblType SchedTable[...] = { ... })
+    # -------------------------------------------------------------------------
+    c_tpl = load_template(template_c)
+    c_lines = c_tpl.lines
+    c_idx = c_tpl.anchors(_index_sched_c)  # posizioni '{' / '};' (in cache)
+
+    # Sostituisci tutto tra '{' e '};' (esclusi): prefisso del template,
+    # corpo generato in streaming, suffisso
+    inexact = []
+    c_changed = write_lines_if_changed(output_c, chain(
+        c_lines[:c_idx["brace_open"] + 1],
+        _emit_sched_table_body(_normalize_entries(schedule_entries, tick_ms, inexact)),
+        c_lines[c_idx["brace_close"]:],
+    ))
+    report_inexact_periods(warnings, "os_sched_tbl_cfg.c", inexact, tick_ms)
+
+    # -------------------------------------------------------------------------
+    # HEADER: os_sched_tbl_cfg.h  (solo SCHED_EVT_NUMBER)
+    # -------------------------------------------------------------------------
+    h_text = load_template(template_h).text
+    h_text, missing = replace_defines(h_text, {"SCHED_EVT_NUMBER": f"{evt_n}u"})
+    report_missing_defines(warnings, template_h, missing)
+
+    changed = []
+    if write_if_changed(output_h, h_text):
+        changed.append(output_h)
+    if c_changed:
+        changed.append(output_c)
+
+    return changed
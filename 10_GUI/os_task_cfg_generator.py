@@ -1,60 +1,19 @@
 # os_task_cfg_generator.py
 
-from pathlib import Path
+from itertools import chain
 from typing import List, Dict
 
+from generator_utils import write_lines_if_changed, load_template
 
-def generate_os_task_cfg(
-    template_h: str,
-    template_c: str,
-    output_h: str,
-    output_c: str,
-    tasks: List[Dict[str, str]],
-) -> None:
-    """
-    template_h: path al template os_task_cfg.h
-    template_c: path al template os_task_cfg.c
-    output_h:   path del .h generato
-    output_c:   path del .c generato
-    tasks: lista di dict con almeno: {"name": str, "priority": str}
-    """
-
-    # Normalizza i dati task: usa l'ID configurato nella GUI
-    normalized_tasks = []
-    for t in tasks:
-        name = (t.get("name") or "").strip()
-        if not name:
-            continue  # salta righe senza nome
-
-        # ID preso dalla tabella (colonna Task ID)
-        id_str = (t.get("id") or "").strip()
-        try:
-            tid = int(id_str)
-        except ValueError:
-            # fallback: se qualcosa è andato storto, metti 0 o len(normalized_tasks)
-            tid = 0
-
-        prio_str = (t.get("priority") or "1").strip()
-        try:
-            prio = int(prio_str)
-        except ValueError:
-            prio = 1
-
-        normalized_tasks.append(
-            {
-                "id": tid,       # <-- qui ora è l'ID della GUI, non idx
-                "name": name,
-                "priority": prio,
-            }
-        )
 
+SECTION_LINE = "/************************************************************************"
 
-    # -------------------------------------------------------------------------
-    # HEADER: os_task_cfg.h  (blocca solo Task IDs)
-    # -------------------------------------------------------------------------
-    h_text = Path(template_h).read_text(encoding="utf-8")
-    h_lines = h_text.splitlines(keepends=True)
 
+# -------------------------------------------------------------------------
+# Indici delle ancore nei template (calcolati una volta e messi in cache
+# insieme al template, vedi generator_utils.load_template)
+# -------------------------------------------------------------------------
+def _index_task_h(h_lines) -> Dict:
     # 1) Trova la sezione "EXPORTED Defines"
     exported_def_idx = None
     for i, line in enumerate(h_lines):
@@ -73,52 +32,29 @@ def generate_os_task_cfg(
             break
 
     # 3) Trova la fine del blocco (prossima riga di sezione /************************************************************************)
-    if start_idx is not None:
-        for j in range(start_idx + 1, len(h_lines)):
-            if h_lines[j].startswith("/************************************************************************"):
-                end_idx = j
-                break
-        else:
-            end_idx = len(h_lines)
+    has_task_ids = start_idx is not None
+    if has_task_ids:
+        search_from = start_idx + 1
     else:
         # Se non esiste il commento Task IDs, inseriamo il blocco subito dopo EXPORTED Defines
         start_idx = exported_def_idx + 1
-        for j in range(start_idx, len(h_lines)):
-            if h_lines[j].startswith("/************************************************************************"):
-                end_idx = j
-                break
-        else:
-            end_idx = len(h_lines)
+        search_from = start_idx
 
-    # 4) Costruisci il nuovo blocco di define
-    define_lines = []
-    if "Task IDs" in h_lines[start_idx]:
-        define_lines.append(h_lines[start_idx])
+    for j in range(search_from, len(h_lines)):
+        if h_lines[j].startswith(SECTION_LINE):
+            end_idx = j
+            break
     else:
-        define_lines.append("/* Task IDs */\n")
-
-    for task in normalized_tasks:
-        define_lines.append(
-            f"#define {task['name']}_ID                                              {task['id']}u\n"
-        )
-
-    # 5) Sostituisci il blocco nel file
-    new_h_lines = (
-        h_lines[:start_idx] +
-        define_lines +
-        h_lines[end_idx:]
-    )
+        end_idx = len(h_lines)
 
-    out_h_path = Path(output_h)
-    out_h_path.parent.mkdir(parents=True, exist_ok=True)
-    out_h_path.write_text("".join(new_h_lines), encoding="utf-8")
+    return {
+        "start": start_idx,
+        "end": end_idx,
+        "has_task_ids": has_task_ids,
+    }
 
-    # -------------------------------------------------------------------------
-    # SOURCE: os_task_cfg.c
-    # -------------------------------------------------------------------------
-    c_text = Path(template_c).read_text(encoding="utf-8")
-    c_lines = c_text.splitlines(keepends=True)
 
+def _index_task_c(c_lines) -> Dict:
     # ===================== 1) blocco extern void ...  ======================
 
     # Struttura del template:
@@ -149,17 +85,13 @@ def generate_os_task_cfg(
         extern_start = task_list_line + 2
 
         for j in range(extern_start, len(c_lines)):
-            if c_lines[j].startswith("/************************************************************************"):
+            if c_lines[j].startswith(SECTION_LINE):
                 extern_end = j
                 break
 
-    if extern_start is not None and extern_end is not None:
-        extern_lines = []
-        for task in normalized_tasks:
-            extern_lines.append(f"extern void {task['name']} (void);\n")
-        extern_lines.append("\n")
-        c_lines = c_lines[:extern_start] + extern_lines + c_lines[extern_end:]
-    # Se non troviamo il blocco, NON alziamo eccezione: lasciamo gli extern originali
+    if extern_end is None:
+        # Se non troviamo il blocco, NON alziamo eccezione: lasciamo gli extern originali
+        extern_start = None
 
     # ===================== 2) blocco TbcType Tasks[] =======================
 
@@ -172,10 +104,11 @@ def generate_os_task_cfg(
     #   ...
     # };
 
-    # 2.a: trova la sezione GLOBAL Variables
+    # 2.a: trova la sezione GLOBAL Variables (dopo il blocco extern, che
+    # viene sostituito)
     global_vars_idx = None
-    for i, line in enumerate(c_lines):
-        if "GLOBAL Variables" in line:
+    for i in range(extern_end if extern_end is not None else 0, len(c_lines)):
+        if "GLOBAL Variables" in c_lines[i]:
             global_vars_idx = i
             break
 
@@ -213,27 +146,208 @@ def generate_os_task_cfg(
     if brace_close_idx is None:
         raise RuntimeError("Impossibile trovare '};' per TbcType Tasks[] in os_task_cfg.c template")
 
-    # 2.e: genera il corpo dell'array
-    body_lines = []
-    body_lines.append("  /* -------------------------------------------------------------------- */\n")
-    body_lines.append("  /* ID                    Task              State           Priority     */\n")
-    body_lines.append("  /* -------------------------------------------------------------------- */   \n")
-    body_lines.append("  /* --------------------------------- Tasks ---------------------------- */   \n")
+    return {
+        "extern_start": extern_start,
+        "extern_end": extern_end,
+        "brace_open": brace_open_idx,
+        "brace_close": brace_close_idx,
+    }
+
+
+# -------------------------------------------------------------------------
+# Emettitori: generano le righe una alla volta (nessuna lista intermedia)
+# -------------------------------------------------------------------------
+def _emit_task_defines(first_line: str, tasks: List[Dict]):
+    yield first_line
+    for task in tasks:
+        yield f"#define {task['name']}_ID                                              {task['id']}u\n"
+
+
+def _emit_task_externs(tasks: List[Dict]):
+    for task in tasks:
+        yield f"extern void {task['name']} (void);\n"
+    yield "\n"
+
+
+def _emit_tasks_array_body(tasks: List[Dict]):
+    # corpo dell'array TbcType Tasks[]
+    yield "  /* -------------------------------------------------------------------- */\n"
+    yield "  /* ID                    Task              State           Priority     */\n"
+    yield "  /* -------------------------------------------------------------------- */   \n"
+    yield "  /* --------------------------------- Tasks ---------------------------- */   \n"
+
+    for task in tasks:
+        yield f"  {{{task['name']}_ID,           {task['name']},         IDLE,           {task['priority']}}},\n"
 
-    for task in normalized_tasks:
-        body_lines.append(
-            f"  {{{task['name']}_ID,           {task['name']},         IDLE,           {task['priority']}}},\n"
+    yield "  /* -------------------------------------------------------------------- */\n"
+
+
+def _normalize_tasks(tasks: List[Dict]):
+    """
+    Normalizza i dati task uno alla volta: usa l'ID configurato nella GUI
+    e salta le righe senza nome.
+    """
+    for t in tasks:
+        name = (t.get("name") or "").strip()
+        if not name:
+            continue  # salta righe senza nome
+
+        # ID preso dalla tabella (colonna Task ID)
+        id_str = (t.get("id") or "").strip()
+        try:
+            tid = int(id_str)
+        except ValueError:
+            # fallback: se qualcosa è andato storto, metti 0
+            tid = 0
+
+        prio_str = (t.get("priority") or "1").strip()
+        try:
+            prio = int(prio_str)
+        except ValueError:
+            prio = 1
+
+        yield {
+            "id": tid,       # <-- qui ora è l'ID della GUI, non idx
+            "name": name,
+            "priority": prio,
+        }
+
+
+# -------------------------------------------------------------------------
+# Ordinamento di Tasks[] per priorita' e scelta di SORT_ALGORITHM /
+# SORT_OPTION (os_cfg.h): il kernel ordina Tasks[] per priorita'
+# decrescente (valore piu' alto prima)
+# -------------------------------------------------------------------------
+
+# Fino a questo numero di task l'insertion sort costa meno del merge sort
+# (niente buffer di appoggio, pochi confronti); oltre vince O(n log n)
+INSERTION_SORT_MAX_TASKS = 16
+
+
+def sort_tasks_by_priority(tasks):
+    """
+    Task normalizzati in ordine di priorita' decrescente; a parita' di
+    priorita' resta l'ordine della tabella (ordinamento stabile).
+    """
+    return sorted(tasks, key=lambda t: -t["priority"])
+
+
+def select_sort_config(tasks: List[Dict], presort: bool = False) -> Dict:
+    """
+    Configurazione di ordinamento piu' economica a runtime per Tasks[].
+    tasks:   task del progetto (come in generate_os_task_cfg)
+    presort: Tasks[] viene emesso gia' ordinato per priorita'
+
+    Ritorna {"algorithm": "INSERTION_SORT" | "MERGE_SORT",
+             "option": "SORT_INIT_ONLY", "presorted": bool, "reason": str}.
+    Le priorita' in Tasks[] sono fisse: basta ordinare una volta all'avvio
+    (SORT_EACH_SCH_CYCLE non serve mai).
+    """
+    n = 0
+    in_order = True
+    prev = None
+    for t in _normalize_tasks(tasks):
+        if prev is not None and t["priority"] > prev:
+            in_order = False
+        prev = t["priority"]
+        n += 1
+
+    if presort or in_order:
+        algorithm = "INSERTION_SORT"
+        reason = (
+            f"Tasks[] is {'emitted' if presort else 'already'} in priority order: "
+            f"insertion sort at init only makes {max(n - 1, 0)} comparisons and moves nothing."
+        )
+    elif n <= INSERTION_SORT_MAX_TASKS:
+        algorithm = "INSERTION_SORT"
+        reason = (
+            f"{n} tasks: insertion sort at init is the cheapest for tables up to "
+            f"{INSERTION_SORT_MAX_TASKS} tasks and needs no extra RAM."
         )
+    else:
+        algorithm = "MERGE_SORT"
+        reason = (
+            f"{n} tasks: merge sort at init (n log n) is cheaper than insertion sort (n²) "
+            f"above {INSERTION_SORT_MAX_TASKS} tasks. Presort the table to sort with "
+            "insertion sort in a single pass."
+        )
+
+    return {
+        "algorithm": algorithm,
+        "option": "SORT_INIT_ONLY",
+        "presorted": presort or in_order,
+        "reason": reason + " Priorities are fixed, so sorting once at init is enough.",
+    }
+
+
+def generate_os_task_cfg(
+    template_h: str,
+    template_c: str,
+    output_h: str,
+    output_c: str,
+    tasks: List[Dict[str, str]],
+    presort: bool = False,
+) -> List[str]:
+    """
+    template_h: path al template os_task_cfg.h
+    template_c: path al template os_task_cfg.c
+    output_h:   path del .h generato
+    output_c:   path del .c generato
+    tasks: lista di dict con almeno: {"name": str, "priority": str}
+    presort: emette Tasks[] gia' ordinato per priorita' decrescente
+             (gli ID e gli extern restano nell'ordine della tabella)
+
+    Ritorna la lista dei file effettivamente riscritti.
+    """
+
+    # -------------------------------------------------------------------------
+    # HEADER: os_task_cfg.h  (blocca solo Task IDs)
+    # -------------------------------------------------------------------------
+    h_tpl = load_template(template_h)
+    h_lines = h_tpl.lines
+    h_idx = h_tpl.anchors(_index_task_h)
+
+    if h_idx["has_task_ids"]:
+        first_line = h_lines[h_idx["start"]]
+    else:
+        first_line = "/* Task IDs */\n"
+
+    # Prefisso del template + blocco define generato + suffisso, in streaming
+    changed = []
+    if write_lines_if_changed(output_h, chain(
+        h_lines[:h_idx["start"]],
+        _emit_task_defines(first_line, _normalize_tasks(tasks)),
+        h_lines[h_idx["end"]:],
+    )):
+        changed.append(output_h)
+
+    # -------------------------------------------------------------------------
+    # SOURCE: os_task_cfg.c
+    # -------------------------------------------------------------------------
+    c_tpl = load_template(template_c)
+    c_lines = c_tpl.lines
+    c_idx = c_tpl.anchors(_index_task_c)
+
+    # Sostituisci (sul template originale) il blocco extern (solo se presente
+    # nel template) e tutto tra '{' e '};' esclusi
+    if c_idx["extern_start"] is not None:
+        head = chain(
+            c_lines[:c_idx["extern_start"]],
+            _emit_task_externs(_normalize_tasks(tasks)),
+            c_lines[c_idx["extern_end"]:c_idx["brace_open"] + 1],
+        )
+    else:
+        head = c_lines[:c_idx["brace_open"] + 1]
 
-    body_lines.append("  /* -------------------------------------------------------------------- */\n")
+    body_tasks = _normalize_tasks(tasks)
+    if presort:
+        body_tasks = sort_tasks_by_priority(body_tasks)
 
-    # 2.f: sostituisci tutto tra '{' e '};' esclusi
-    c_lines = (
-        c_lines[:brace_open_idx + 1] +
-        body_lines +
-        c_lines[brace_close_idx:]
-    )
+    if write_lines_if_changed(output_c, chain(
+        head,
+        _emit_tasks_array_body(body_tasks),
+        c_lines[c_idx["brace_close"]:],
+    )):
+        changed.append(output_c)
 
-    out_c_path = Path(output_c)
-    out_c_path.parent.mkdir(parents=True, exist_ok=True)
-    out_c_path.write_text("".join(c_lines), encoding="utf-8")
+    return changed
@@ -0,0 +1,180 @@
+# pages/alarm_table_model.py
+#
+# Tabella degli allarmi in forma model/view:
+# - AlarmStore: allarmi per colonne in array compatti (pochi byte per
+#   allarme, nessun oggetto Qt per riga)
+# - AlarmTableModel: TaskTableModel (task_table_model) sopra AlarmStore;
+#   le colonne Task e Callback sono abilitate in base ad Alarm Action
+#   tramite flags()
+# I combo di Type / Action / Task Name sono creati dai delegate
+# (item_delegates) solo durante la modifica di una cella.
+
+from array import array
+
+from PySide6.QtCore import Qt
+
+from generator_utils import as_int
+from pages.task_table_model import TaskTableModel, NO_TASK
+
+
+ALARM_TYPES = ["ONE_SHOT", "CYCLIC"]
+ALARM_ACTIONS = ["ACTIVATE_TASK", "TRIGGER_CALLBACK"]
+
+# Colonne
+COL_ALARM_ID = 0      # Alarm ID       (dal progetto o incrementale, non editabile)
+COL_TYPE = 1          # Alarm Type     (ONE_SHOT / CYCLIC)
+COL_ACTION = 2        # Alarm Action   (ACTIVATE_TASK / TRIGGER_CALLBACK)
+COL_PERIOD = 3        # Period [ms]
+COL_TASK_NAME = 4     # Task Name      (solo ACTIVATE_TASK)
+COL_TASK_ID = 5       # Task ID        (auto da Task Name, non editabile)
+COL_CALLBACK = 6      # Callback       (solo TRIGGER_CALLBACK)
+
+HEADERS = ["Alarm ID", "Alarm Type", "Alarm Action", "Period [ms]", "Task Name", "Task ID", "Callback"]
+
+
+def _code(values, value, default: int = 0) -> int:
+    try:
+        return values.index(value)
+    except ValueError:
+        return default
+
+
+class AlarmStore:
+    """
+    Allarmi per colonne: array tipizzati per i campi numerici e i codici
+    di Type / Action, una lista per le callback (None se non impostata).
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.alarm_id = array("q")
+        self.type = bytearray()
+        self.action = bytearray()
+        self.period = array("q")
+        self.task_id = array("q")
+        self.callback = []
+
+    def __len__(self):
+        return len(self.alarm_id)
+
+    def append(self, alarm: dict):
+        """alarm: dict con il layout di get_alarms (campi mancanti = default)."""
+        self.alarm_id.append(as_int(alarm.get("alarm_id", len(self)), len(self)))
+        self.type.append(_code(ALARM_TYPES, alarm.get("alarm_type", "ONE_SHOT")))
+        self.action.append(_code(ALARM_ACTIONS, alarm.get("alarm_action", "ACTIVATE_TASK")))
+        self.period.append(as_int(alarm.get("period_ms", 0)))
+        task_id = alarm.get("task_id")
+        self.task_id.append(NO_TASK if task_id is None else as_int(task_id))
+        callback = alarm.get("callback") or None
+        if callback is None and self.is_callback(len(self.callback)):
+            callback = f"MyAlarmCallback_{self.alarm_id[-1]}"
+        self.callback.append(callback)
+
+    def remove(self, row: int, count: int = 1):
+        for column in (self.alarm_id, self.type, self.action, self.period, self.task_id, self.callback):
+            del column[row:row + count]
+
+    def is_callback(self, row: int) -> bool:
+        return ALARM_ACTIONS[self.action[row]] == "TRIGGER_CALLBACK"
+
+
+class AlarmTableModel(TaskTableModel):
+    HEADERS = HEADERS
+    COL_TASK_NAME = COL_TASK_NAME
+    COL_TASK_ID = COL_TASK_ID
+    store_class = AlarmStore
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel (righe, intestazioni e catalogo in TaskTableModel)
+    # ------------------------------------------------------------------
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+        store = self.store
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter if col in (COL_ALARM_ID, COL_PERIOD, COL_TASK_ID) else None
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+
+        if col == COL_ALARM_ID:
+            return store.alarm_id[row]
+        if col == COL_TYPE:
+            return ALARM_TYPES[store.type[row]]
+        if col == COL_ACTION:
+            return ALARM_ACTIONS[store.action[row]]
+        if col == COL_PERIOD:
+            return store.period[row]
+        if store.is_callback(row):
+            return (store.callback[row] or "") if col == COL_CALLBACK else ""
+        if col == COL_TASK_NAME:
+            return self.task_name_data(row, role)
+        if col == COL_TASK_ID:
+            return str(self.task_id(row))
+        return ""
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        col = index.column()
+        enabled = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if col in (COL_TYPE, COL_ACTION, COL_PERIOD):
+            return enabled | Qt.ItemIsEditable
+        callback = self.store.is_callback(index.row())
+        if col == COL_TASK_NAME:
+            return Qt.NoItemFlags if callback else enabled | Qt.ItemIsEditable
+        if col == COL_TASK_ID:
+            return Qt.NoItemFlags if callback else enabled
+        if col == COL_CALLBACK:
+            return enabled | Qt.ItemIsEditable if callback else Qt.NoItemFlags
+        return enabled
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        store = self.store
+
+        if col == COL_TYPE:
+            store.type[row] = _code(ALARM_TYPES, value, store.type[row])
+        elif col == COL_ACTION:
+            store.action[row] = _code(ALARM_ACTIONS, value, store.action[row])
+            if store.is_callback(row) and not store.callback[row]:
+                store.callback[row] = f"MyAlarmCallback_{store.alarm_id[row]}"
+            # cambiano abilitazione e contenuto di Task e Callback
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+            return True
+        elif col == COL_PERIOD:
+            store.period[row] = as_int(value, store.period[row])
+        elif col == COL_TASK_NAME:
+            return self.set_task_id(index, value)
+        elif col == COL_CALLBACK:
+            store.callback[row] = str(value).strip() or None
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    # ------------------------------------------------------------------
+    # Righe
+    # ------------------------------------------------------------------
+    append_alarm = TaskTableModel.append_row
+    set_alarms = TaskTableModel.set_rows
+    append_alarms = TaskTableModel.append_rows
+
+    def alarms(self):
+        """Allarmi con il layout di get_alarms (una riga alla volta)."""
+        store = self.store
+        for row in range(len(store)):
+            callback = store.is_callback(row)
+            yield {
+                "alarm_id": store.alarm_id[row],
+                "alarm_type": ALARM_TYPES[store.type[row]],
+                "alarm_action": ALARM_ACTIONS[store.action[row]],
+                "period_ms": store.period[row],
+                "task_id": None if callback else self.task_id(row),
+                "callback": store.callback[row] if callback else None,
+            }
@@ -0,0 +1,45 @@
+# pages/item_delegates.py
+#
+# Delegate per le tabelle model/view: l'editor (QComboBox) esiste solo
+# mentre una cella viene modificata, invece di un widget per riga.
+
+from PySide6.QtWidgets import QStyledItemDelegate, QComboBox
+from PySide6.QtCore import Qt, QAbstractItemModel
+
+
+class ComboBoxDelegate(QStyledItemDelegate):
+    """
+    Editor a tendina per una colonna.
+    items: funzione senza argomenti che ritorna [(testo, valore), ...],
+           oppure un modello Qt condiviso (testo = Qt.DisplayRole,
+           valore = Qt.UserRole, es. TaskCatalog.model); il valore e'
+           quello letto/scritto con Qt.EditRole
+    """
+
+    def __init__(self, items, parent=None):
+        super().__init__(parent)
+        self._items = items
+
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        if isinstance(self._items, QAbstractItemModel):
+            combo.setModel(self._items)
+        else:
+            for text, value in self._items():
+                combo.addItem(text, value)
+        # scelta applicata subito, senza aspettare la perdita del focus
+        combo.activated.connect(lambda _: self._commit(combo))
+        return combo
+
+    def _commit(self, combo):
+        self.commitData.emit(combo)
+        self.closeEditor.emit(combo)
+
+    def setEditorData(self, editor, index):
+        idx = editor.findData(index.data(Qt.EditRole))
+        if idx >= 0:
+            editor.setCurrentIndex(idx)
+
+    def setModelData(self, editor, model, index):
+        if editor.currentIndex() >= 0:
+            model.setData(index, editor.currentData(), Qt.EditRole)
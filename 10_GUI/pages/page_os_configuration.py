@@ -2,7 +2,7 @@
 
 from PySide6.QtWidgets import (
     QWidget, QLabel, QVBoxLayout, QHBoxLayout, QFormLayout,
-    QLineEdit, QCheckBox, QGroupBox
+    QLineEdit, QCheckBox, QGroupBox, QPushButton
 )
 from PySide6.QtCore import Qt
 
@@ -25,9 +25,46 @@ class OSConfigurationPage(QWidget):
         self.tick_ms = QLineEdit("1")
         self.ready_queue = QLineEdit("100")
 
+        # Ready Task Queue + profondita' massima calcolata dal wizard
+        # (schedule table, allarmi, WCET) e pulsante per usarla
+        self.ready_queue_hint = QLabel("")
+        self.btn_use_ready_queue = QPushButton("Use")
+        self.btn_use_ready_queue.setToolTip("Use the worst-case ready-queue depth as MAX_READY_TASKS")
+        self.btn_use_ready_queue.setVisible(False)
+        self.btn_use_ready_queue.clicked.connect(self.use_ready_queue_depth)
+        self._ready_queue_depth = None
+
+        # Desired OS Tick + tick consigliato (tick_advisor) e pulsante per
+        # applicarlo: il wizard riscala anche gli offset della schedule table
+        self.tick_hint = QLabel("")
+        self.btn_apply_tick = QPushButton("Apply")
+        self.btn_apply_tick.setToolTip(
+            "Use the longest tick that keeps every period exact and rescale the schedule-table offsets"
+        )
+        self.btn_apply_tick.setVisible(False)
+
+        tick_layout = QHBoxLayout()
+        tick_layout.addWidget(self.tick_ms)
+        tick_layout.addWidget(self.tick_hint)
+        tick_layout.addWidget(self.btn_apply_tick)
+
+        ready_queue_layout = QHBoxLayout()
+        ready_queue_layout.addWidget(self.ready_queue)
+        ready_queue_layout.addWidget(self.ready_queue_hint)
+        ready_queue_layout.addWidget(self.btn_use_ready_queue)
+
         general_layout.addRow("Scheduler Timer Freq (Hz):", self.scheduler_freq)
-        general_layout.addRow("Desired OS Tick (ms):", self.tick_ms)
-        general_layout.addRow("Ready Task Queue:", self.ready_queue)
+        general_layout.addRow("Desired OS Tick (ms):", tick_layout)
+        general_layout.addRow("Ready Task Queue:", ready_queue_layout)
+
+        # Tasks[] emesso gia' ordinato per priorita' (SORT_ALGORITHM /
+        # SORT_OPTION vengono scelti di conseguenza, vedi Summary)
+        self.presort_tasks = QCheckBox("Presort task table by priority")
+        self.presort_tasks.setToolTip(
+            "Emit Tasks[] sorted by priority (higher value first) so the OS "
+            "does not need to reorder it at startup"
+        )
+        general_layout.addRow("", self.presort_tasks)
 
         general_group.setLayout(general_layout)
 
@@ -59,6 +96,7 @@ class OSConfigurationPage(QWidget):
             "scheduler_freq": self.scheduler_freq.text(),
             "tick_ms": self.tick_ms.text(),
             "ready_queue": self.ready_queue.text(),
+            "presort_tasks": self.presort_tasks.isChecked(),
             "hooks": {
                 "startup": self.startup_hook.isChecked(),
                 "shutdown": self.shutdown_hook.isChecked(),
@@ -75,6 +113,7 @@ class OSConfigurationPage(QWidget):
         self.scheduler_freq.setText(str(data.get("scheduler_freq", "1000")))
         self.tick_ms.setText(str(data.get("tick_ms", "1")))
         self.ready_queue.setText(str(data.get("ready_queue", "100")))
+        self.presort_tasks.setChecked(bool(data.get("presort_tasks", False)))
 
         hooks = data.get("hooks", {})
         self.startup_hook.setChecked(bool(hooks.get("startup", False)))
@@ -82,4 +121,43 @@ class OSConfigurationPage(QWidget):
         self.pre_task_hook.setChecked(bool(hooks.get("pre_task", False)))
         self.post_task_hook.setChecked(bool(hooks.get("post_task", False)))
         self.error_hook.setChecked(bool(hooks.get("error", False)))
-        
\ No newline at end of file
+        
+
+    # ------------------------------------------------------------------
+    # Profondita' massima della ready queue (schedule_analysis)
+    # ------------------------------------------------------------------
+    def set_ready_queue_depth(self, depth, note: str = ""):
+        """
+        depth: profondita' massima calcolata (None se non disponibile)
+        note:  testo mostrato accanto al campo
+        """
+        self._ready_queue_depth = depth
+        if depth is None:
+            self.ready_queue_hint.setText(note)
+            self.btn_use_ready_queue.setVisible(False)
+            return
+
+        self.ready_queue_hint.setText(f"worst case: {depth}" + (f" ({note})" if note else ""))
+        self.btn_use_ready_queue.setVisible(self.ready_queue.text().strip() != str(max(depth, 1)))
+
+    def use_ready_queue_depth(self):
+        if self._ready_queue_depth is not None:
+            # mai una coda vuota (es. nessuna attivazione da tabella)
+            self.ready_queue.setText(str(max(self._ready_queue_depth, 1)))
+            self.btn_use_ready_queue.setVisible(False)
+
+    # ------------------------------------------------------------------
+    # Tick consigliato (tick_advisor)
+    # ------------------------------------------------------------------
+    def set_tick_advice(self, tick_ms, note: str = ""):
+        """
+        tick_ms: tick consigliato in ms (None se non disponibile)
+        note:    testo mostrato accanto al campo
+        """
+        if tick_ms is None:
+            self.tick_hint.setText(note)
+            self.btn_apply_tick.setVisible(False)
+            return
+
+        self.tick_hint.setText(f"longest exact: {tick_ms} ms" + (f" ({note})" if note else ""))
+        self.btn_apply_tick.setVisible(self.tick_ms.text().strip() != str(tick_ms))
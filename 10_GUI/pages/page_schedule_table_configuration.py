@@ -1,17 +1,19 @@
 # pages/page_schedule_table_configuration.py
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QTableWidget, QTableWidgetItem,
-    QPushButton, QHBoxLayout, QComboBox
+    QWidget, QVBoxLayout, QLabel, QTableView, QAbstractItemView,
+    QPushButton, QHBoxLayout, QCheckBox
 )
-from PySide6.QtCore import Qt
+
+from pages.schedule_table_model import ScheduleTableModel, COL_TASK_NAME
+from pages.item_delegates import ComboBoxDelegate
 
 
 class ScheduleTableConfigurationPage(QWidget):
     def __init__(self):
         super().__init__()
 
-        self.tasks = []  # lista di dict: [{"id": "0", "name": "TaskA", "priority": "1"}, ...]
+        self.catalog = None  # TaskCatalog condiviso, vedi set_task_catalog
 
         layout = QVBoxLayout(self)
 
@@ -21,12 +23,24 @@ class ScheduleTableConfigurationPage(QWidget):
         layout.addWidget(title_label)
 
         # --- Table ---
-        # Colonne:
+        # Colonne (vedi schedule_table_model):
         # 0: Task Name (dropdown)
         # 1: Task ID (auto, non editabile)
         # 2: Period [ms]
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Task Name", "Task ID", "Period [ms]"])
+        # 3: Offset [ticks] (valore iniziale del contatore: COUNTER_INIT + offset)
+        # Model/view come la pagina degli allarmi: i dati stanno in
+        # ScheduleTableModel e il combo Task Name viene creato dal delegate
+        # solo mentre la cella e' in modifica
+        self.model = ScheduleTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.table.setEditTriggers(
+            QAbstractItemView.DoubleClicked | QAbstractItemView.SelectedClicked
+            | QAbstractItemView.EditKeyPressed
+        )
+        self.table.verticalHeader().setDefaultSectionSize(24)
         self.table.horizontalHeader().setStretchLastSection(True)
 
         layout.addWidget(self.table)
@@ -42,169 +56,80 @@ class ScheduleTableConfigurationPage(QWidget):
         self.btn_delete.clicked.connect(self.delete_selected_row)
         btn_layout.addWidget(self.btn_delete)
 
+        # Collegato dal wizard (servono anche task e allarmi)
+        self.btn_optimize = QPushButton("Optimize Offsets")
+        self.btn_optimize.setToolTip(
+            "Spread the task releases across ticks to minimize the peak load"
+        )
+        btn_layout.addWidget(self.btn_optimize)
+
         layout.addLayout(btn_layout)
 
+        # Normalizzazione prima della generazione (schedule_normalizer):
+        # le entry unite sono elencate nella pagina Summary
+        self.normalize = QCheckBox("Merge duplicate and harmonically redundant events when generating")
+        self.normalize.setToolTip(
+            "Drop rows that only re-activate a task on ticks where another row of the "
+            "same task already activates it (same period and offset, or a multiple of "
+            "its period with a matching offset)"
+        )
+        self.normalize.setChecked(False)
+        layout.addWidget(self.normalize)
+
     # ------------------------------------------------------------------
-    # Richiamato dal wizard per passare la lista dei task
+    # Richiamato dal wizard: catalogo dei task condiviso (pages.task_catalog)
     # ------------------------------------------------------------------
-    def set_task_list(self, tasks):
-        self.tasks = tasks or []
-
-        # Aggiorna eventuali combo già esistenti
-        for row in range(self.table.rowCount()):
-            combo = self.table.cellWidget(row, 0)
-            if not isinstance(combo, QComboBox):
-                continue
-
-            current_id = None
-            id_item = self.table.item(row, 1)
-            if id_item:
-                current_id = id_item.text().strip()
-
-            combo.blockSignals(True)
-            combo.clear()
-            for t in self.tasks:
-                combo.addItem(t["name"], t["id"])  # SOLO nome, id nascosto
-            combo.blockSignals(False)
-
-            if current_id is not None:
-                for i in range(combo.count()):
-                    if combo.itemData(i) == current_id:
-                        combo.setCurrentIndex(i)
-                        break
-
-            self.update_task_id_for_row(row)
+    def set_task_catalog(self, catalog):
+        self.catalog = catalog
+        # Task Name / Task ID delle righe sono letti dal catalogo al paint:
+        # ai cambi dei task si ridisegnano solo le righe interessate
+        self.model.set_task_catalog(catalog)
+        self._task_delegate = ComboBoxDelegate(catalog.model, self.table)
+        self.table.setItemDelegateForColumn(COL_TASK_NAME, self._task_delegate)
 
     # ------------------------------------------------------------------
     # Aggiunge una nuova riga
     # ------------------------------------------------------------------
     def add_row(self):
-        row = self.table.rowCount()
-        self.table.insertRow(row)
-
-        # --- Task Name (dropdown) ---
-        combo = QComboBox()
-        for t in self.tasks:
-            combo.addItem(t["name"], t["id"])
-
-        self.table.setCellWidget(row, 0, combo)
-
-        combo.currentIndexChanged.connect(
-            lambda idx, r=row: self.update_task_id_for_row(r)
-        )
-
-        # --- Task ID ---
-        task_id_item = QTableWidgetItem("")
-        task_id_item.setTextAlignment(Qt.AlignCenter)
-        task_id_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-        self.table.setItem(row, 1, task_id_item)
-
-        # --- Period [ms] ---
-        period_item = QTableWidgetItem("10")
-        period_item.setTextAlignment(Qt.AlignCenter)
-        self.table.setItem(row, 2, period_item)
-
-        self.update_task_id_for_row(row)
-
-    # ------------------------------------------------------------------
-    # Aggiorna Task ID in base alla selezione del task
-    # ------------------------------------------------------------------
-    def update_task_id_for_row(self, row):
-        combo = self.table.cellWidget(row, 0)
-        task_id_item = self.table.item(row, 1)
-
-        if not combo or not task_id_item:
-            return
-
-        idx = combo.currentIndex()
-        if idx < 0:
-            task_id_item.setText("")
-        else:
-            task_id_item.setText(str(combo.itemData(idx)))
-
-        self.table.viewport().update()
+        self.model.append_entry({
+            "task_id": None,   # primo task della lista
+            "period_ms": 10,
+            "offset": 0,
+        })
 
     # ------------------------------------------------------------------
     # Cancella la riga selezionata
     # ------------------------------------------------------------------
     def delete_selected_row(self):
-        row = self.table.currentRow()
+        row = self.table.currentIndex().row()
         if row >= 0:
-            self.table.removeRow(row)
+            self.model.removeRows(row, 1)
 
     # ------------------------------------------------------------------
     # Recupera le entry configurate
     # ------------------------------------------------------------------
     def get_schedule_entries(self):
-        entries = []
-        for row in range(self.table.rowCount()):
-            combo = self.table.cellWidget(row, 0)
-            task_id_item = self.table.item(row, 1)
-            period_item = self.table.item(row, 2)
-
-            if combo and combo.currentIndex() >= 0:
-                task_name = combo.currentText()
-            else:
-                task_name = ""
-
-            try:
-                task_id = int(task_id_item.text()) if task_id_item.text() else 0
-            except ValueError:
-                task_id = 0
-
-            try:
-                period_ms = int(period_item.text()) if period_item.text() else 0
-            except ValueError:
-                period_ms = 0
-
-            entries.append({
-                "task_id": task_id,
-                "task_name": task_name,
-                "period_ms": period_ms,
-            })
-
-        return entries
+        """
+        Ritorna una lista di dict:
+        [{"task_id": int, "task_name": str, "period_ms": int, "offset": int}, ...]
+        """
+        return list(self.model.entries())
 
     def set_schedule_entries(self, entries):
         """
-        entries: lista di dict [{ "task_id": int, "task_name": str, "period_ms": int }, ...]
-        ATTENZIONE: prima di chiamare questo, chiama set_task_list(tasks),
-        così i combo sono popolati.
+        entries: lista di dict [{ "task_id": int, "task_name": str, "period_ms": int,
+                                  "offset": int (opzionale) }, ...]
+        Il task di ogni riga e' cercato per ID nel catalogo al paint: se
+        l'ID non esiste, la riga mostra il primo task.
         """
-        self.table.setRowCount(0)
-
-        if not entries:
-            return
-
-        for e in entries:
-            row = self.table.rowCount()
-            self.table.insertRow(row)
-
-            # Task Name combo
-            combo = QComboBox()
-            for t in self.tasks:
-                combo.addItem(t["name"], t["id"])
-            self.table.setCellWidget(row, 0, combo)
-            combo.currentIndexChanged.connect(
-                lambda idx, r=row: self.update_task_id_for_row(r)
-            )
-
-            # Task ID cell
-            task_id_item = QTableWidgetItem("")
-            task_id_item.setTextAlignment(Qt.AlignCenter)
-            task_id_item.setFlags(Qt.ItemIsSelectable | Qt.ItemIsEnabled)
-            self.table.setItem(row, 1, task_id_item)
-
-            # Period
-            period_item = QTableWidgetItem(str(e.get("period_ms", 0)))
-            period_item.setTextAlignment(Qt.AlignCenter)
-            self.table.setItem(row, 2, period_item)
-
-            # seleziona il task corretto in base a task_id
-            target_id = str(e.get("task_id", 0))
-            for i in range(combo.count()):
-                if str(combo.itemData(i)) == target_id:
-                    combo.setCurrentIndex(i)
-                    break
-
-            self.update_task_id_for_row(row)
+        self.model.set_entries(entries)
+
+    def append_schedule_entries(self, entries):
+        """Aggiunge un blocco di entry (caricamento a blocchi del wizard)."""
+        self.model.append_entries(entries)
+
+    # ------------------------------------------------------------------
+    # Imposta gli offset (uno per riga, None = invariato)
+    # ------------------------------------------------------------------
+    def set_offsets(self, offsets):
+        self.model.set_offsets(offsets)
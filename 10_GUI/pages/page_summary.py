@@ -1,8 +1,11 @@
 # pages/page_summary.py
 
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QGroupBox, QFormLayout
+    QWidget, QVBoxLayout, QLabel, QGroupBox, QFormLayout, QComboBox
 )
+from PySide6.QtGui import QFontDatabase
+
+from footprint import TARGET_PROFILES, DEFAULT_PROFILE
 
 class SummaryPage(QWidget):
     def __init__(self):
@@ -35,14 +38,26 @@ class SummaryPage(QWidget):
         self.tasks_group = QGroupBox("Tasks")
         tasks_layout = QFormLayout()
         self.lbl_num_tasks = QLabel("0")
+        self.lbl_task_order = QLabel("-")
+        self.lbl_sort_config = QLabel("-")
+        self.lbl_sort_reason = QLabel("")
+        self.lbl_sort_reason.setWordWrap(True)
         tasks_layout.addRow("Number of Tasks:", self.lbl_num_tasks)
+        tasks_layout.addRow("Task Table Order:", self.lbl_task_order)
+        tasks_layout.addRow("Runtime Sort:", self.lbl_sort_config)
+        tasks_layout.addRow(self.lbl_sort_reason)
         self.tasks_group.setLayout(tasks_layout)
 
         # --- Schedule Table Summary ---
         self.schedule_group = QGroupBox("Schedule Table")
         schedule_layout = QFormLayout()
         self.lbl_num_schedule_events = QLabel("0")
+        self.lbl_generated_events = QLabel("-")
+        self.lbl_schedule_merges = QLabel("")
+        self.lbl_schedule_merges.setWordWrap(True)
         schedule_layout.addRow("Number of Schedule Table Events:", self.lbl_num_schedule_events)
+        schedule_layout.addRow("Generated Events:", self.lbl_generated_events)
+        schedule_layout.addRow(self.lbl_schedule_merges)
         self.schedule_group.setLayout(schedule_layout)
 
         # --- Alarms Summary ---
@@ -52,11 +67,46 @@ class SummaryPage(QWidget):
         alarms_layout.addRow("Number of Alarms:", self.lbl_num_alarms)
         self.alarms_group.setLayout(alarms_layout)
 
+        # --- Timing Analysis (iperperiodo, utilizzo CPU, tick di picco) ---
+        self.analysis_group = QGroupBox("Timing Analysis")
+        analysis_layout = QFormLayout()
+        self.lbl_hyperperiod = QLabel("-")
+        self.lbl_utilization = QLabel("-")
+        self.lbl_peak_load = QLabel("-")
+        self.lbl_peak_releases = QLabel("-")
+        self.lbl_analysis_notes = QLabel("")
+        self.lbl_analysis_notes.setWordWrap(True)
+        analysis_layout.addRow("Hyperperiod:", self.lbl_hyperperiod)
+        analysis_layout.addRow("CPU Utilization:", self.lbl_utilization)
+        analysis_layout.addRow("Peak Tick Load:", self.lbl_peak_load)
+        analysis_layout.addRow("Peak Releases per Tick:", self.lbl_peak_releases)
+        analysis_layout.addRow(self.lbl_analysis_notes)
+        self.analysis_group.setLayout(analysis_layout)
+
+        # --- Memory Footprint (tabelle generate, per profilo di target) ---
+        self.footprint_group = QGroupBox("Memory Footprint")
+        footprint_layout = QFormLayout()
+        self.cmb_target = QComboBox()
+        for key, profile in TARGET_PROFILES.items():
+            self.cmb_target.addItem(profile["label"], key)
+        self.cmb_target.setCurrentIndex(self.cmb_target.findData(DEFAULT_PROFILE))
+        self.lbl_ram = QLabel("-")
+        self.lbl_rom = QLabel("-")
+        self.lbl_footprint_tables = QLabel("")
+        self.lbl_footprint_tables.setFont(QFontDatabase.systemFont(QFontDatabase.FixedFont))
+        footprint_layout.addRow("Target:", self.cmb_target)
+        footprint_layout.addRow("RAM (bytes):", self.lbl_ram)
+        footprint_layout.addRow("ROM (bytes):", self.lbl_rom)
+        footprint_layout.addRow(self.lbl_footprint_tables)
+        self.footprint_group.setLayout(footprint_layout)
+
         main_layout.addWidget(self.os_group)
         main_layout.addWidget(self.hooks_group)
         main_layout.addWidget(self.tasks_group)
         main_layout.addWidget(self.schedule_group)
         main_layout.addWidget(self.alarms_group)
+        main_layout.addWidget(self.analysis_group)
+        main_layout.addWidget(self.footprint_group)
 
         main_layout.addStretch()
         self.setLayout(main_layout)
@@ -72,4 +122,92 @@ class SummaryPage(QWidget):
         if schedule is not None:
             self.lbl_num_schedule_events.setText(str(schedule))
         if alarms is not None:
-            self.lbl_num_alarms.setText(str(alarms))
\ No newline at end of file
+            self.lbl_num_alarms.setText(str(alarms))
+
+    def update_schedule_merges(self, generated: int, merges, enabled: bool = True):
+        """
+        generated: entry della schedule table dopo la normalizzazione
+        merges:    unioni ritornate da schedule_normalizer.normalize_schedule
+        """
+        if not enabled:
+            self.lbl_generated_events.setText(f"{generated} (merging disabled)")
+        elif merges:
+            self.lbl_generated_events.setText(f"{generated} ({len(merges)} merged)")
+        else:
+            self.lbl_generated_events.setText(str(generated))
+        self.lbl_schedule_merges.setText("\n".join(m["message"] for m in merges))
+
+    def update_sort_config(self, sort_config, presort: bool):
+        """
+        sort_config: dict ritornato da os_task_cfg_generator.select_sort_config
+        presort:     Tasks[] viene emesso ordinato per priorita'
+        """
+        if presort:
+            self.lbl_task_order.setText("Sorted by priority at generation time")
+        elif sort_config["presorted"]:
+            self.lbl_task_order.setText("Table order (already sorted by priority)")
+        else:
+            self.lbl_task_order.setText("Table order")
+        self.lbl_sort_config.setText(f"{sort_config['algorithm']}, {sort_config['option']}")
+        self.lbl_sort_reason.setText(sort_config["reason"])
+
+    def target_profile(self) -> str:
+        """Profilo di target selezionato (chiave di footprint.TARGET_PROFILES)."""
+        return self.cmb_target.currentData()
+
+    def update_footprint(self, footprint):
+        """
+        footprint: dict ritornato da footprint.estimate_footprint
+        """
+        self.lbl_ram.setText(str(footprint["ram"]))
+        self.lbl_rom.setText(str(footprint["rom"]))
+        self.lbl_footprint_tables.setText("\n".join(
+            f"{t['name']:<32} {t['count']:>5} x {t['size']:>2} B  "
+            f"RAM {t['ram']:>6}  ROM {t['rom']:>6}"
+            for t in footprint["tables"]
+        ))
+
+    def update_analysis(self, analysis):
+        """
+        analysis: dict ritornato da schedule_analysis.analyze_project
+        """
+        h = analysis["hyperperiod_ticks"]
+        if not h:
+            self.lbl_hyperperiod.setText("-")
+            self.lbl_utilization.setText("-")
+            self.lbl_peak_load.setText("-")
+            self.lbl_peak_releases.setText("-")
+            self.lbl_analysis_notes.setText("No periodic task activations configured.")
+            return
+
+        self.lbl_hyperperiod.setText(f"{h} ticks ({analysis['hyperperiod_ms']:g} ms)")
+
+        notes = []
+        if analysis["utilization"] is None:
+            self.lbl_utilization.setText("n/a")
+            notes.append("Enter the task WCET on the Task page to compute the CPU load.")
+        else:
+            self.lbl_utilization.setText(f"{analysis['utilization'] * 100:.1f} %")
+            if analysis["utilization"] > 1.0:
+                notes.append("CPU utilization is above 100%: the schedule is not feasible.")
+            if analysis["missing_wcet"]:
+                ids = ", ".join(str(tid) for tid in analysis["missing_wcet"])
+                notes.append(f"Tasks without WCET (counted as 0): {ids}.")
+
+        if not analysis["profiled"]:
+            self.lbl_peak_load.setText("n/a")
+            self.lbl_peak_releases.setText("n/a")
+            notes.append("Hyperperiod too long for a per-tick analysis in the GUI "
+                         "(scheduler_simulator.py handles longer ones).")
+        else:
+            if analysis["peak_tick_load"] is None:
+                self.lbl_peak_load.setText("n/a")
+            else:
+                self.lbl_peak_load.setText(
+                    f"{analysis['peak_tick_load'] * 100:.1f} % at tick {analysis['peak_load_tick']}"
+                )
+            self.lbl_peak_releases.setText(
+                f"{analysis['peak_releases']} at tick {analysis['peak_releases_tick']}"
+            )
+
+        self.lbl_analysis_notes.setText("\n".join(notes))
@@ -6,6 +6,8 @@ from PySide6.QtWidgets import (
 )
 from PySide6.QtCore import Qt
 
+from pages.table_batch import suspended_updates
+
 
 class TaskConfigurationPage(QWidget):
     def __init__(self):
@@ -22,8 +24,9 @@ class TaskConfigurationPage(QWidget):
         # 0: Task ID
         # 1: Task Name
         # 2: Task Priority
-        self.table = QTableWidget(0, 3)
-        self.table.setHorizontalHeaderLabels(["Task ID", "Task Name", "Task Priority"])
+        # 3: WCET [us]     (opzionale, usato solo dall'analisi temporale)
+        self.table = QTableWidget(0, 4)
+        self.table.setHorizontalHeaderLabels(["Task ID", "Task Name", "Task Priority", "WCET [us]"])
         self.table.horizontalHeader().setStretchLastSection(True)
 
         layout.addWidget(self.table)
@@ -44,10 +47,12 @@ class TaskConfigurationPage(QWidget):
     # ------------------------------------------------------------------
     # Funzione interna: crea una riga task con stile uniforme
     # ------------------------------------------------------------------
-    def add_task_row(self, task_id, name, priority):
+    def add_task_row(self, task_id, name, priority, wcet_us=""):
         row = self.table.rowCount()
         self.table.insertRow(row)
+        self._fill_task_row(row, task_id, name, priority, wcet_us)
 
+    def _fill_task_row(self, row, task_id, name, priority, wcet_us=""):
         # Task ID (centrato)
         id_item = QTableWidgetItem(str(task_id))
         id_item.setTextAlignment(Qt.AlignCenter)
@@ -63,6 +68,11 @@ class TaskConfigurationPage(QWidget):
         prio_item.setTextAlignment(Qt.AlignCenter)
         self.table.setItem(row, 2, prio_item)
 
+        # WCET [us] (centrato, vuoto = non specificato)
+        wcet_item = QTableWidgetItem(str(wcet_us))
+        wcet_item.setTextAlignment(Qt.AlignCenter)
+        self.table.setItem(row, 3, wcet_item)
+
     # ------------------------------------------------------------------
     # Aggiunge una nuova riga dalla GUI
     # ------------------------------------------------------------------
@@ -75,12 +85,23 @@ class TaskConfigurationPage(QWidget):
     # ------------------------------------------------------------------
     def set_tasks(self, tasks):
         self.table.setRowCount(0)
-
-        for t in tasks:
-            tid = t.get("id", 0)
-            name = t.get("name", f"Task_{tid}")
-            prio = t.get("priority", "1")
-            self.add_task_row(tid, name, prio)
+        self.append_tasks(tasks)
+
+    def append_tasks(self, tasks):
+        """
+        Aggiunge un blocco di task in fondo alla tabella (caricamento a
+        blocchi del wizard): righe create in una volta, ridisegno e
+        segnali sospesi fino alla fine del blocco.
+        """
+        start = self.table.rowCount()
+        with suspended_updates(self.table):
+            self.table.setRowCount(start + len(tasks))
+            for row, t in enumerate(tasks, start):
+                tid = t.get("id", 0)
+                name = t.get("name", f"Task_{tid}")
+                prio = t.get("priority", "1")
+                wcet = t.get("wcet_us", "")
+                self._fill_task_row(row, tid, name, prio, wcet)
 
     # ------------------------------------------------------------------
     # Cancella riga selezionata
@@ -99,11 +120,13 @@ class TaskConfigurationPage(QWidget):
             task_id_item = self.table.item(row, 0)
             name_item = self.table.item(row, 1)
             prio_item = self.table.item(row, 2)
+            wcet_item = self.table.item(row, 3)
 
             tasks.append({
                 "id": task_id_item.text().strip() if task_id_item else "",
                 "name": name_item.text().strip() if name_item else "",
                 "priority": prio_item.text().strip() if prio_item else "",
+                "wcet_us": wcet_item.text().strip() if wcet_item else "",
             })
 
         return tasks
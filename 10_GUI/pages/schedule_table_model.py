@@ -0,0 +1,139 @@
+# pages/schedule_table_model.py
+#
+# Schedule table in forma model/view (come gli allarmi, vedi alarm_table_model):
+# - ScheduleStore: entry per colonne in array compatti (nessun oggetto Qt
+#   per riga)
+# - ScheduleTableModel: TaskTableModel (task_table_model) sopra
+#   ScheduleStore; Task Name e Task ID sono letti dal catalogo dei task al
+#   paint
+# Il combo di Task Name e' creato dal delegate (item_delegates) solo
+# durante la modifica di una cella.
+
+from array import array
+
+from PySide6.QtCore import Qt
+
+from generator_utils import as_int
+from pages.task_table_model import TaskTableModel, NO_TASK
+
+
+# Colonne
+COL_TASK_NAME = 0     # Task Name      (dropdown con tutti i task)
+COL_TASK_ID = 1       # Task ID        (auto da Task Name, non editabile)
+COL_PERIOD = 2        # Period [ms]
+COL_OFFSET = 3        # Offset [ticks] (valore iniziale del contatore: COUNTER_INIT + offset)
+
+HEADERS = ["Task Name", "Task ID", "Period [ms]", "Offset [ticks]"]
+
+
+class ScheduleStore:
+    """Entry della schedule table per colonne: task, periodo e offset."""
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.task_id = array("q")
+        self.period = array("q")
+        self.offset = array("q")
+
+    def __len__(self):
+        return len(self.task_id)
+
+    def append(self, entry: dict):
+        """entry: dict con il layout di get_schedule_entries (campi mancanti = default)."""
+        task_id = entry.get("task_id")
+        self.task_id.append(NO_TASK if task_id is None else as_int(task_id))
+        self.period.append(as_int(entry.get("period_ms", 0)))
+        self.offset.append(as_int(entry.get("offset", 0) or 0))
+
+    def remove(self, row: int, count: int = 1):
+        for column in (self.task_id, self.period, self.offset):
+            del column[row:row + count]
+
+
+class ScheduleTableModel(TaskTableModel):
+    HEADERS = HEADERS
+    COL_TASK_NAME = COL_TASK_NAME
+    COL_TASK_ID = COL_TASK_ID
+    store_class = ScheduleStore
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel (righe, intestazioni e catalogo in TaskTableModel)
+    # ------------------------------------------------------------------
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, col = index.row(), index.column()
+
+        if role == Qt.TextAlignmentRole:
+            return Qt.AlignCenter if col != COL_TASK_NAME else None
+        if role not in (Qt.DisplayRole, Qt.EditRole):
+            return None
+
+        if col == COL_TASK_NAME:
+            return self.task_name_data(row, role)
+        if col == COL_TASK_ID:
+            return str(self.task_id(row)) if self.catalog is not None and len(self.catalog) else ""
+        if col == COL_PERIOD:
+            return self.store.period[row]
+        if col == COL_OFFSET:
+            return self.store.offset[row]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        enabled = Qt.ItemIsSelectable | Qt.ItemIsEnabled
+        if index.column() == COL_TASK_ID:
+            return enabled
+        return enabled | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        if not index.isValid() or role != Qt.EditRole:
+            return False
+        row, col = index.row(), index.column()
+        store = self.store
+
+        if col == COL_TASK_NAME:
+            return self.set_task_id(index, value)
+        if col == COL_PERIOD:
+            store.period[row] = as_int(value, store.period[row])
+        elif col == COL_OFFSET:
+            store.offset[row] = as_int(value, store.offset[row])
+        else:
+            return False
+        self.dataChanged.emit(index, index)
+        return True
+
+    # ------------------------------------------------------------------
+    # Righe
+    # ------------------------------------------------------------------
+    append_entry = TaskTableModel.append_row
+    set_entries = TaskTableModel.set_rows
+    append_entries = TaskTableModel.append_rows
+
+    def set_offsets(self, offsets):
+        """Offset per riga (None = invariato), un solo ridisegno della colonna."""
+        store = self.store
+        changed = False
+        for row, offset in enumerate(offsets):
+            if offset is None or row >= len(store):
+                continue
+            store.offset[row] = as_int(offset, store.offset[row])
+            changed = True
+        if changed:
+            self.dataChanged.emit(self.index(0, COL_OFFSET), self.index(len(store) - 1, COL_OFFSET))
+
+    def entries(self):
+        """Entry con il layout di get_schedule_entries (una riga alla volta)."""
+        store = self.store
+        catalog = self.catalog
+        for row in range(len(store)):
+            task_id = self.task_id(row)
+            yield {
+                "task_id": task_id,
+                "task_name": catalog.name(task_id) if catalog is not None else "",
+                "period_ms": store.period[row],
+                "offset": store.offset[row],
+            }
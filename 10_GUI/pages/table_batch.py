@@ -0,0 +1,23 @@
+# pages/table_batch.py
+#
+# Riempimento a blocchi delle tabelle (caricamento progressivo dei
+# progetti): ridisegno e segnali sospesi finche' il blocco non e' completo.
+
+from contextlib import contextmanager
+
+
+@contextmanager
+def suspended_updates(table):
+    """
+    with suspended_updates(self.table):
+        ... inserimento di molte righe ...
+    Un solo ridisegno alla fine invece di uno per riga.
+    """
+    updates = table.updatesEnabled()
+    signals = table.blockSignals(True)
+    table.setUpdatesEnabled(False)
+    try:
+        yield table
+    finally:
+        table.blockSignals(signals)
+        table.setUpdatesEnabled(updates)
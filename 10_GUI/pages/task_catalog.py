@@ -0,0 +1,108 @@
+# pages/task_catalog.py
+#
+# Catalogo dei task condiviso dalle pagine che li referenziano (schedule
+# table, allarmi):
+# - version: incrementata solo quando la lista dei task cambia davvero
+# - index_of / name: accesso per ID tramite dict (niente ricerche lineari
+#   nei combo)
+# - model: un solo QStandardItemModel (nome, ID str in Qt.UserRole) usato
+#   da tutti i combo Task Name. Le modifiche vengono applicate come
+#   inserimenti / rimozioni / rinomine di righe: i combo restano sul task
+#   selezionato senza essere ripopolati. Un modello C++ (non un
+#   QAbstractListModel in Python): ogni combo legge tutte le righe per
+#   calcolare la propria dimensione.
+
+from difflib import SequenceMatcher
+
+from PySide6.QtCore import Qt, QObject, Signal
+from PySide6.QtGui import QStandardItem, QStandardItemModel
+
+
+def _task_item(task_id: str, name: str) -> QStandardItem:
+    item = QStandardItem(name)
+    item.setData(task_id, Qt.UserRole)
+    return item
+
+
+class TaskCatalog(QObject):
+    # emesso prima di modificare il modello (i combo cambiano indice da soli)
+    about_to_change = Signal()
+    # ID (str) dei task aggiunti, tolti, rinominati o spostati
+    changed = Signal(object)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.version = 0
+        self.tasks = []
+        self.model = QStandardItemModel(self)
+        self._rows = []    # [(id, nome), ...], come le righe del modello
+        self._index = {}   # id -> indice nella lista (prima occorrenza)
+
+    # ------------------------------------------------------------------
+    # Lettura
+    # ------------------------------------------------------------------
+    def index_of(self, task_id) -> int:
+        """Indice del task (riga del modello), -1 se l'ID non esiste."""
+        return self._index.get(str(task_id).strip(), -1)
+
+    def name(self, task_id) -> str:
+        i = self.index_of(task_id)
+        return self.tasks[i]["name"] if i >= 0 else ""
+
+    def first_id(self):
+        """ID del primo task (None se non ci sono task)."""
+        return self._rows[0][0] if self._rows else None
+
+    def __len__(self):
+        return len(self.tasks)
+
+    # ------------------------------------------------------------------
+    # Aggiornamento
+    # ------------------------------------------------------------------
+    def set_tasks(self, tasks) -> bool:
+        """
+        tasks: [{"id": "0", "name": "Task_0", ...}, ...] (layout di get_tasks)
+
+        Ritorna False (nessun segnale, version invariata) se ID e nomi
+        sono gli stessi di prima.
+        """
+        tasks = list(tasks or [])
+        new_rows = [(str(t.get("id", "")).strip(), t.get("name", "")) for t in tasks]
+        old_rows = self._rows
+        self.tasks = tasks
+        if new_rows == old_rows:
+            return False
+
+        self.about_to_change.emit()
+        affected = set()
+        old_ids = [r[0] for r in old_rows]
+        new_ids = [r[0] for r in new_rows]
+        model = self.model
+        rows = self._rows
+        # dal fondo: gli indici dei blocchi precedenti restano validi
+        opcodes = SequenceMatcher(None, old_ids, new_ids, autojunk=False).get_opcodes()
+        for tag, i1, i2, j1, j2 in reversed(opcodes):
+            if tag == "equal":
+                continue
+            affected.update(old_ids[i1:i2])
+            affected.update(new_ids[j1:j2])
+            if i2 > i1:
+                model.removeRows(i1, i2 - i1)
+                del rows[i1:i2]
+            for k, (task_id, name) in enumerate(new_rows[j1:j2]):
+                model.insertRow(i1 + k, _task_item(task_id, name))
+            rows[i1:i1] = new_rows[j1:j2]
+
+        # stessi ID, nome cambiato
+        for row, (new, old) in enumerate(zip(new_rows, rows)):
+            if new != old:
+                rows[row] = new
+                affected.add(new[0])
+                model.item(row).setText(new[1])
+
+        self._index = {}
+        for i, task_id in enumerate(new_ids):
+            self._index.setdefault(task_id, i)
+        self.version += 1
+        self.changed.emit(affected)
+        return True
@@ -0,0 +1,136 @@
+# pages/task_table_model.py
+#
+# Base comune dei modelli di tabella con una colonna Task Name / Task ID
+# (schedule table, allarmi):
+# - store per colonne (store_class) con almeno la colonna task_id
+# - Task Name e Task ID letti dal TaskCatalog condiviso al paint; ai suoi
+#   cambi si ridisegnano solo le righe interessate
+# - righe: inserimento singolo, a blocchi e sostituzione completa
+# Le sottoclassi definiscono HEADERS, COL_TASK_NAME / COL_TASK_ID,
+# store_class, data(), flags() e setData().
+
+from PySide6.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+from generator_utils import as_int
+
+
+# task_id non ancora scelto: vale il primo task della lista (come il combo
+# di una riga nuova)
+NO_TASK = -1
+
+
+class TaskTableModel(QAbstractTableModel):
+    HEADERS = []
+    COL_TASK_NAME = None
+    COL_TASK_ID = None
+    store_class = None
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = self.store_class()
+        self.catalog = None
+
+    # ------------------------------------------------------------------
+    # Catalogo dei task (per Task Name / Task ID)
+    # ------------------------------------------------------------------
+    def set_task_catalog(self, catalog):
+        """catalog: TaskCatalog condiviso; le righe si aggiornano ai suoi cambi."""
+        self.catalog = catalog
+        catalog.changed.connect(self._on_tasks_changed)
+
+    def _on_tasks_changed(self, affected):
+        """
+        Ridisegna solo le righe di un task aggiunto, tolto, rinominato o
+        spostato, e quelle con un task non (piu') nel catalogo, che
+        mostrano il primo task.
+        """
+        affected_ids = {as_int(task_id, None) for task_id in affected}
+        catalog = self.catalog
+        first = last = None
+        for row, task_id in enumerate(self.store.task_id):
+            if task_id in affected_ids or catalog.index_of(task_id) < 0:
+                if first is None:
+                    first = row
+                last = row
+        if first is not None:
+            self.dataChanged.emit(self.index(first, self.COL_TASK_NAME),
+                                  self.index(last, self.COL_TASK_ID))
+
+    def task_id(self, row: int) -> int:
+        """
+        Task attivato dalla riga: quello salvato se esiste, altrimenti il
+        primo task della lista (0 se la lista e' vuota).
+        """
+        task_id = self.store.task_id[row]
+        catalog = self.catalog
+        if catalog is None:
+            return max(task_id, 0)
+        if catalog.index_of(task_id) >= 0:
+            return task_id
+        return as_int(catalog.first_id()) if catalog.first_id() is not None else 0
+
+    def task_name_data(self, row: int, role):
+        """Cella Task Name: nome del task, o il suo ID (str) per l'EditRole."""
+        task_id = self.task_id(row)
+        # EditRole: ID come Qt.UserRole del modello del catalogo (str)
+        if role == Qt.EditRole:
+            return str(task_id)
+        return self.catalog.name(task_id) if self.catalog is not None else ""
+
+    def set_task_id(self, index, value) -> bool:
+        """Nuovo task (ID dal combo) per la riga di index; ridisegna anche Task ID."""
+        row = index.row()
+        self.store.task_id[row] = as_int(value, self.store.task_id[row])
+        self.dataChanged.emit(index, self.index(row, self.COL_TASK_ID))
+        return True
+
+    # ------------------------------------------------------------------
+    # QAbstractTableModel
+    # ------------------------------------------------------------------
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role != Qt.DisplayRole:
+            return None
+        # numeri di riga gestiti qui: con PySide6 6.12 super().headerData()
+        # chiamato per molte righe rovina il refcount di None (crash in uscita)
+        return self.HEADERS[section] if orientation == Qt.Horizontal else section + 1
+
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self.store):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        self.store.remove(row, count)
+        self.endRemoveRows()
+        return True
+
+    # ------------------------------------------------------------------
+    # Righe (dict con il layout del progetto, vedi store_class.append)
+    # ------------------------------------------------------------------
+    def append_row(self, values: dict):
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.store.append(values)
+        self.endInsertRows()
+
+    def set_rows(self, rows):
+        """Sostituisce tutte le righe (un solo reset del modello)."""
+        self.beginResetModel()
+        self.store.clear()
+        for values in rows or []:
+            self.store.append(values)
+        self.endResetModel()
+
+    def append_rows(self, rows):
+        """Aggiunge un blocco di righe in fondo (un solo inserimento di righe)."""
+        if not rows:
+            return
+        row = len(self.store)
+        self.beginInsertRows(QModelIndex(), row, row + len(rows) - 1)
+        for values in rows:
+            self.store.append(values)
+        self.endInsertRows()
@@ -0,0 +1,498 @@
+# project_generator.py
+#
+# Generazione completa dei file di configurazione a partire dal dict
+# "project" (lo stesso layout scritto da RTOSWizard.save_project_as).
+# Questo modulo NON deve importare PySide6: viene usato sia dalla GUI
+# sia dalla linea di comando (chaos_gen.py).
+
+import glob
+import json
+import os
+import shutil
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Dict, List
+
+from os_cfg_generator import generate_os_cfg
+from os_task_cfg_generator import generate_os_task_cfg, select_sort_config
+from os_sched_tbl_cfg_generator import generate_os_sched_tbl_cfg
+from os_alarms_cfg_generator import generate_os_alarms_cfg
+from generator_utils import commit_staged_files, project_tick_ms
+from schedule_normalizer import normalized_project
+from instrumentation import Instrumentation
+
+
+# Cartella dei template accanto ai sorgenti del tool
+DEFAULT_TEMPLATES_DIR = Path(__file__).resolve().parent / "templates"
+
+# Elenco dei file prodotti da generate_project (nell'ordine di generazione)
+OUTPUT_FILES = [
+    "os_cfg.h",
+    "os_task_cfg.h",
+    "os_task_cfg.c",
+    "os_sched_tbl_cfg.h",
+    "os_sched_tbl_cfg.c",
+    "os_alarms_cfg.h",
+    "os_alarms_cfg.c",
+]
+
+# File prodotti da ciascuna famiglia di generatori (per il progresso)
+FAMILY_OUTPUTS = {
+    "os": ["os_cfg.h"],
+    "tasks": ["os_task_cfg.h", "os_task_cfg.c"],
+    "schedule": ["os_sched_tbl_cfg.h", "os_sched_tbl_cfg.c"],
+    "alarms": ["os_alarms_cfg.h", "os_alarms_cfg.c"],
+}
+
+# Nome della fase (per Instrumentation) di ciascuna famiglia
+FAMILY_STAGES = {
+    "os": "generate_os_cfg",
+    "tasks": "generate_os_task_cfg",
+    "schedule": "generate_os_sched_tbl_cfg",
+    "alarms": "generate_os_alarms_cfg",
+}
+
+
+def load_project_file(path: str) -> Dict:
+    """
+    Legge un file .chaos_cfg (JSON) e ritorna il dict del progetto.
+    """
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class GenerationError(RuntimeError):
+    """
+    Uno o piu' generatori sono falliti. errors: {famiglia: eccezione}
+    (famiglie: "os", "tasks", "schedule", "alarms").
+    """
+
+    def __init__(self, errors: Dict[str, BaseException]):
+        self.errors = errors
+        msg = "; ".join(f"{family}: {err}" for family, err in errors.items())
+        super().__init__(msg)
+
+
+class GenerationCancelled(Exception):
+    """La generazione e' stata annullata: la cartella di output non e' stata toccata."""
+
+
+def generate_project(project: Dict, output_dir: str = "generated",
+                     templates_dir: str = None,
+                     warnings: List[str] = None,
+                     parallel: str = None,
+                     progress=None,
+                     cancel=None,
+                     timings: Dict[str, float] = None,
+                     instrumentation: Instrumentation = None,
+                     schedule_merges: List[Dict] = None,
+                     versioned_output: bool = False) -> List[str]:
+    """
+    project: dict con il layout di save_project_as:
+        {
+            "version": 1,
+            "os": {"scheduler_freq": str, "tick_ms": str, "ready_queue": str,
+                   "presort_tasks": bool (opzionale), "hooks": {...}},
+            "tasks": [...],
+            "schedule": [...],
+            "alarms": [...],
+            "normalize_schedule": bool (opzionale, default False),
+        }
+    output_dir:    cartella dove scrivere i file generati
+    templates_dir: cartella dei template (default: templates/ del tool)
+    warnings:      lista (opzionale) dove raccogliere gli avvisi dei
+                   generatori (es. #define non trovati nei template)
+    parallel:      None -> famiglie eseguite in sequenza
+                   "thread" / "process" -> le quattro famiglie (OS, task,
+                   schedule table, alarms) girano in parallelo su un pool
+    progress:      callback opzionale progress(done, total, label) chiamata
+                   man mano che i file sono pronti (done/total in numero di file)
+    cancel:        oggetto opzionale con is_set() (es. threading.Event):
+                   se impostato, la generazione si ferma con GenerationCancelled
+                   prima di toccare output_dir
+    timings:       dict (opzionale) riempito con la durata in ms di ogni
+                   famiglia e della fase di "commit"
+    instrumentation: Instrumentation (opzionale): una fase per ogni
+                   generatore (durata, entita', byte scritti; picco di
+                   memoria solo in sequenza) e una per il "commit"
+    schedule_merges: lista (opzionale) dove raccogliere le entry della
+                   schedule table unite dalla normalizzazione
+                   (vedi schedule_normalizer.normalize_schedule)
+    versioned_output: output_dir come link simbolico a una cartella
+                   versione, aggiornato con una sola rinomina (vedi
+                   generator_utils.commit_staged_files); default: cartella
+                   vera, un os.replace per file cambiato
+
+    Ritorna la lista dei file effettivamente riscritti: i file il cui
+    contenuto non e' cambiato non vengono toccati (mtime preservato).
+    I file vengono aggiornati solo se TUTTI i generatori hanno successo,
+    altrimenti alza GenerationError con gli errori di ogni famiglia.
+    """
+    tpl = Path(templates_dir) if templates_dir else DEFAULT_TEMPLATES_DIR
+    with _stage(instrumentation, "generate", **project_counts(project)) as record:
+        # duplicati e armoniche della schedule table (se non disattivato)
+        with _stage(instrumentation, "normalize_schedule", **_family_counts("schedule", project)):
+            project, merges = normalized_project(project)
+        if schedule_merges is not None:
+            schedule_merges.extend(merges)
+        changed = _generate_staged(project, tpl, Path(output_dir), warnings,
+                                   parallel, progress, cancel, timings, instrumentation,
+                                   versioned_output)
+        record["bytes_written"] = sum(os.path.getsize(p) for p in changed)
+    return changed
+
+
+def _generate_staged(project: Dict, tpl: Path, out: Path, warnings, parallel,
+                     progress, cancel, timings, instrumentation,
+                     versioned_output) -> List[str]:
+    """Corpo di generate_project (misurato come fase "generate")."""
+    # Tutti i file vengono prima generati in una cartella temporanea accanto
+    # a output_dir (stesso filesystem -> os.replace atomico). Se un
+    # generatore fallisce, output_dir resta esattamente com'era.
+    out.parent.mkdir(parents=True, exist_ok=True)
+    staging = Path(tempfile.mkdtemp(prefix=f".{out.name}.staging-", dir=str(out.parent)))
+    try:
+        family_warnings, errors, family_ms = _run_families(
+            project, str(tpl), str(staging), parallel, progress, cancel,
+            instrumentation,
+        )
+
+        # avvisi e durate nell'ordine fisso delle famiglie
+        for family, _ in GENERATOR_FAMILIES:
+            if timings is not None and family in family_ms:
+                timings[family] = family_ms[family]
+            if warnings is not None:
+                warnings.extend(family_warnings.get(family, []))
+        if errors:
+            raise GenerationError(errors)
+        if cancel is not None and cancel.is_set():
+            raise GenerationCancelled()
+
+        t0 = time.perf_counter()
+        with _stage(instrumentation, "commit") as record:
+            changed = commit_staged_files(str(staging), str(out), OUTPUT_FILES,
+                                          versioned=versioned_output)
+            record["bytes_written"] = sum(os.path.getsize(p) for p in changed)
+        if timings is not None:
+            timings["commit"] = (time.perf_counter() - t0) * 1000.0
+        if progress is not None:
+            progress(len(OUTPUT_FILES) + 1, len(OUTPUT_FILES) + 1, "commit")
+        return changed
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def _stage(instrumentation: Instrumentation, name: str, **counts):
+    """instrumentation.stage(...) oppure un contesto vuoto se non misurato."""
+    if instrumentation is None:
+        return nullcontext({})
+    return instrumentation.stage(name, **counts)
+
+
+def project_counts(project: Dict) -> Dict[str, int]:
+    """Numero di task, eventi della schedule table e allarmi del progetto."""
+    return {key: len(project.get(key, []) or []) for key in ("tasks", "schedule", "alarms")}
+
+
+def _family_counts(family: str, project: Dict) -> Dict[str, int]:
+    """Numero di entita' elaborate da una famiglia (per il report)."""
+    if family not in ("tasks", "schedule", "alarms"):
+        return {}
+    return {family: len(project.get(family, []) or [])}
+
+
+def _timed_family(family: str, fn, project: Dict, tpl: str, out: str):
+    """
+    Esegue una famiglia e ne misura la durata e i byte scritti:
+    ritorna (avvisi, ms, byte).
+    """
+    t0 = time.perf_counter()
+    warnings = fn(project, tpl, out)
+    ms = (time.perf_counter() - t0) * 1000.0
+    nbytes = sum(os.path.getsize(Path(out) / name) for name in FAMILY_OUTPUTS[family])
+    return warnings, ms, nbytes
+
+
+def _run_families(project: Dict, tpl: str, out: str, parallel: str = None,
+                  progress=None, cancel=None,
+                  instrumentation: Instrumentation = None):
+    """
+    Esegue tutte le famiglie di generatori (in sequenza o su un pool).
+    Un errore in una famiglia non interrompe le altre; cancel (se impostato)
+    evita di avviare le famiglie non ancora partite.
+    Ritorna ({famiglia: [avvisi]}, {famiglia: eccezione}, {famiglia: ms}).
+    """
+    family_warnings = {}
+    errors = {}
+    family_ms = {}
+    # +1: l'ultimo passo e' il commit dei file nella cartella finale
+    total = len(OUTPUT_FILES) + 1
+    done = 0
+
+    def _family_done(family):
+        nonlocal done
+        done += len(FAMILY_OUTPUTS[family])
+        if progress is not None:
+            progress(done, total, ", ".join(FAMILY_OUTPUTS[family]))
+
+    if parallel is None:
+        for family, fn in GENERATOR_FAMILIES:
+            if cancel is not None and cancel.is_set():
+                break
+            try:
+                # in sequenza la fase misura anche il picco di memoria
+                with _stage(instrumentation, FAMILY_STAGES[family],
+                            **_family_counts(family, project)) as record:
+                    family_warnings[family], family_ms[family], record["bytes_written"] = \
+                        _timed_family(family, fn, project, tpl, out)
+            except Exception as e:
+                errors[family] = e
+            _family_done(family)
+        return family_warnings, errors, family_ms
+
+    if parallel == "thread":
+        executor = ThreadPoolExecutor(max_workers=len(GENERATOR_FAMILIES))
+    elif parallel == "process":
+        executor = ProcessPoolExecutor(max_workers=len(GENERATOR_FAMILIES))
+    else:
+        raise ValueError(f"parallel deve essere None, 'thread' o 'process' (non {parallel!r})")
+
+    with executor:
+        futures = {
+            executor.submit(_timed_family, family, fn, project, tpl, out): family
+            for family, fn in GENERATOR_FAMILIES
+        }
+        for fut in as_completed(futures):
+            family = futures[fut]
+            if cancel is not None and cancel.is_set():
+                for f in futures:
+                    f.cancel()
+            if fut.cancelled():
+                continue
+            try:
+                family_warnings[family], family_ms[family], nbytes = fut.result()
+            except Exception as e:
+                errors[family] = e
+            else:
+                if instrumentation is not None:
+                    instrumentation.add(FAMILY_STAGES[family], family_ms[family],
+                                        bytes_written=nbytes,
+                                        **_family_counts(family, project))
+            _family_done(family)
+
+    return family_warnings, errors, family_ms
+
+
+# ----------------------------------------------------------------------
+# Famiglie di generatori: indipendenti tra loro, ognuna legge solo la sua
+# parte del progetto e scrive i suoi file in out. Ritornano gli avvisi.
+# (funzioni a livello di modulo: devono essere picklable per i processi)
+# ----------------------------------------------------------------------
+def _generate_os_family(project: Dict, tpl: str, out: str) -> List[str]:
+    warnings = []
+    os_cfg = project.get("os", {}) or {}
+    os_config = {
+        "scheduler_freq": str(os_cfg.get("scheduler_freq", "1000")),
+        "tick_ms": str(os_cfg.get("tick_ms", "1")),
+        "ready_queue": str(os_cfg.get("ready_queue", "100")),
+    }
+    # SORT_ALGORITHM / SORT_OPTION piu' economici per la tabella dei task
+    sort_config = select_sort_config(project.get("tasks", []) or [],
+                                     bool(os_cfg.get("presort_tasks", False)))
+    os_config["sort_algorithm"] = sort_config["algorithm"]
+    os_config["sort_option"] = sort_config["option"]
+    hooks = os_cfg.get("hooks", {}) or {}
+
+    generate_os_cfg(
+        template_path=str(Path(tpl) / "os_cfg.h"),
+        output_path=str(Path(out) / "os_cfg.h"),
+        os_config=os_config,
+        hooks=hooks,
+        warnings=warnings,
+    )
+    return warnings
+
+
+def _generate_task_family(project: Dict, tpl: str, out: str) -> List[str]:
+    generate_os_task_cfg(
+        template_h=str(Path(tpl) / "os_task_cfg.h"),
+        template_c=str(Path(tpl) / "os_task_cfg.c"),
+        output_h=str(Path(out) / "os_task_cfg.h"),
+        output_c=str(Path(out) / "os_task_cfg.c"),
+        tasks=project.get("tasks", []) or [],
+        presort=bool((project.get("os", {}) or {}).get("presort_tasks", False)),
+    )
+    return []
+
+
+def _generate_sched_family(project: Dict, tpl: str, out: str) -> List[str]:
+    warnings = []
+    generate_os_sched_tbl_cfg(
+        template_h=str(Path(tpl) / "os_sched_tbl_cfg.h"),
+        template_c=str(Path(tpl) / "os_sched_tbl_cfg.c"),
+        output_h=str(Path(out) / "os_sched_tbl_cfg.h"),
+        output_c=str(Path(out) / "os_sched_tbl_cfg.c"),
+        schedule_entries=project.get("schedule", []) or [],
+        warnings=warnings,
+        tick_ms=project_tick_ms(project),
+    )
+    return warnings
+
+
+def _generate_alarms_family(project: Dict, tpl: str, out: str) -> List[str]:
+    warnings = []
+    generate_os_alarms_cfg(
+        template_h=str(Path(tpl) / "os_alarms_cfg.h"),
+        template_c=str(Path(tpl) / "os_alarms_cfg.c"),
+        output_h=str(Path(out) / "os_alarms_cfg.h"),
+        output_c=str(Path(out) / "os_alarms_cfg.c"),
+        alarms=project.get("alarms", []) or [],
+        warnings=warnings,
+        tick_ms=project_tick_ms(project),
+    )
+    return warnings
+
+
+GENERATOR_FAMILIES = [
+    ("os", _generate_os_family),
+    ("tasks", _generate_task_family),
+    ("schedule", _generate_sched_family),
+    ("alarms", _generate_alarms_family),
+]
+
+
+# ----------------------------------------------------------------------
+# Batch: molti progetti .chaos_cfg in parallelo (un progetto per worker)
+# ----------------------------------------------------------------------
+def find_project_files(inputs: List[str]) -> List[str]:
+    """
+    inputs: lista di file, cartelle (cerca *.chaos_cfg ricorsivamente)
+            o pattern glob (es. "boards/*/*.chaos_cfg")
+    Ritorna la lista ordinata e senza duplicati dei file progetto.
+    """
+    found = []
+    for item in inputs:
+        p = Path(item)
+        if p.is_dir():
+            found.extend(str(f) for f in p.rglob("*.chaos_cfg"))
+        elif p.is_file():
+            found.append(str(p))
+        else:
+            found.extend(glob.glob(item, recursive=True))
+
+    # rimuovi duplicati mantenendo un ordine stabile
+    seen = set()
+    files = []
+    for f in sorted(found):
+        key = os.path.normcase(os.path.abspath(f))
+        if key not in seen:
+            seen.add(key)
+            files.append(f)
+    return files
+
+
+def apply_project_options(project: Dict, options: Dict = None) -> Dict:
+    """
+    Opzioni della linea di comando che modificano il progetto prima della
+    generazione (usate anche dai worker del batch):
+        {"auto_tick": bool, "normalize": bool, "presort_tasks": bool}
+    Ritorna il progetto (eventualmente una copia riscalata).
+    """
+    options = options or {}
+    if options.get("auto_tick"):
+        from tick_advisor import advise_tick, rescale_project
+
+        advice = advise_tick(project)
+        if advice["tick_ms"] is not None:
+            project = rescale_project(project, advice["tick_ms"])
+    if options.get("normalize"):
+        project["normalize_schedule"] = True
+    if options.get("presort_tasks"):
+        project.setdefault("os", {})["presort_tasks"] = True
+    return project
+
+
+def generate_project_file(project_path: str, output_dir: str,
+                          templates_dir: str = None, options: Dict = None) -> Dict:
+    """
+    Carica e genera un singolo progetto. Non alza eccezioni: l'esito
+    e' riportato nel dict ritornato (usato come unita' di lavoro del batch).
+    options: vedi apply_project_options, piu' "parallel" e "versioned_output"
+             (vedi generate_project)
+    """
+    t0 = time.perf_counter()
+    result = {
+        "project": project_path,
+        "output_dir": output_dir,
+        "ok": False,
+        "error": None,
+        "changed": [],
+        "warnings": [],
+        "elapsed_ms": 0.0,
+    }
+    try:
+        project = apply_project_options(load_project_file(project_path), options)
+        result["changed"] = generate_project(
+            project, output_dir=output_dir, templates_dir=templates_dir,
+            warnings=result["warnings"], parallel=(options or {}).get("parallel"),
+            versioned_output=bool((options or {}).get("versioned_output")),
+        )
+        result["ok"] = True
+    except Exception as e:  # un progetto rotto non deve fermare il batch
+        result["error"] = f"{type(e).__name__}: {e}"
+    result["elapsed_ms"] = (time.perf_counter() - t0) * 1000.0
+    return result
+
+
+def batch_output_dirs(project_files: List[str], output_root: str) -> List[str]:
+    """
+    Cartella di output per ogni progetto: <output_root>/<nome progetto>.
+    In caso di nomi uguali (cartelle diverse) aggiunge il primo suffisso _N
+    che non e' il nome di un altro progetto ne' una cartella gia' assegnata
+    (a/foo, b/foo, c/foo_1 -> foo, foo_2, foo_1): due worker non scrivono
+    mai nella stessa cartella. Nomi confrontati come li confronta il
+    filesystem (os.path.normcase).
+    """
+    stems = {os.path.normcase(Path(f).stem) for f in project_files}
+    taken = set()
+    dirs = []
+    for f in project_files:
+        stem = Path(f).stem
+        name, n = stem, 0
+        while os.path.normcase(name) in taken or (n and os.path.normcase(name) in stems):
+            n += 1
+            name = f"{stem}_{n}"
+        taken.add(os.path.normcase(name))
+        dirs.append(str(Path(output_root) / name))
+    return dirs
+
+
+def generate_batch(project_files: List[str], output_root: str,
+                   templates_dir: str = None, jobs: int = None,
+                   options: Dict = None) -> List[Dict]:
+    """
+    Genera tutti i progetti distribuendoli su un pool di processi.
+    jobs: numero di worker (default: numero di CPU)
+    options: opzioni applicate a ogni progetto (vedi generate_project_file)
+    Ritorna i risultati di generate_project_file nell'ordine di project_files.
+    """
+    out_dirs = batch_output_dirs(project_files, output_root)
+    results = [None] * len(project_files)
+
+    if jobs == 1 or len(project_files) <= 1:
+        for i, (f, d) in enumerate(zip(project_files, out_dirs)):
+            results[i] = generate_project_file(f, d, templates_dir, options)
+        return results
+
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = {
+            pool.submit(generate_project_file, f, d, templates_dir, options): i
+            for i, (f, d) in enumerate(zip(project_files, out_dirs))
+        }
+        for fut in as_completed(futures):
+            results[futures[fut]] = fut.result()
+
+    return results
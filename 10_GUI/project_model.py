@@ -0,0 +1,71 @@
+# project_model.py
+#
+# Dati del progetto indipendenti dalle pagine del wizard, con il layout del
+# file .chaos_cfg. Le pagine vengono create solo alla prima visita (o quando
+# un progetto caricato le riempie): fino ad allora i loro dati stanno qui.
+# Il wizard riversa nel modello le pagine gia' create (collect_project) e
+# salvataggio / generazione leggono sempre il progetto dal modello.
+# Questo modulo NON deve importare PySide6.
+
+from typing import Dict
+
+
+# Valori iniziali, gli stessi dei widget di una pagina appena creata
+DEFAULT_OS = {
+    "scheduler_freq": "1000",
+    "tick_ms": "1",
+    "ready_queue": "100",
+    "presort_tasks": False,
+    "hooks": {
+        "startup": False,
+        "shutdown": False,
+        "pre_task": False,
+        "post_task": False,
+        "error": False,
+    },
+}
+
+# Sezioni del progetto con il loro valore iniziale
+SECTIONS = {
+    "os": DEFAULT_OS,
+    "tasks": [],
+    "schedule": [],
+    "alarms": [],
+    "normalize_schedule": False,
+}
+
+
+def _initial(key: str):
+    value = SECTIONS[key]
+    if key == "os":
+        return dict(value, hooks=dict(value["hooks"]))
+    return list(value) if isinstance(value, list) else value
+
+
+class ProjectModel:
+    def __init__(self):
+        self.sections = {key: _initial(key) for key in SECTIONS}
+
+    def load(self, project: Dict):
+        """
+        project: dict letto da un file .chaos_cfg. Le sezioni mancanti
+        tornano al valore iniziale (come set_tasks([]) su una pagina).
+        """
+        for key in SECTIONS:
+            value = project.get(key)
+            self.sections[key] = _initial(key) if value is None else value
+
+    def get(self, key: str):
+        return self.sections[key]
+
+    def set(self, key: str, value):
+        if key not in SECTIONS:
+            raise KeyError(f"unknown project section '{key}'")
+        self.sections[key] = value
+
+    def project(self) -> Dict:
+        """Progetto completo (layout di save_project_as); le liste sono copie."""
+        project = {"version": 1}
+        for key, value in self.sections.items():
+            project[key] = list(value) if isinstance(value, list) else value
+        return project
@@ -0,0 +1,475 @@
+# schedule_analysis.py
+#
+# Analisi temporale del progetto (layout di save_project_as):
+# - iperperiodo (mcm dei periodi di schedule table e allarmi ciclici)
+# - utilizzo CPU totale e per tick, a partire dal WCET dei task
+# - tick di picco (carico massimo e numero massimo di attivazioni)
+# I calcoli per tick sono vettoriali (NumPy): iperperiodi di milioni di
+# tick si analizzano in frazioni di secondo.
+# Questo modulo NON deve importare PySide6.
+
+import math
+from typing import Dict, List
+
+import numpy as np
+
+from generator_utils import as_int, ms_to_ticks, project_tick_ms
+
+
+# Oltre questo numero di tick non si costruisce il profilo per tick
+# (memoria: ~8 byte per tick); iperperiodo e utilizzo restano calcolati
+MAX_ANALYSIS_TICKS = 10_000_000
+# Limite delle analisi nel thread della GUI (ogni visita di Summary / OS):
+# al massimo qualche decina di MB e di ms
+GUI_MAX_ANALYSIS_TICKS = 500_000
+
+
+# ----------------------------------------------------------------------
+# Lettura del progetto
+# ----------------------------------------------------------------------
+def schedule_offset(entry: Dict, period: int) -> int:
+    """Offset del contatore di una entry della schedule table (0 <= offset < period)."""
+    offset = as_int(entry.get("offset", 0) or 0)
+    return offset % period if period > 0 else 0
+
+
+def analysis_key(project: Dict) -> tuple:
+    """
+    Campi del progetto letti dalle analisi (tick, WCET, schedule table,
+    allarmi): stessa chiave, stesso risultato. Usata dalla GUI per non
+    rifare le analisi a ogni visita di una pagina.
+    """
+    return (
+        (project.get("os", {}) or {}).get("tick_ms"),
+        tuple((t.get("id"), t.get("wcet_us")) for t in project.get("tasks", []) or []),
+        tuple((e.get("task_id"), e.get("period_ms"), e.get("offset"))
+              for e in project.get("schedule", []) or []),
+        tuple((a.get("alarm_type"), a.get("alarm_action"), a.get("period_ms"), a.get("task_id"))
+              for a in project.get("alarms", []) or []),
+    )
+
+
+def task_wcet_us(tasks: List[Dict]) -> Dict[int, float]:
+    """
+    {task id: WCET in us} per i task con colonna WCET valorizzata
+    (la colonna e' opzionale: i task senza WCET non compaiono).
+    """
+    wcet = {}
+    for t in tasks:
+        try:
+            tid = int(str(t.get("id", "")).strip())
+            value = float(str(t.get("wcet_us", "") or "").strip())
+        except ValueError:
+            continue
+        if value >= 0:
+            wcet[tid] = value
+    return wcet
+
+
+def collect_releases(project: Dict) -> Dict:
+    """
+    Attivazioni periodiche di task del progetto, come array paralleli:
+        period:  periodo in tick
+        offset:  fase: attivazioni ai tick t con t % period == offset
+        task_id: task attivato
+        source:  "schedule" / "alarm"
+    Per le entry della schedule table "offset" del progetto e' il valore
+    iniziale del contatore (COUNTER_INIT + offset): il contatore parte
+    avanti di offset tick, quindi la fase e' (-offset) % period.
+    Piu' le attivazioni singole (allarmi ONE_SHOT: "once_tick", "once_task_id")
+    e i periodi degli allarmi ciclici che non attivano task ("callback_periods"),
+    che contano solo per l'iperperiodo.
+    """
+    tick_ms = project_tick_ms(project)
+
+    period, offset, task_id, source = [], [], [], []
+    for e in project.get("schedule", []) or []:
+        p = ms_to_ticks(as_int(e.get("period_ms", 0)), tick_ms)
+        if p <= 0:
+            continue
+        tid = as_int(e.get("task_id", 0))
+        period.append(p)
+        offset.append(-schedule_offset(e, p) % p)
+        task_id.append(tid)
+        source.append("schedule")
+
+    once_tick, once_task_id, callback_periods = [], [], []
+    for a in project.get("alarms", []) or []:
+        p = ms_to_ticks(as_int(a.get("period_ms", 0)), tick_ms)
+        if p <= 0:
+            continue
+        cyclic = a.get("alarm_type") == "CYCLIC"
+        if a.get("alarm_action") != "ACTIVATE_TASK" or a.get("task_id") is None:
+            if cyclic:
+                callback_periods.append(p)
+            continue
+        tid = as_int(a.get("task_id"))
+        if cyclic:
+            # l'allarme scade la prima volta dopo un periodo: fase 0
+            period.append(p)
+            offset.append(0)
+            task_id.append(tid)
+            source.append("alarm")
+        else:
+            once_tick.append(p)
+            once_task_id.append(tid)
+
+    return {
+        "tick_ms": tick_ms,
+        "period": np.asarray(period, dtype=np.int64),
+        "offset": np.asarray(offset, dtype=np.int64),
+        "task_id": np.asarray(task_id, dtype=np.int64),
+        "source": source,
+        "once_tick": np.asarray(once_tick, dtype=np.int64),
+        "once_task_id": np.asarray(once_task_id, dtype=np.int64),
+        "callback_periods": np.asarray(callback_periods, dtype=np.int64),
+    }
+
+
+# ----------------------------------------------------------------------
+# Calcoli vettoriali
+# ----------------------------------------------------------------------
+def hyperperiod(periods) -> int:
+    """Minimo comune multiplo dei periodi (in tick); 0 se non ci sono periodi."""
+    periods = np.unique(np.asarray(periods, dtype=np.int64))
+    if periods.size == 0:
+        return 0
+    # mcm in interi Python: con molti periodi primi tra loro supera int64
+    return math.lcm(*periods.tolist())
+
+
+def tick_profile(period, offset, weight, length: int) -> np.ndarray:
+    """
+    Somma per tick (0..length-1) dei pesi delle attivazioni periodiche:
+    profile[t] = sum(weight[i] per ogni i con t % period[i] == offset[i]).
+    Le attivazioni con stesso (periodo, offset) vengono prima sommate,
+    poi ogni gruppo e' una sola somma a passo fisso su tutto l'array.
+    """
+    profile = np.zeros(length, dtype=np.float64)
+    if length == 0 or len(period) == 0:
+        return profile
+    keys = np.stack([np.asarray(period, dtype=np.int64), np.asarray(offset, dtype=np.int64)], axis=1)
+    groups, inverse = np.unique(keys, axis=0, return_inverse=True)
+    sums = np.bincount(inverse.ravel(), weights=np.asarray(weight, dtype=np.float64),
+                       minlength=len(groups))
+    for (p, off), w in zip(groups.tolist(), sums.tolist()):
+        if w:
+            profile[off::p] += w
+    return profile
+
+
+def release_profiles(rel: Dict, wcet: Dict[int, float], length: int):
+    """
+    Profili per tick (0..length-1) delle attivazioni di collect_releases:
+    ritorna (numero di attivazioni, WCET rilasciato in us) per tick,
+    comprese le attivazioni singole (ONE_SHOT) che cadono nell'intervallo.
+    """
+    weight = np.array([wcet.get(tid, 0.0) for tid in rel["task_id"].tolist()], dtype=np.float64)
+    releases = tick_profile(rel["period"], rel["offset"], np.ones(len(rel["period"])), length)
+    work = tick_profile(rel["period"], rel["offset"], weight, length)
+
+    once = rel["once_tick"] < length
+    once_tick = rel["once_tick"][once]
+    once_weight = np.array([wcet.get(tid, 0.0) for tid in rel["once_task_id"][once].tolist()],
+                           dtype=np.float64)
+    np.add.at(releases, once_tick, 1.0)
+    np.add.at(work, once_tick, once_weight)
+    return releases, work
+
+
+def analyze_project(project: Dict, max_ticks: int = MAX_ANALYSIS_TICKS) -> Dict:
+    """
+    Ritorna:
+        tick_ms, hyperperiod_ticks, hyperperiod_ms
+        utilization:      utilizzo CPU totale (1.0 = 100%), None se nessun WCET
+        mean_tick_load:   carico medio per tick (= utilization)
+        peak_tick_load:   carico massimo in un tick (WCET rilasciato / durata tick)
+        peak_load_tick:   tick (nell'iperperiodo) del carico massimo
+        peak_releases:    numero massimo di attivazioni nello stesso tick
+        peak_releases_tick
+        releases_per_hyperperiod
+        missing_wcet:     id dei task attivati senza WCET (contati come 0)
+        profiled:         False se l'iperperiodo supera max_ticks (niente
+                          profilo per tick: i campi peak_* sono None)
+    """
+    rel = collect_releases(project)
+    tick_ms = rel["tick_ms"]
+    tick_us = tick_ms * 1000.0
+    wcet = task_wcet_us(project.get("tasks", []) or [])
+
+    period, task_id = rel["period"], rel["task_id"]
+    h = hyperperiod(np.concatenate([period, rel["callback_periods"]]))
+
+    activated = set(task_id.tolist()) | set(rel["once_task_id"].tolist())
+    missing = sorted(tid for tid in activated if tid not in wcet)
+    has_wcet = bool(activated) and len(missing) < len(activated)
+
+    weight = np.array([wcet.get(tid, 0.0) for tid in task_id.tolist()], dtype=np.float64)
+    utilization = float(np.sum(weight / (period * tick_us))) if has_wcet else None
+
+    result = {
+        "tick_ms": tick_ms,
+        "hyperperiod_ticks": h,
+        "hyperperiod_ms": h * tick_ms,
+        "utilization": utilization,
+        "mean_tick_load": utilization,
+        "peak_tick_load": None,
+        "peak_load_tick": None,
+        "peak_releases": None,
+        "peak_releases_tick": None,
+        "releases_per_hyperperiod": int(np.sum(h // period)) if h else 0,
+        "missing_wcet": missing,
+        "profiled": False,
+    }
+    if h == 0 or h > max_ticks:
+        return result
+
+    releases, work = release_profiles(rel, wcet, h)
+    peak_rel_tick = int(np.argmax(releases))
+    result.update({
+        "peak_releases": int(releases[peak_rel_tick]),
+        "peak_releases_tick": peak_rel_tick,
+        "releases_per_hyperperiod": int(releases.sum()),
+        "profiled": True,
+    })
+
+    if has_wcet:
+        load = work / tick_us
+        peak_tick = int(np.argmax(load))
+        result.update({
+            "peak_tick_load": float(load[peak_tick]),
+            "peak_load_tick": peak_tick,
+        })
+
+    return result
+
+
+# ----------------------------------------------------------------------
+# Ottimizzazione degli offset della schedule table
+# ----------------------------------------------------------------------
+def optimize_offsets(project: Dict, max_ticks: int = MAX_ANALYSIS_TICKS) -> Dict:
+    """
+    Sceglie per ogni entry della schedule table l'offset iniziale del
+    contatore (0..periodo-1) che minimizza il carico massimo per tick
+    nell'iperperiodo: somma dei WCET se almeno un task ha il WCET,
+    altrimenti numero di attivazioni. Gli allarmi restano fissi.
+
+    Euristica greedy: entry in ordine di periodo crescente (le piu'
+    vincolate) e peso decrescente; per ciascuna si prova ogni fase in
+    un colpo solo (profilo riorganizzato come matrice [H/p, p]: il
+    massimo per colonna e' il picco di ogni fase) e si sceglie quella col
+    picco minore, a parita' quella col carico totale minore.
+
+    Ritorna:
+        offsets:    offset per entry (stesso ordine di project["schedule"];
+                    None per le entry senza periodo valido)
+        objective:  "wcet" o "releases"
+        before / after: picco prima / dopo (us di WCET o attivazioni)
+        before_tick / after_tick: tick del picco
+        optimized:  False se l'iperperiodo supera max_ticks o se non si
+                    migliora il picco (offsets = quelli attuali)
+    """
+    tick_ms = project_tick_ms(project)
+    entries = project.get("schedule", []) or []
+    wcet = task_wcet_us(project.get("tasks", []) or [])
+
+    rel = collect_releases(project)
+    h = hyperperiod(np.concatenate([rel["period"], rel["callback_periods"]]))
+
+    # entry valide: indice nel progetto, periodo, offset attuale, task
+    items = []
+    for i, e in enumerate(entries):
+        p = ms_to_ticks(as_int(e.get("period_ms", 0)), tick_ms)
+        if p <= 0:
+            continue
+        tid = as_int(e.get("task_id", 0))
+        items.append((i, p, schedule_offset(e, p), tid))
+
+    current = [None] * len(entries)
+    for i, p, off, _ in items:
+        current[i] = off
+
+    activated = set(rel["task_id"].tolist()) | set(rel["once_task_id"].tolist())
+    objective = "wcet" if any(tid in wcet for tid in activated) else "releases"
+
+    def _weight(tid):
+        return wcet.get(tid, 0.0) if objective == "wcet" else 1.0
+
+    result = {
+        "offsets": current,
+        "objective": objective,
+        "before": None,
+        "after": None,
+        "before_tick": None,
+        "after_tick": None,
+        "optimized": False,
+    }
+    if not items or h == 0 or h > max_ticks:
+        return result
+
+    # Profilo fisso: allarmi ciclici e ONE_SHOT (non spostabili)
+    is_alarm = np.array([src == "alarm" for src in rel["source"]], dtype=bool)
+    alarm_weight = np.array([_weight(tid) for tid in rel["task_id"][is_alarm].tolist()])
+    base = tick_profile(rel["period"][is_alarm], rel["offset"][is_alarm], alarm_weight, h)
+    once = rel["once_tick"] < h
+    np.add.at(base, rel["once_tick"][once],
+              np.array([_weight(tid) for tid in rel["once_task_id"][once].tolist()]))
+
+    # Picco con gli offset attuali
+    weights = np.array([_weight(tid) for _, _, _, tid in items])
+    periods = np.array([p for _, p, _, _ in items], dtype=np.int64)
+    phases = np.array([-off % p for _, p, off, _ in items], dtype=np.int64)
+    before = base + tick_profile(periods, phases, weights, h)
+    result["before_tick"] = int(np.argmax(before))
+    result["before"] = float(before[result["before_tick"]])
+
+    # Greedy
+    profile = base.copy()
+    chosen = list(current)
+    order = sorted(range(len(items)), key=lambda k: (items[k][1], -weights[k]))
+    for k in order:
+        i, p, _, _ = items[k]
+        w = weights[k]
+        cols = profile.reshape(-1, p)
+        peak = cols.max(axis=0) + w
+        total = cols.sum(axis=0)
+        # fase col picco minore, a parita' col carico totale minore e
+        # poi con l'offset del contatore piu' piccolo
+        offsets = -np.arange(p) % p
+        phase = int(np.lexsort((offsets, total, peak))[0])
+        if w:
+            profile[phase::p] += w
+        chosen[i] = -phase % p
+
+    after_tick = int(np.argmax(profile))
+    after = float(profile[after_tick])
+    if after < result["before"]:
+        result.update({
+            "offsets": chosen,
+            "after": after,
+            "after_tick": after_tick,
+            "optimized": True,
+        })
+    else:
+        result.update({"after": result["before"], "after_tick": result["before_tick"]})
+    return result
+
+
+def format_offset_report(result: Dict) -> str:
+    """Report prima/dopo di optimize_offsets (testo per GUI e linea di comando)."""
+    if result["before"] is None:
+        return "Phase offsets not optimized: no schedule entries or hyperperiod too long."
+    if result["objective"] == "wcet":
+        unit = "us of WCET"
+    else:
+        unit = "task releases"
+    lines = [
+        f"Peak load per tick before: {result['before']:g} {unit} (tick {result['before_tick']})",
+        f"Peak load per tick after:  {result['after']:g} {unit} (tick {result['after_tick']})",
+    ]
+    if not result["optimized"]:
+        lines.append("The current offsets are already optimal for this heuristic: unchanged.")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Occupazione massima della ready queue (MAX_READY_TASKS)
+# ----------------------------------------------------------------------
+def ready_queue_depth(project: Dict, max_ticks: int = MAX_ANALYSIS_TICKS) -> Dict:
+    """
+    Stima per eccesso del numero massimo di task contemporaneamente nella
+    ready queue (ogni attivazione di schedule table / allarme ciclico o
+    ONE_SHOT occupa un posto finche' il task non termina).
+
+    Con i WCET: backlog di lavoro per tick con la ricorsione di Lindley
+        W[t] = max(0, W[t-1] + lavoro[t] - durata tick)
+    calcolata in forma vettoriale (somme cumulative e minimo progressivo).
+    Al tick t i task in coda sono al piu' quelli attivati dall'inizio del
+    periodo di attivita' (busy period) corrente, meno quelli sicuramente
+    terminati: il lavoro gia' svolto diviso il WCET massimo, meno uno
+    (il task in esecuzione). L'ordine di esecuzione (priorita') non
+    cambia questo limite: vale per qualsiasi scheduler che non lascia la
+    CPU inattiva con task pronti.
+    Senza WCET: ogni task termina entro il tick di attivazione, quindi la
+    profondita' e' il numero massimo di attivazioni nello stesso tick.
+
+    Ritorna:
+        depth:     profondita' massima (None se non calcolabile)
+        tick:      tick (nell'iperperiodo) in cui si raggiunge
+        method:    "wcet" o "releases"
+        overload:  True se l'utilizzo >= 100% (coda illimitata: depth None)
+        profiled:  False se l'iperperiodo supera max_ticks (depth None)
+    """
+    rel = collect_releases(project)
+    tick_us = rel["tick_ms"] * 1000.0
+    wcet = task_wcet_us(project.get("tasks", []) or [])
+    h = hyperperiod(np.concatenate([rel["period"], rel["callback_periods"]]))
+
+    activated = set(rel["task_id"].tolist()) | set(rel["once_task_id"].tolist())
+    method = "wcet" if any(tid in wcet for tid in activated) else "releases"
+    result = {"depth": None, "tick": None, "method": method,
+              "overload": False, "profiled": False}
+
+    if not activated:
+        result.update({"depth": 0, "tick": 0, "profiled": True})
+        return result
+    if h == 0 or 2 * h > max_ticks:
+        return result
+
+    if method == "releases":
+        # attivazioni periodiche nell'iperperiodo, piu' quelle ONE_SHOT
+        # (anche oltre l'iperperiodo) sommate al tick in cui cadono
+        releases = tick_profile(rel["period"], rel["offset"], np.ones(len(rel["period"])), h)
+        tick = int(np.argmax(releases))
+        depth = int(releases[tick])
+        once_tick, once_count = np.unique(rel["once_tick"], return_counts=True)
+        if once_tick.size:
+            once_depth = releases[once_tick % h] + once_count
+            k = int(np.argmax(once_depth))
+            if once_depth[k] > depth:
+                depth, tick = int(once_depth[k]), int(once_tick[k] % h)
+        result.update({"depth": depth, "tick": tick, "profiled": True})
+        return result
+
+    weight = np.array([wcet.get(tid, 0.0) for tid in rel["task_id"].tolist()])
+    if float(np.sum(weight / (rel["period"] * tick_us))) >= 1.0:
+        result["overload"] = True
+        return result
+
+    # Fino all'iperperiodo dell'ultima attivazione ONE_SHOT (almeno il
+    # primo) piu' uno: il backlog a fine di quello (regime) si propaga
+    # nell'ultimo
+    last_once = int(rel["once_tick"].max()) if rel["once_tick"].size else 0
+    length = (last_once // h + 2) * h
+    if length > max_ticks:
+        return result
+    releases, work = release_profiles(rel, wcet, length)
+
+    # Lindley vettoriale: W[t] = S[t] - min(0, min_{s<=t} S[s]),
+    # con S = somma cumulativa di (lavoro - durata tick)
+    s = np.cumsum(work - tick_us)
+    backlog = s - np.minimum(np.minimum.accumulate(s), 0.0)
+
+    # Inizio del busy period di ogni tick: nessun backlog dal tick prima
+    idx = np.arange(length)
+    carried = np.concatenate([[0.0], backlog[:-1]]) > 1e-9
+    start = np.maximum.accumulate(np.where(carried, 0, idx))
+
+    # Attivazioni nel busy period fino a t (incluso)
+    cum = np.cumsum(releases)
+    before_start = np.where(start > 0, cum[start - 1], 0.0)
+    pending = cum - before_start
+
+    # Task sicuramente terminati: lavoro svolto / WCET massimo - 1
+    w_max = max(wcet.get(tid, 0.0) for tid in activated)
+    if w_max > 0:
+        done = np.floor((idx - start) * tick_us / w_max) - 1.0
+        pending = pending - np.maximum(done, 0.0)
+
+    tick = int(np.argmax(pending))
+    result.update({
+        "depth": int(pending[tick]),
+        "tick": tick % h,
+        "profiled": True,
+    })
+    return result
@@ -0,0 +1,123 @@
+# schedule_normalizer.py
+#
+# Normalizzazione della schedule table prima della generazione: elimina
+# le entry che attivano un task su tick in cui lo stesso task e' gia'
+# attivato da un'altra entry.
+# - duplicato: stesso task, stesso periodo, stesso offset
+# - armonica:  stesso task, periodo multiplo di quello di un'altra entry e
+#              fase compatibile, quindi ogni sua attivazione coincide con
+#              una dell'altra (es. 10 ms e 20 ms con offset 0)
+# Ogni entry tolta costa un contatore decrementato ad ogni tick e
+# un'attivazione doppia del task: SchedTable[] resta minima.
+# Questo modulo NON deve importare PySide6.
+
+from typing import Dict, List, Tuple
+
+from generator_utils import as_int, ms_to_ticks, project_tick_ms
+
+
+def _release(entry: Dict, tick_ms: float = 1.0) -> Tuple[int, int, int]:
+    """
+    (task, periodo, fase) di una entry, in tick (le unita' del Timeout generato).
+    Il contatore parte da COUNTER_INIT + offset: la prima attivazione
+    arriva dopo periodo - offset tick, quindi fase = -offset mod periodo.
+    """
+    period = ms_to_ticks(as_int(entry.get("period_ms", 0)), tick_ms)
+    offset = as_int(entry.get("offset", 0) or 0)
+    phase = (-offset) % period if period > 0 else 0
+    return as_int(entry.get("task_id", 0)), period, phase
+
+
+def normalize_schedule(entries: List[Dict], tick_ms: float = 1.0) -> Tuple[List[Dict], List[Dict]]:
+    """
+    entries: entry della schedule table (layout di get_schedule_entries)
+    tick_ms: tick OS in ms (i periodi sono confrontati in tick)
+
+    Ritorna (entry mantenute nell'ordine originale, unioni), con una
+    unione per ogni entry tolta (entries stessa se non ne viene tolta nessuna):
+        {"removed": indice, "kept": indice dell'entry che la copre,
+         "reason": "duplicate" | "harmonic", "message": str}
+    Le entry con periodo non valido (<= 0) non vengono toccate.
+    """
+    # solo i task con piu' di una entry possono avere entry ridondanti: nel
+    # caso comune (una entry per task) nessuna struttura per entry
+    repeated = _repeated_tasks(entries)
+    if not repeated:
+        return entries, []
+    candidates = [i for i, e in enumerate(entries) if as_int(e.get("task_id", 0)) in repeated]
+
+    # per task: entry mantenute (indice, periodo, fase), periodi crescenti
+    # in modo che un'entry venga confrontata solo con periodi piu' corti
+    order = sorted(candidates, key=lambda i: _release(entries[i], tick_ms)[1])
+    kept_by_task: Dict[int, List[Tuple[int, int, int]]] = {}
+    removed = {}
+
+    for i in order:
+        task_id, period, phase = _release(entries[i], tick_ms)
+        if period <= 0:
+            continue
+        kept = kept_by_task.setdefault(task_id, [])
+        for k, k_period, k_phase in kept:
+            if period % k_period == 0 and phase % k_period == k_phase:
+                removed[i] = (k, "duplicate" if period == k_period else "harmonic")
+                break
+        else:
+            kept.append((i, period, phase))
+
+    merges = []
+    for i in sorted(removed):
+        k, reason = removed[i]
+        merges.append({
+            "removed": i,
+            "kept": k,
+            "reason": reason,
+            "message": _merge_message(entries, i, k, reason),
+        })
+    if not removed:
+        return entries, []
+    return [e for i, e in enumerate(entries) if i not in removed], merges
+
+
+def _repeated_tasks(entries: List[Dict]) -> set:
+    """ID dei task con piu' di una entry."""
+    seen = set()
+    repeated = set()
+    for e in entries:
+        task_id = as_int(e.get("task_id", 0))
+        if task_id in seen:
+            repeated.add(task_id)
+        else:
+            seen.add(task_id)
+    return repeated
+
+
+def _describe(entries: List[Dict], i: int) -> str:
+    e = entries[i]
+    name = e.get("task_name") or f"task {e.get('task_id', 0)}"
+    offset = as_int(e.get("offset", 0) or 0)
+    text = f"row {i + 1} ({name}, {e.get('period_ms', 0)} ms"
+    return text + (f", offset {offset})" if offset else ")")
+
+
+def _merge_message(entries: List[Dict], i: int, k: int, reason: str) -> str:
+    if reason == "duplicate":
+        why = "same task, period and offset"
+    else:
+        why = "every release coincides with one of the shorter period"
+    return f"{_describe(entries, i)} merged into {_describe(entries, k)}: {why}"
+
+
+def normalized_project(project: Dict) -> Tuple[Dict, List[Dict]]:
+    """
+    Copia di project con la schedule table normalizzata (solo se
+    project["normalize_schedule"], default False) e la lista delle unioni.
+    Il dict originale non viene modificato.
+    """
+    schedule = project.get("schedule", []) or []
+    if not project.get("normalize_schedule", False) or not schedule:
+        return project, []
+    tick_ms = project_tick_ms(project)
+    entries, merges = normalize_schedule(schedule, tick_ms)
+    if not merges:
+        return project, []
+    return dict(project, schedule=entries), merges
@@ -0,0 +1,423 @@
+# scheduler_simulator.py
+#
+# Simulatore a tick dello scheduler CHAOS, per prevedere il comportamento
+# a runtime prima di andare su hardware. Uso:
+#   python scheduler_simulator.py progetto.chaos_cfg
+#   python scheduler_simulator.py progetto.chaos_cfg --ticks 10000000 --json sim.json
+#
+# Modello (stesso progetto di save_project_as):
+# - ad ogni tick le entry della schedule table e gli allarmi ACTIVATE_TASK
+#   (CYCLIC / ONE_SHOT) che scadono mettono un'attivazione nella ready queue
+# - la ready queue e' ordinata per priorita' (valore piu' alto prima),
+#   a parita' di priorita' in ordine di attivazione
+# - i task girano fino al termine (nessuna preemption) per il loro WCET;
+#   appena la CPU e' libera parte il primo task pronto
+# - gli allarmi TRIGGER_CALLBACK non attivano task: non sono simulati
+#
+# Le attivazioni sono calcolate a blocchi di tick con NumPy; i blocchi in
+# cui la CPU si libera prima delle attivazioni successive (il caso comune)
+# sono risolti in forma vettoriale, solo i periodi di attivita' che
+# accavallano piu' tick passano per una simulazione esatta con heap.
+# Questo modulo NON deve importare PySide6.
+
+import argparse
+import heapq
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+from generator_utils import as_int
+from schedule_analysis import collect_releases, hyperperiod, task_wcet_us, MAX_ANALYSIS_TICKS
+
+
+# Tick per blocco: limita la memoria delle attivazioni generate
+CHUNK_TICKS = 1 << 20
+# Tick per blocco quando l'iperperiodo ci sta (ricerca del regime periodico)
+STEADY_CHUNK_TICKS = 1 << 16
+
+
+def _task_table(tasks: List[Dict]):
+    """id -> (indice, nome, priorita') per i task del progetto."""
+    table = {}
+    for t in tasks:
+        tid = as_int(t.get("id"), None)
+        if tid is None:
+            continue
+        prio = as_int(t.get("priority", "1"), 1)
+        if tid not in table:
+            table[tid] = (len(table), str(t.get("name", f"Task_{tid}")), prio)
+    return table
+
+
+def _chunk_releases(sources: Dict, t0: int, t1: int):
+    """
+    Attivazioni nei tick [t0, t1) come array (tick, sorgente), ordinate per
+    tick, priorita' decrescente e ordine della sorgente.
+    """
+    ticks = []
+    src = []
+    for k, (p, phase) in enumerate(zip(sources["period"], sources["phase"])):
+        first = phase + max(0, -(-(t0 - phase) // p)) * p
+        if first < t1:
+            r = np.arange(first, t1, p, dtype=np.int64)
+            ticks.append(r)
+            src.append(np.full(r.size, k, dtype=np.int32))
+    once = (sources["once_tick"] >= t0) & (sources["once_tick"] < t1)
+    if once.any():
+        ticks.append(sources["once_tick"][once])
+        src.append(sources["once_src"][once])
+    if not ticks:
+        return np.empty(0, dtype=np.int64), np.empty(0, dtype=np.int32)
+
+    ticks = np.concatenate(ticks)
+    src = np.concatenate(src)
+    order = np.lexsort((src, -sources["prio"][src], ticks))
+    return ticks[order], src[order]
+
+
+def _simulate_cluster(tick: List[int], src: List[int], prio: List[int],
+                      wcet: List[float], tick_us: float, cpu_free: float):
+    """
+    Simulazione esatta (heap) di un periodo di attivita' in cui le
+    attivazioni di piu' tick si sovrappongono. Ritorna (start, finish) in us.
+    """
+    n = len(tick)
+    start = [0.0] * n
+    finish = [0.0] * n
+    ready = []
+    t = max(cpu_free, tick[0] * tick_us)
+    i = 0
+    for _ in range(n):
+        if not ready and tick[i] * tick_us > t:
+            t = tick[i] * tick_us
+        while i < n and tick[i] * tick_us <= t:
+            # priorita' piu' alta prima, poi in ordine di attivazione
+            heapq.heappush(ready, (-prio[src[i]], i))
+            i += 1
+        _, j = heapq.heappop(ready)
+        start[j] = t
+        t += wcet[src[j]]
+        finish[j] = t
+    return start, finish
+
+
+def _boundary_state(carry_tick, carry_src, cpu_free: float, t: int, tick_us: float):
+    """Stato dello scheduler al tick t: attivazioni rimandate e CPU occupata, relativi a t."""
+    return carry_tick - t, carry_src, max(0.0, cpu_free - t * tick_us)
+
+
+def _same_state(a, b) -> bool:
+    return (
+        np.array_equal(a[0], b[0]) and np.array_equal(a[1], b[1])
+        and abs(a[2] - b[2]) < 1e-6
+    )
+
+
+def simulate_project(project: Dict, ticks: int = None, chunk_ticks: int = CHUNK_TICKS) -> Dict:
+    """
+    Simula ticks tick (default: un iperperiodo, al massimo MAX_ANALYSIS_TICKS).
+    Ritorna:
+        ticks, tick_ms, jobs, utilization (CPU occupata / tempo simulato)
+        clustered_jobs: attivazioni risolte con la simulazione esatta
+        repeated_ticks: tick ottenuti ripetendo un blocco a regime (vedi sotto)
+        overload: True se la CPU non smaltisce le attivazioni (la simulazione
+                  si ferma e ticks e' il numero di tick effettivamente simulati)
+        tasks: per task attivato {"id", "name", "priority", "activations",
+               "min/mean/max_response_ms", "jitter_ms" (max - min risposta),
+               "max_start_delay_ms"}
+        missing_wcet: id dei task attivati senza WCET (durata 0)
+    """
+    rel = collect_releases(project)
+    tick_ms = rel["tick_ms"]
+    tick_us = tick_ms * 1000.0
+    wcet_map = task_wcet_us(project.get("tasks", []) or [])
+    tasks = _task_table(project.get("tasks", []) or [])
+
+    if ticks is None:
+        h = hyperperiod(np.concatenate([rel["period"], rel["callback_periods"]]))
+        ticks = min(h, MAX_ANALYSIS_TICKS) if h else 0
+
+    # Sorgenti di attivazione: periodiche, poi ONE_SHOT; per ognuna
+    # task, priorita' e WCET (task sconosciuti: priorita' 1)
+    task_ids = rel["task_id"].tolist() + rel["once_task_id"].tolist()
+    n_periodic = rel["period"].size
+    sources = {
+        "period": rel["period"].tolist(),
+        "phase": rel["offset"].tolist(),
+        "once_tick": rel["once_tick"],
+        "once_src": np.arange(n_periodic, len(task_ids), dtype=np.int32),
+        "prio": np.array([tasks.get(tid, (0, "", 1))[2] for tid in task_ids], dtype=np.int64),
+    }
+    wcet = np.array([wcet_map.get(tid, 0.0) for tid in task_ids], dtype=np.float64)
+    # copie come liste Python per il ciclo della simulazione esatta
+    prio_list = sources["prio"].tolist()
+    wcet_list = wcet.tolist()
+
+    # Statistiche per task (indice compatto dei task attivati)
+    activated = sorted(set(task_ids))
+    slot_of = {tid: k for k, tid in enumerate(activated)}
+    src_slot = np.array([slot_of[tid] for tid in task_ids], dtype=np.int64)
+    n_slots = len(activated)
+    count = np.zeros(n_slots, dtype=np.int64)
+    resp_sum = np.zeros(n_slots)
+    resp_min = np.full(n_slots, np.inf)
+    resp_max = np.zeros(n_slots)
+    delay_max = np.zeros(n_slots)
+    busy_us = 0.0
+    clustered = 0
+
+    def _account(tick, src, start, finish):
+        nonlocal busy_us
+        release = tick * tick_us
+        resp = finish - release
+        slot = src_slot[src]
+        count[:] += np.bincount(slot, minlength=n_slots)
+        resp_sum[:] += np.bincount(slot, weights=resp, minlength=n_slots)
+        np.minimum.at(resp_min, slot, resp)
+        np.maximum.at(resp_max, slot, resp)
+        np.maximum.at(delay_max, slot, start - release)
+        busy_us += float(np.sum(finish - start))
+
+    cpu_free = 0.0
+    carry_tick = np.empty(0, dtype=np.int64)
+    carry_src = np.empty(0, dtype=np.int32)
+
+    # Regime periodico: le attivazioni periodiche si ripetono identiche ogni
+    # iperperiodo H. Con blocchi lunghi un multiplo di H, un blocco (dopo gli
+    # ONE_SHOT) che finisce nello stesso stato in cui e' partito (attivazioni
+    # rimandate e CPU occupata) si ripete uguale fino alla fine: le sue
+    # statistiche vengono moltiplicate invece di simularlo di nuovo.
+    h = hyperperiod(rel["period"])
+    if 0 < h <= chunk_ticks:
+        # blocchi piu' corti: il regime viene riconosciuto prima
+        chunk_ticks = h * max(1, min(chunk_ticks, STEADY_CHUNK_TICKS) // h)
+    periodic_from = int(rel["once_tick"].max()) + 1 if rel["once_tick"].size else 0
+    repeated_ticks = 0
+    overload = False
+
+    t0 = 0
+    while t0 < ticks:
+        t1 = min(ticks, t0 + chunk_ticks)
+        steady = h > 0 and chunk_ticks % h == 0 and t0 >= periodic_from
+        if steady:
+            before = (count.copy(), resp_sum.copy(), busy_us, clustered)
+            state_in = _boundary_state(carry_tick, carry_src, cpu_free, t0, tick_us)
+        tick, src = _chunk_releases(sources, t0, t1)
+        # attivazioni del periodo di attivita' rimasto aperto nel blocco prima
+        tick = np.concatenate([carry_tick, tick])
+        src = np.concatenate([carry_src, src])
+        last_chunk = t1 == ticks
+        if tick.size == 0:
+            t0 = t1
+            continue
+
+        # Gruppi = attivazioni dello stesso tick
+        new_group = np.empty(tick.size, dtype=bool)
+        new_group[0] = True
+        new_group[1:] = tick[1:] != tick[:-1]
+        g_first = np.flatnonzero(new_group)
+        g_tick = tick[g_first]
+        cum = np.concatenate([[0.0], np.cumsum(wcet[src])])
+        g_work = np.diff(np.append(cum[g_first], cum[-1]))
+
+        # Fine del lavoro (ricorsione di Lindley, indipendente dall'ordine):
+        # end[g] = max(release[g], end[g-1]) + work[g]
+        g_rel = g_tick * tick_us
+        g_cum = np.cumsum(g_work)
+        base = np.maximum.accumulate(np.maximum(g_rel - (g_cum - g_work), cpu_free))
+        g_end = base + g_cum
+        prev_end = np.concatenate([[cpu_free], g_end[:-1]])
+        # gruppo sovrapposto: la CPU e' ancora occupata quando arriva, o si
+        # libera proprio al suo tick (come in _simulate_cluster, le sue
+        # attivazioni entrano in coda prima di scegliere il task successivo)
+        overlap = prev_end >= g_rel
+        # il primo gruppo apre sempre un cluster (anche se rimandato)
+        overlap[0] = False
+        cluster = np.cumsum(~overlap) - 1
+        n_clusters = int(cluster[-1]) + 1
+        c_size = np.bincount(cluster, minlength=n_clusters)
+        c_end = np.zeros(n_clusters)
+        np.maximum.at(c_end, cluster, g_end)
+
+        # L'ultimo periodo di attivita' puo' continuare nel blocco dopo:
+        # si simulano le sue attivazioni, quelle non ancora partite a fine
+        # blocco passano al blocco successivo (con sovraccarico il periodo
+        # non finisce mai, ma la coda rimandata resta limitata al backlog).
+        # Anche se finisce proprio a fine blocco: chi partirebbe in quel
+        # momento deve prima vedere le attivazioni del tick t1
+        split = not last_chunk and c_end[-1] >= t1 * tick_us
+        keep = n_clusters - 1 if split else n_clusters
+
+        # Gruppi isolati (cluster di un solo tick): ordine = priorita',
+        # partenza = rilascio (o fine del lavoro precedente) + somma dei WCET prima
+        job_group = np.cumsum(new_group) - 1
+        g_start = np.maximum(g_rel, prev_end)
+        start = g_start[job_group] + (cum[:-1] - cum[g_first][job_group])
+        finish = start + wcet[src]
+
+        # Cluster con piu' tick: simulazione esatta (sovrascrive start/finish)
+        c_first = g_first[np.flatnonzero(~overlap)]
+        c_last = np.append(c_first[1:], tick.size)
+        multi = np.flatnonzero(c_size > 1).tolist()
+        if split and (not multi or multi[-1] != n_clusters - 1):
+            multi.append(n_clusters - 1)
+        for c in multi:
+            a, b = int(c_first[c]), int(c_last[c])
+            start[a:b], finish[a:b] = _simulate_cluster(
+                tick[a:b].tolist(), src[a:b].tolist(), prio_list, wcet_list, tick_us,
+                float(prev_end[job_group[a]]),
+            )
+            if c < keep:
+                clustered += b - a
+
+        if split:
+            a = int(c_first[keep])
+            # partite entro la fine del blocco: decise solo da attivazioni gia' note
+            done = np.flatnonzero(start[a:] < t1 * tick_us) + a
+            pending = np.ones(tick.size - a, dtype=bool)
+            pending[done - a] = False
+            carry_tick = tick[a:][pending]
+            carry_src = src[a:][pending]
+            clustered += done.size
+            keep_idx = np.concatenate([np.arange(a), done])
+            _account(tick[keep_idx], src[keep_idx], start[keep_idx], finish[keep_idx])
+            if done.size:
+                cpu_free = float(finish[done].max())
+            elif keep:
+                cpu_free = float(c_end[keep - 1])
+            # lavoro arretrato piu' lungo di un intero blocco: la CPU non
+            # riesce a smaltire le attivazioni, i tempi di risposta crescono
+            # senza limite e continuare non ha senso
+            if float(wcet[carry_src].sum()) > (t1 - t0) * tick_us:
+                overload = True
+                ticks = t1
+                break
+        else:
+            carry_tick = np.empty(0, dtype=np.int64)
+            carry_src = np.empty(0, dtype=np.int32)
+            _account(tick, src, start, finish)
+            cpu_free = float(c_end[-1])
+
+        repeats = (ticks - t1) // (t1 - t0) if steady else 0
+        if repeats:
+            state_out = _boundary_state(carry_tick, carry_src, cpu_free, t1, tick_us)
+            if _same_state(state_in, state_out):
+                count[:] += (count - before[0]) * repeats
+                resp_sum[:] += (resp_sum - before[1]) * repeats
+                busy_us += (busy_us - before[2]) * repeats
+                clustered += (clustered - before[3]) * repeats
+                shift = repeats * (t1 - t0)
+                repeated_ticks += shift
+                cpu_free += shift * tick_us
+                carry_tick = carry_tick + shift
+                t1 += shift
+        t0 = t1
+
+    # Blocchi ripetuti fino alla fine: le attivazioni rimandate dall'ultimo
+    # partono senza altre attivazioni dopo (come nell'ultimo blocco simulato)
+    if carry_tick.size and not overload:
+        start, finish = _simulate_cluster(
+            carry_tick.tolist(), carry_src.tolist(), prio_list, wcet_list, tick_us, cpu_free,
+        )
+        _account(carry_tick, carry_src, np.array(start), np.array(finish))
+        clustered += carry_tick.size
+
+    to_ms = 1.0 / 1000.0
+    task_stats = []
+    for k, tid in enumerate(activated):
+        _, name, prio = tasks.get(tid, (0, f"Task_{tid}", 1))
+        n = int(count[k])
+        task_stats.append({
+            "id": tid,
+            "name": name,
+            "priority": prio,
+            "activations": n,
+            "min_response_ms": float(resp_min[k]) * to_ms if n else None,
+            "mean_response_ms": float(resp_sum[k] / n) * to_ms if n else None,
+            "max_response_ms": float(resp_max[k]) * to_ms if n else None,
+            "jitter_ms": float(resp_max[k] - resp_min[k]) * to_ms if n else None,
+            "max_start_delay_ms": float(delay_max[k]) * to_ms if n else None,
+        })
+
+    return {
+        "ticks": ticks,
+        "overload": overload,
+        "tick_ms": tick_ms,
+        "jobs": int(count.sum()),
+        "utilization": busy_us / (ticks * tick_us) if ticks else 0.0,
+        "clustered_jobs": clustered,
+        "repeated_ticks": repeated_ticks,
+        "tasks": task_stats,
+        "missing_wcet": [tid for tid in activated if tid not in wcet_map],
+    }
+
+
+# ----------------------------------------------------------------------
+# Linea di comando
+# ----------------------------------------------------------------------
+def format_task_table(result: Dict) -> str:
+    lines = [
+        f"{'task':<20} {'prio':>4} {'activations':>11} {'min ms':>9} {'mean ms':>9} "
+        f"{'max ms':>9} {'jitter ms':>9} {'max delay':>9}"
+    ]
+    for t in result["tasks"]:
+        if not t["activations"]:
+            lines.append(f"{t['name']:<20} {t['priority']:>4} {0:>11}")
+            continue
+        lines.append(
+            f"{t['name']:<20} {t['priority']:>4} {t['activations']:>11} "
+            f"{t['min_response_ms']:>9.3f} {t['mean_response_ms']:>9.3f} "
+            f"{t['max_response_ms']:>9.3f} {t['jitter_ms']:>9.3f} "
+            f"{t['max_start_delay_ms']:>9.3f}"
+        )
+    return "\n".join(lines)
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="scheduler_simulator",
+        description="Simulate the CHAOS scheduler tick by tick and report "
+                    "per-task response time and jitter.",
+    )
+    parser.add_argument("project", help="path of the .chaos_cfg project file")
+    parser.add_argument(
+        "--ticks", type=int, default=None,
+        help=f"ticks to simulate (default: one hyperperiod, at most {MAX_ANALYSIS_TICKS})",
+    )
+    parser.add_argument("--json", metavar="PATH", help="also write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    try:
+        project = json.loads(Path(args.project).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        print(f"scheduler_simulator: error loading project '{args.project}': {e}", file=sys.stderr)
+        return 2
+
+    t0 = time.perf_counter()
+    result = simulate_project(project, ticks=args.ticks)
+    elapsed = time.perf_counter() - t0
+
+    print(format_task_table(result))
+    print(
+        f"{result['ticks']} ticks ({result['ticks'] * result['tick_ms']:g} ms), "
+        f"{result['jobs']} activations, CPU {result['utilization'] * 100:.1f} % "
+        f"simulated in {elapsed:.2f} s"
+    )
+    if result["overload"]:
+        print("warning: CPU overload, the ready queue grows without bound: "
+              "simulation stopped early")
+    if result["missing_wcet"]:
+        ids = ", ".join(str(tid) for tid in result["missing_wcet"])
+        print(f"warning: tasks without WCET (simulated as 0 us): {ids}")
+
+    if args.json:
+        Path(args.json).write_text(json.dumps(result, indent=2) + "\n", encoding="utf-8")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,244 @@
+# startup_budget.py
+#
+# Tempo di avvio della GUI confrontato con un budget (startup_budget.json).
+# Uso:
+#   python startup_budget.py                 # confronta con startup_budget.json
+#   python startup_budget.py -r 10 --top 20
+#   python startup_budget.py --save-budget   # aggiorna il budget
+#
+# Si misurano, ognuno in un nuovo interprete:
+#   - window_ms: dall'avvio del processo alla finestra mostrata (import,
+#     QApplication, RTOSWizard(), show() e un giro del ciclo degli eventi),
+#     tempo migliore su piu' ripetizioni
+#   - import_ms: import di wizard secondo python -X importtime (tempo
+#     cumulativo), con l'elenco degli import piu' lenti
+# e si controlla che i moduli rimandati alla prima Save / Load / Generate
+# (generatori, NumPy, json) non vengano importati per aprire la finestra.
+# Senza display si usa la piattaforma Qt "offscreen" (QT_QPA_PLATFORM).
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List
+
+
+SCRIPT_DIR = Path(__file__).resolve().parent
+DEFAULT_BUDGET = SCRIPT_DIR / "startup_budget.json"
+
+# Margine sul tempo misurato quando si salva un nuovo budget
+DEFAULT_HEADROOM = 0.5
+
+# Moduli che non devono servire per aprire la finestra
+DEFAULT_DEFERRED = [
+    "project_generator",
+    "os_cfg_generator",
+    "os_task_cfg_generator",
+    "os_sched_tbl_cfg_generator",
+    "os_alarms_cfg_generator",
+    "generation_worker",
+    "load_worker",
+    "footprint",
+    "schedule_normalizer",
+    "schedule_analysis",
+    "tick_advisor",
+    "numpy",
+    "json",
+]
+
+# Eseguito in un interprete nuovo: stampa "shown" appena la finestra e'
+# visibile. os._exit: la chiusura di Qt non fa parte della misura.
+WINDOW_SNIPPET = """
+import os, sys
+from PySide6.QtWidgets import QApplication
+app = QApplication(sys.argv)
+from wizard import RTOSWizard
+window = RTOSWizard()
+window.show()
+app.processEvents()
+print("shown", flush=True)
+os._exit(0)
+"""
+
+
+def _env() -> Dict[str, str]:
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    return env
+
+
+# ----------------------------------------------------------------------
+# Misure
+# ----------------------------------------------------------------------
+def measure_window_ms(repeat: int = 5) -> float:
+    """Tempo migliore (ms) dall'avvio dell'interprete alla finestra mostrata."""
+    best = None
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        proc = subprocess.Popen(
+            [sys.executable, "-c", WINDOW_SNIPPET], cwd=str(SCRIPT_DIR), env=_env(),
+            stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True,
+        )
+        line = proc.stdout.readline()
+        ms = (time.perf_counter() - t0) * 1000.0
+        _, err = proc.communicate()
+        if line.strip() != "shown":
+            raise RuntimeError(f"the wizard window did not open:\n{err.strip()}")
+        best = ms if best is None else min(best, ms)
+    return best
+
+
+def parse_importtime(stderr: str) -> List[Dict]:
+    """
+    Righe di python -X importtime:
+        import time: self [us] | cumulative | <rientro>nome
+    -> [{"module", "self_ms", "cumulative_ms", "depth"}, ...] nell'ordine
+    del output (un modulo compare dopo i moduli che importa).
+    """
+    imports = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # intestazione
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        imports.append({
+            "module": stripped,
+            "self_ms": int(fields[0]) / 1000.0,
+            "cumulative_ms": int(fields[1]) / 1000.0,
+            "depth": (len(name) - len(stripped) - 1) // 2,
+        })
+    return imports
+
+
+def measure_imports() -> List[Dict]:
+    """Import eseguiti per aprire la finestra (python -X importtime)."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WINDOW_SNIPPET], cwd=str(SCRIPT_DIR),
+        env=_env(), capture_output=True, text=True,
+    )
+    if "shown" not in proc.stdout:
+        raise RuntimeError(f"the wizard window did not open:\n{proc.stderr.strip()}")
+    return parse_importtime(proc.stderr)
+
+
+def run_measurements(repeat: int = 5) -> Dict:
+    imports = measure_imports()
+    wizard = next((i for i in imports if i["module"] == "wizard"), None)
+    return {
+        "window_ms": round(measure_window_ms(repeat), 1),
+        "import_ms": round(wizard["cumulative_ms"], 1) if wizard else 0.0,
+        "imports": imports,
+    }
+
+
+# ----------------------------------------------------------------------
+# Confronto con il budget
+# ----------------------------------------------------------------------
+def check_budget(results: Dict, budget: Dict) -> List[str]:
+    """Ritorna la lista dei problemi: tempi oltre il budget, moduli non rimandati."""
+    problems = []
+    for key, label in (("window_ms", "time to window"), ("import_ms", "import wizard")):
+        limit = budget.get(key)
+        if limit is not None and results[key] > limit:
+            problems.append(f"{label}: {results[key]:.1f} ms over the {limit:.1f} ms budget")
+
+    imported = {i["module"] for i in results["imports"]}
+    for module in budget.get("deferred_modules", DEFAULT_DEFERRED):
+        if module in imported:
+            problems.append(f"'{module}' is imported before the window opens")
+    return problems
+
+
+def format_report(results: Dict, top: int = 10) -> str:
+    lines = [
+        f"time to window: {results['window_ms']:.1f} ms",
+        f"import wizard:  {results['import_ms']:.1f} ms (-X importtime)",
+        "",
+        f"slowest imports (cumulative, top {top}):",
+    ]
+    # solo i moduli di primo livello: il cumulativo include i figli
+    roots = sorted(
+        (i for i in results["imports"] if i["depth"] == 0),
+        key=lambda i: i["cumulative_ms"], reverse=True,
+    )
+    for i in roots[:top]:
+        lines.append(f"  {i['cumulative_ms']:>9.1f} ms  {i['module']}")
+    return "\n".join(lines)
+
+
+# ----------------------------------------------------------------------
+# Linea di comando
+# ----------------------------------------------------------------------
+def build_arg_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="startup_budget",
+        description="Measure how long the CHAOS wizard takes to open its window "
+                    "and check it against the committed budget.",
+    )
+    parser.add_argument(
+        "-r", "--repeat", type=int, default=5,
+        help="timed launches, the best one is kept (default: 5)",
+    )
+    parser.add_argument(
+        "--top", type=int, default=10,
+        help="number of slowest imports to list (default: 10)",
+    )
+    parser.add_argument(
+        "--budget", default=str(DEFAULT_BUDGET),
+        help="budget JSON file (default: startup_budget.json next to this script)",
+    )
+    parser.add_argument(
+        "--save-budget", action="store_true",
+        help="write the measured times plus --headroom to the budget file instead of checking",
+    )
+    parser.add_argument(
+        "--headroom", type=float, default=DEFAULT_HEADROOM,
+        help=f"margin added to the measured times by --save-budget (default: {DEFAULT_HEADROOM})",
+    )
+    return parser
+
+
+def main(argv=None) -> int:
+    args = build_arg_parser().parse_args(argv)
+
+    print(f"launching the wizard {args.repeat} times...", file=sys.stderr)
+    try:
+        results = run_measurements(args.repeat)
+    except RuntimeError as e:
+        print(f"error: {e}", file=sys.stderr)
+        return 2
+    print(format_report(results, args.top))
+
+    budget_path = Path(args.budget)
+    if args.save_budget:
+        budget = {
+            "window_ms": round(results["window_ms"] * (1.0 + args.headroom), 1),
+            "import_ms": round(results["import_ms"] * (1.0 + args.headroom), 1),
+            "deferred_modules": DEFAULT_DEFERRED,
+        }
+        budget_path.write_text(json.dumps(budget, indent=2) + "\n", encoding="utf-8")
+        print(f"budget written to {budget_path}")
+        return 0
+
+    if not budget_path.exists():
+        print(f"no budget at {budget_path}: run with --save-budget to create one")
+        return 0
+
+    budget = json.loads(budget_path.read_text(encoding="utf-8"))
+    problems = check_budget(results, budget)
+    for p in problems:
+        print(f"OVER BUDGET {p}")
+    if problems:
+        return 1
+    print(f"within budget ({budget['window_ms']:.1f} ms to window)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
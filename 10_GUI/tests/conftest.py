@@ -0,0 +1,13 @@
+# tests/conftest.py
+#
+# I moduli del tool sono file piatti in 10_GUI/ (importati per nome, come
+# fanno chaos_gen.py e la GUI): la cartella va nel path di import.
+# I test coprono solo i moduli senza PySide6.
+
+import sys
+from pathlib import Path
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+
+if str(GUI_DIR) not in sys.path:
+    sys.path.insert(0, str(GUI_DIR))
@@ -0,0 +1,118 @@
+/************************************************************************
+*                               OS Alarms Cfg                         
+*************************************************************************
+* FileName:         os_alarms_cfg.c                                                                                
+* Author:           F.Ficili                                            
+*                                                                       
+* Software License Agreement:                                           
+*                                                                       
+* THIS SOFTWARE IS PROVIDED IN AN "AS IS" CONDITION. NO WARRANTIES,     
+* WHETHER EXPRESS, IMPLIED OR STATUTORY, INCLUDING, BUT NOT LIMITED     
+* TO, IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A           
+* PARTICULAR PURPOSE APPLY TO THIS SOFTWARE. THE AUTHOR SHALL NOT,      
+* IN ANY CIRCUMSTANCES, BE LIABLE FOR SPECIAL, INCIDENTAL OR            
+* CONSEQUENTIAL DAMAGES, FOR ANY REASON WHATSOEVER.                     
+*                                                                       
+* --------------------------------------------------------------------- 
+* File History:                                                                                            
+* --------------------------------------------------------------------- 
+* Author       Date        Version      Comment                         
+* ---------------------------------------------------------------------	
+* F.Ficili     15/09/24    1.0          First release.              
+************************************************************************/
+
+/************************************************************************
+* Includes
+************************************************************************/
+#include "os_alarms.h"
+#include "os.h"
+#include "common.h"
+#include "os_task_cfg.h"
+#include "os_alarms_cfg.h"
+
+/************************************************************************
+* Defines
+************************************************************************/
+
+
+/************************************************************************
+* Typedefs
+************************************************************************/
+
+
+/************************************************************************
+* LOCAL Variables
+************************************************************************/
+
+
+/************************************************************************
+* CALLBACKS
+************************************************************************/
+
+
+/************************************************************************
+* GLOBAL Variables
+************************************************************************/
+/* Alarm structure initialization */
+AlarmType Alarm_ID_0 =
+
+  /* --------------------------------------- Alarm ------------------------------------------- */     
+  /* ----------------------------------------------------------------------------------------- */
+  /* Action          Counter          Timeout           Type          TaskID          Callback */
+  /* ----------------------------------------------------------------------------------------- */   
+  {TRIGGER_CALLBACK,   COUNTER_INIT,    100,           ONE_SHOT,          0,          MyAlarmCallback_0};   
+  /* ----------------------------------------------------------------------------------------- */
+
+/* Alarm structure initialization */
+AlarmType Alarm_ID_1 =
+
+  /* --------------------------------------- Alarm ------------------------------------------- */     
+  /* ----------------------------------------------------------------------------------------- */
+  /* Action          Counter          Timeout           Type          TaskID          Callback */
+  /* ----------------------------------------------------------------------------------------- */   
+  {ACTIVATE_TASK,   COUNTER_INIT,    100,           ONE_SHOT,          0,          NULL};   
+  /* ----------------------------------------------------------------------------------------- */
+
+/* Alarm structure initialization */
+AlarmType Alarm_ID_2 =
+
+  /* --------------------------------------- Alarm ------------------------------------------- */     
+  /* ----------------------------------------------------------------------------------------- */
+  /* Action          Counter          Timeout           Type          TaskID          Callback */
+  /* ----------------------------------------------------------------------------------------- */   
+  {TRIGGER_CALLBACK,   COUNTER_INIT,    100,           ONE_SHOT,          0,          MyAlarmCallback_2};   
+  /* ----------------------------------------------------------------------------------------- */
+
+/* Alarm structure initialization */
+AlarmType Alarm_ID_3 =
+
+  /* --------------------------------------- Alarm ------------------------------------------- */     
+  /* ----------------------------------------------------------------------------------------- */
+  /* Action          Counter          Timeout           Type          TaskID          Callback */
+  /* ----------------------------------------------------------------------------------------- */   
+  {ACTIVATE_TASK,   COUNTER_INIT,    100,           ONE_SHOT,          0,          NULL};   
+  /* ----------------------------------------------------------------------------------------- */
+
+AlarmListType AlarmList[ALARMS_NUMB] =
+{
+  /* ---------------- Alarm List --------------- */   
+  /* ------------------------------------------- */
+  /* AlarmID         AlarmState         AlarmPtr */
+  /* ------------------------------------------- */     
+  {0,         ALARM_ACTIVE,      &Alarm_ID_0},
+  {1,         ALARM_ACTIVE,      &Alarm_ID_1},
+  {2,         ALARM_ACTIVE,      &Alarm_ID_2},
+  {3,         ALARM_ACTIVE,      &Alarm_ID_3},
+  /* ------------------------------------------- */
+};        
+
+
+/************************************************************************
+* LOCAL Functions
+************************************************************************/
+
+
+/************************************************************************
+* GLOBAL Functions
+************************************************************************/
+
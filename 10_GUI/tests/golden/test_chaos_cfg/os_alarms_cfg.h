@@ -0,0 +1,59 @@
+/************************************************************************
+*                              OS Alarms Cfg                        
+*************************************************************************
+* FileName:         os_alarms_cfg.h                                                                             
+* Author:           F.Ficili                                            
+*                                                                       
+* Software License Agreement:                                           
+*                                                                       
+* THIS SOFTWARE IS PROVIDED IN AN "AS IS" CONDITION. NO WARRANTIES,     
+* WHETHER EXPRESS, IMPLIED OR STATUTORY, INCLUDING, BUT NOT LIMITED     
+* TO, IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A           
+* PARTICULAR PURPOSE APPLY TO THIS SOFTWARE. THE AUTHOR SHALL NOT,      
+* IN ANY CIRCUMSTANCES, BE LIABLE FOR SPECIAL, INCIDENTAL OR            
+* CONSEQUENTIAL DAMAGES, FOR ANY REASON WHATSOEVER.                     
+*                                                                       
+* --------------------------------------------------------------------- 
+* File History:                                                                                    
+* --------------------------------------------------------------------- 
+* Author       Date        Version      Comment                         
+* ---------------------------------------------------------------------	
+* F.Ficili     15/09/24    1.0          First release.                 
+************************************************************************/
+
+#ifndef OS_ALARM_CFG_H
+#define OS_ALARM_CFG_H
+
+/************************************************************************
+* Includes
+************************************************************************/
+#include "os_alarms.h"
+
+/************************************************************************
+* EXPORTED Defines
+************************************************************************/
+/* Number of Alarms */
+#define ALARMS_NUMB                                                  4u
+
+/************************************************************************
+* EXPORTED Macros
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Typedef
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Variables
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Functions
+************************************************************************/
+
+
+#endif /* OS_ALARM_CFG_H */
+
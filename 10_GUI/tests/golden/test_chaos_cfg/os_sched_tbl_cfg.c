@@ -0,0 +1,83 @@
+/************************************************************************
+*                               OS Schedule Table                         
+*************************************************************************
+* FileName:         os_sched_tbl.c                                                                                
+* Author:           F.Ficili                                            
+*                                                                       
+* Software License Agreement:                                           
+*                                                                       
+* THIS SOFTWARE IS PROVIDED IN AN "AS IS" CONDITION. NO WARRANTIES,     
+* WHETHER EXPRESS, IMPLIED OR STATUTORY, INCLUDING, BUT NOT LIMITED     
+* TO, IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A           
+* PARTICULAR PURPOSE APPLY TO THIS SOFTWARE. THE AUTHOR SHALL NOT,      
+* IN ANY CIRCUMSTANCES, BE LIABLE FOR SPECIAL, INCIDENTAL OR            
+* CONSEQUENTIAL DAMAGES, FOR ANY REASON WHATSOEVER.                     
+*                                                                       
+* --------------------------------------------------------------------- 
+* File History:                                                                                            
+* --------------------------------------------------------------------- 
+* Author       Date        Version      Comment                         
+* ---------------------------------------------------------------------	
+*              
+************************************************************************/
+
+/************************************************************************
+* Includes
+************************************************************************/
+#include "os_sched_tbl.h"
+#include "os.h"
+#include "common.h"
+#include "os_task_cfg.h"
+#include "os_sched_tbl_cfg.h"
+
+/************************************************************************
+* Defines
+************************************************************************/
+
+
+/************************************************************************
+* Typedefs
+************************************************************************/
+
+
+/************************************************************************
+* LOCAL Variables
+************************************************************************/
+
+
+/************************************************************************
+* GLOBAL Variables
+************************************************************************/
+/* Schedule Table structure initialization */
+SchedTblType SchedTable[SCHED_EVT_NUMBER] =
+{
+  /* ------------------------------------------------ */
+  /* TaskID          Counter          Timeout  */
+  /* ------------------------------------------------ */   
+  /* ----------------- Sched. Table ----------------- */   
+  {0,     COUNTER_INIT,    10}, 
+  {1,     COUNTER_INIT,    10}, 
+  {2,     COUNTER_INIT,    10}, 
+  {0,     COUNTER_INIT,    10}, 
+  /* ------------------------------------------------ */
+};
+
+SchedTblListType SchedTableList[SCH_TBL_NUMB] =
+{
+  /* ----------------------------- Sched. Table List ------------------------------ */   
+  /* ------------------------------------------------------------------------------ */
+  /* SchTblID         SchEvtNumb                SchTblState         SchTblPtr       */
+  /* ------------------------------------------------------------------------------ */     
+  {SCHED_TBL_ID,   SCHED_EVT_NUMBER,  SCH_TBL_ACTIVE,     SchedTable},  
+  /* ------------------------------------------------------------------------------ */
+};  
+
+/************************************************************************
+* LOCAL Functions
+************************************************************************/
+
+
+/************************************************************************
+* GLOBAL Functions
+************************************************************************/
+
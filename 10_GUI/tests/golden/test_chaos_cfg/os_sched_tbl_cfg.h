@@ -0,0 +1,65 @@
+/************************************************************************
+*                              OS SCH TBL CFG                        
+*************************************************************************
+* FileName:         os_sch_tbl_cfg.h                                                                             
+* Author:           F.Ficili                                            
+*                                                                       
+* Software License Agreement:                                           
+*                                                                       
+* THIS SOFTWARE IS PROVIDED IN AN "AS IS" CONDITION. NO WARRANTIES,     
+* WHETHER EXPRESS, IMPLIED OR STATUTORY, INCLUDING, BUT NOT LIMITED     
+* TO, IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A           
+* PARTICULAR PURPOSE APPLY TO THIS SOFTWARE. THE AUTHOR SHALL NOT,      
+* IN ANY CIRCUMSTANCES, BE LIABLE FOR SPECIAL, INCIDENTAL OR            
+* CONSEQUENTIAL DAMAGES, FOR ANY REASON WHATSOEVER.                     
+*                                                                       
+* --------------------------------------------------------------------- 
+* File History:                                                                                    
+* --------------------------------------------------------------------- 
+* Author       Date        Version      Comment                         
+* ---------------------------------------------------------------------	
+*                  
+************************************************************************/
+
+#ifndef OS_SCH_TBL_CFG_H
+#define OS_SCH_TBL_CFG_H
+
+/************************************************************************
+* Includes
+************************************************************************/
+#include "os_sched_tbl.h"
+
+/************************************************************************
+* EXPORTED Defines
+************************************************************************/
+/* ID of the Schedule Table */
+#define SCHED_TBL_ID                                                 1u
+
+/* Number of scheduling events */
+#define SCHED_EVT_NUMBER                                             4u
+
+/* Number of Schedule table */
+#define SCH_TBL_NUMB                                                 1u
+
+/************************************************************************
+* EXPORTED Macros
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Typedef
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Variables
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Functions
+************************************************************************/
+
+
+#endif /* OS_SCH_TBL_CFG_H */
+
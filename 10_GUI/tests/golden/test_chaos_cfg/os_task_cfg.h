@@ -0,0 +1,65 @@
+/************************************************************************
+*                                OS Task Cfg                        
+*************************************************************************
+* FileName:         os_task_cfg.h                                                                              
+* Author:           F.Ficili                                            
+*                                                                       
+* Software License Agreement:                                           
+*                                                                       
+* THIS SOFTWARE IS PROVIDED IN AN "AS IS" CONDITION. NO WARRANTIES,     
+* WHETHER EXPRESS, IMPLIED OR STATUTORY, INCLUDING, BUT NOT LIMITED     
+* TO, IMPLIED WARRANTIES OF MERCHANTABILITY AND FITNESS FOR A           
+* PARTICULAR PURPOSE APPLY TO THIS SOFTWARE. THE AUTHOR SHALL NOT,      
+* IN ANY CIRCUMSTANCES, BE LIABLE FOR SPECIAL, INCIDENTAL OR            
+* CONSEQUENTIAL DAMAGES, FOR ANY REASON WHATSOEVER.                     
+*                                                                       
+* --------------------------------------------------------------------- 
+* File History:                                                                                    
+* --------------------------------------------------------------------- 
+* Author       Date        Version      Comment                         
+* ---------------------------------------------------------------------	
+*             
+************************************************************************/
+
+#ifndef OS_TASK_CFG_H
+#define OS_TASK_CFG_H
+
+/************************************************************************
+* Includes
+************************************************************************/
+#include "common.h"
+
+/************************************************************************
+* EXPORTED Defines
+************************************************************************/
+/* Task IDs */
+#define Led_Task_ID                                              0u
+#define Task_1_ID                                              1u
+#define Task_2_ID                                              2u
+#define Task_3_ID                                              3u
+#define Task_4_ID                                              4u
+#define Task_5_ID                                              5u
+/************************************************************************
+* EXPORTED Macros
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Typedef
+************************************************************************/
+
+
+/************************************************************************
+* EXPORTED Variables
+************************************************************************/
+/* Auto-calculation of task number */
+extern const uint16_t TaskNumber; 
+
+/* Auto-calculation of auto-started task number */
+extern const uint16_t AutoStartTaskNumber;
+
+/************************************************************************
+* EXPORTED Functions
+************************************************************************/
+
+#endif /* OS_TASK_CFG_H */
\ No newline at end of file
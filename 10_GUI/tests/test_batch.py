@@ -0,0 +1,57 @@
+# tests/test_batch.py
+#
+# Generazione batch di molti progetti (project_generator).
+
+import os
+import shutil
+from pathlib import Path
+
+from project_generator import OUTPUT_FILES, batch_output_dirs, find_project_files, generate_batch
+
+PROJECT_FILE = Path(__file__).resolve().parent.parent / "test.chaos_cfg"
+
+
+def test_batch_output_dirs_are_unique():
+    files = ["a/foo.chaos_cfg", "b/foo.chaos_cfg", "c/foo_1.chaos_cfg", "d/bar.chaos_cfg"]
+    dirs = batch_output_dirs(files, "out")
+    assert dirs == [str(Path("out") / name) for name in ("foo", "foo_2", "foo_1", "bar")]
+
+
+def test_batch_output_dirs_compare_names_like_the_filesystem():
+    dirs = batch_output_dirs(["a/Foo.chaos_cfg", "b/foo.chaos_cfg"], "out")
+    names = [os.path.normcase(Path(d).name) for d in dirs]
+    assert len(set(names)) == 2
+
+
+def test_find_project_files_dirs_globs_and_duplicates(tmp_path):
+    for sub in ("a", "b/deep"):
+        (tmp_path / sub).mkdir(parents=True)
+        (tmp_path / sub / "p.chaos_cfg").write_text("{}")
+    (tmp_path / "a" / "notes.txt").write_text("")
+
+    files = find_project_files([str(tmp_path), str(tmp_path / "a" / "p.chaos_cfg"),
+                                str(tmp_path / "*" / "*.chaos_cfg")])
+    assert files == [str(tmp_path / "a" / "p.chaos_cfg"),
+                     str(tmp_path / "b" / "deep" / "p.chaos_cfg")]
+
+
+def test_generate_batch_isolates_broken_projects(tmp_path):
+    files = []
+    for sub in ("a", "b"):
+        (tmp_path / sub).mkdir()
+        files.append(str(shutil.copy(PROJECT_FILE, tmp_path / sub / "board.chaos_cfg")))
+    broken = tmp_path / "broken.chaos_cfg"
+    broken.write_text("{ not json")
+    files.append(str(broken))
+
+    results = generate_batch(files, str(tmp_path / "out"), jobs=2)
+
+    assert [r["project"] for r in results] == files
+    assert [r["ok"] for r in results] == [True, True, False]
+    assert results[2]["error"].startswith("JSONDecodeError")
+    first = Path(results[0]["output_dir"])
+    second = Path(results[1]["output_dir"])
+    assert first != second
+    assert sorted(os.listdir(first)) == sorted(OUTPUT_FILES)
+    for name in OUTPUT_FILES:
+        assert (first / name).read_bytes() == (second / name).read_bytes()
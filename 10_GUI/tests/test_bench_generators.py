@@ -0,0 +1,68 @@
+# tests/test_bench_generators.py
+#
+# Benchmark dei generatori (bench_generators): progetti sintetici e
+# confronto dei risultati con la baseline (linearita', regressioni).
+
+from bench_generators import (
+    MIN_DELTA_MS,
+    STAGES,
+    check_linearity,
+    compare_with_baseline,
+    machine_scale,
+    run_benchmarks,
+    synthesize_project,
+)
+
+
+def _results(per_stage, calibration_ms=None):
+    """per_stage: {N: (ms, peak_kib)} uguale per tutte le fasi."""
+    return {
+        "meta": {"calibration_ms": calibration_ms},
+        "results": {str(n): {stage: {"ms": ms, "peak_kib": kib} for stage in STAGES}
+                    for n, (ms, kib) in per_stage.items()},
+    }
+
+
+def test_synthesize_project():
+    project = synthesize_project(10, n_events=4)
+    assert len(project["tasks"]) == 10 and len(project["schedule"]) == 4
+    assert len(project["alarms"]) == 10
+    assert {a["alarm_action"] for a in project["alarms"]} == {"ACTIVATE_TASK", "TRIGGER_CALLBACK"}
+    assert synthesize_project(0)["tasks"] == []
+
+
+def test_check_linearity():
+    linear = _results({1000: (10.0, 0), 10000: (100.0, 0), 100000: (1100.0, 0)})
+    assert check_linearity(linear) == []
+    quadratic = _results({1000: (10.0, 0), 10000: (1000.0, 0)})
+    problems = check_linearity(quadratic)
+    assert len(problems) == len(STAGES) and "N=10000" in problems[0]
+    # dimensioni piccole ignorate (costi fissi)
+    assert check_linearity(_results({10: (1.0, 0), 100: (100.0, 0)})) == []
+
+
+def test_compare_with_baseline():
+    baseline = _results({1000: (100.0, 1000.0)}, calibration_ms=10.0)
+    same = _results({1000: (120.0, 1200.0)}, calibration_ms=10.0)
+    assert compare_with_baseline(same, baseline) == []
+
+    slower = _results({1000: (130.0, 1000.0)}, calibration_ms=10.0)
+    assert len(compare_with_baseline(slower, baseline)) == len(STAGES)
+    # macchina piu' lenta: i tempi della baseline sono riscalati
+    slow_machine = _results({1000: (130.0, 1000.0)}, calibration_ms=20.0)
+    scale = machine_scale(slow_machine, baseline)
+    assert scale == 2.0
+    assert compare_with_baseline(slow_machine, baseline, scale=scale) == []
+
+    # sotto i margini assoluti e' rumore, anche se oltre la soglia
+    tiny = _results({1000: (0.1, 10.0)})
+    noisy = _results({1000: (0.1 + MIN_DELTA_MS / 2, 40.0)})
+    assert compare_with_baseline(noisy, tiny) == []
+    assert machine_scale(noisy, tiny) == 1.0
+
+
+def test_run_benchmarks_smoke():
+    results = run_benchmarks([10], repeat=1)
+    assert set(results["results"]["10"]) == set(STAGES)
+    assert all(r["ms"] > 0 and r["peak_kib"] > 0 for r in results["results"]["10"].values())
+    assert results["meta"]["calibration_ms"] > 0
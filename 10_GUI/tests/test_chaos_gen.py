@@ -0,0 +1,57 @@
+# tests/test_chaos_gen.py
+#
+# Generatore da linea di comando (chaos_gen): codici di uscita, opzioni
+# incompatibili e nessun import di PySide6.
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import chaos_gen
+
+GUI_DIR = Path(__file__).resolve().parent.parent
+PROJECT_FILE = GUI_DIR / "test.chaos_cfg"
+
+
+def test_missing_or_invalid_project(tmp_path, capsys):
+    assert chaos_gen.main([str(tmp_path / "missing.chaos_cfg"), "-o", str(tmp_path / "out")]) == 2
+    broken = tmp_path / "broken.chaos_cfg"
+    broken.write_text("{")
+    assert chaos_gen.main([str(broken), "-o", str(tmp_path / "out")]) == 2
+    assert "error loading project" in capsys.readouterr().err
+    assert not (tmp_path / "out").exists()
+
+
+@pytest.mark.parametrize("argv", [
+    [str(PROJECT_FILE), str(PROJECT_FILE)],
+    ["--batch", str(PROJECT_FILE), "--optimize-offsets"],
+    ["--batch", str(PROJECT_FILE), "--target", "avr"],
+])
+def test_rejected_option_combinations(argv, tmp_path):
+    with pytest.raises(SystemExit) as exc:
+        chaos_gen.main(argv + ["-o", str(tmp_path / "out")])
+    assert exc.value.code == 2
+
+
+def test_unchanged_run_reports_no_changes(tmp_path, capsys):
+    out = str(tmp_path / "out")
+    assert chaos_gen.main([str(PROJECT_FILE), "-o", out]) == 0
+    assert chaos_gen.main([str(PROJECT_FILE), "-o", out]) == 0
+    stdout = capsys.readouterr().out
+    assert "unchanged " in stdout and "memory footprint" in stdout
+    assert stdout.rstrip().splitlines()[-1].startswith("0 of 7 files changed")
+
+
+def test_command_line_never_imports_pyside6(tmp_path):
+    code = (
+        "import sys, chaos_gen\n"
+        f"rc = chaos_gen.main([{str(PROJECT_FILE)!r}, '-o', {str(tmp_path / 'out')!r}, '-q',\n"
+        "                      '--optimize-offsets', '--tight-ready-queue', '--auto-tick'])\n"
+        "assert rc == 0, rc\n"
+        "assert not [m for m in sys.modules if m.startswith('PySide6')]\n"
+    )
+    proc = subprocess.run([sys.executable, "-c", code], cwd=str(GUI_DIR),
+                          capture_output=True, text=True)
+    assert proc.returncode == 0, proc.stderr
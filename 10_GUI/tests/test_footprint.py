@@ -0,0 +1,67 @@
+# tests/test_footprint.py
+#
+# Stima RAM/ROM delle tabelle generate (footprint): layout delle struct
+# confrontato con quello del compilatore C di questa macchina (ctypes).
+
+import ctypes
+
+import pytest
+
+from footprint import FIELD_TYPES, STRUCT_LAYOUTS, TARGET_PROFILES, estimate_footprint, struct_size
+
+CTYPES_FIELDS = {
+    "ptr": ctypes.c_void_p,
+    "enum": ctypes.c_int,
+    1: ctypes.c_uint8,
+    2: ctypes.c_uint16,
+    4: ctypes.c_uint32,
+}
+
+
+def _ctypes_size(fields):
+    members = [(f"f{i}", CTYPES_FIELDS[f if f in ("ptr", "enum") else FIELD_TYPES[f]])
+               for i, f in enumerate(fields)]
+    return ctypes.sizeof(type("Struct", (ctypes.Structure,), {"_fields_": members}))
+
+
+@pytest.mark.skipif(ctypes.sizeof(ctypes.c_void_p) != 8, reason="host a 64 bit")
+@pytest.mark.parametrize("struct", sorted(STRUCT_LAYOUTS))
+def test_host_profile_matches_the_c_layout(struct):
+    assert struct_size(STRUCT_LAYOUTS[struct], TARGET_PROFILES["host-64"]) == _ctypes_size(STRUCT_LAYOUTS[struct])
+
+
+def test_struct_size_padding():
+    tbc = STRUCT_LAYOUTS["TbcType"]
+    # uint16 + 2 di padding, puntatore, enum, uint8 + 3 di padding
+    assert struct_size(tbc, TARGET_PROFILES["cortex-m"]) == 16
+    assert struct_size(tbc, TARGET_PROFILES["cortex-m-short-enums"]) == 12
+    # struct impaccate
+    assert struct_size(tbc, TARGET_PROFILES["avr"]) == 7
+    assert struct_size(tbc, TARGET_PROFILES["msp430"]) == 8
+
+
+def test_estimate_footprint_sections():
+    project = {
+        "os": {"ready_queue": "10"},
+        "tasks": [{"id": "0", "name": "A"}, {"id": "1", "name": "B"}, {"id": "2", "name": " "}],
+        "schedule": [{"task_id": 0, "period_ms": 10}] * 3,
+        "alarms": [{"alarm_id": 0}, {"alarm_id": 1}],
+    }
+    result = estimate_footprint(project, "cortex-m")
+    tables = {t["name"]: t for t in result["tables"]}
+    assert tables["Tasks[]"]["count"] == 2
+    assert tables["Tasks[]"]["ram"] == tables["Tasks[]"]["rom"] == 32
+    assert tables["SchedTable[]"]["ram"] == 3 * 12
+    assert tables["AlarmList[]"]["count"] == 2
+    # ready queue non inizializzata: solo RAM
+    assert (tables["ready queue"]["ram"], tables["ready queue"]["rom"]) == (40, 0)
+    # costanti: solo ROM
+    assert (tables["TaskNumber, AutoStartTaskNumber"]["ram"],
+            tables["TaskNumber, AutoStartTaskNumber"]["rom"]) == (0, 4)
+    assert result["ram"] == sum(t["ram"] for t in result["tables"])
+    assert result["rom"] == sum(t["rom"] for t in result["tables"])
+
+    # tipi dei campi configurabili (struct impaccate: nessun padding)
+    packed = {t["name"]: t for t in estimate_footprint(project, "avr")["tables"]}
+    wide = {t["name"]: t for t in estimate_footprint(project, "avr", types={"task_id": 4})["tables"]}
+    assert (packed["SchedTable[]"]["size"], wide["SchedTable[]"]["size"]) == (10, 12)
@@ -0,0 +1,219 @@
+# tests/test_generator_utils.py
+#
+# Utilita' comuni dei generatori (generator_utils).
+
+import os
+
+import pytest
+
+from generator_utils import (
+    clear_template_cache,
+    commit_staged_files,
+    load_template,
+    replace_defines,
+    write_if_changed,
+    write_lines_if_changed,
+)
+
+
+# ----------------------------------------------------------------------
+# replace_defines
+# ----------------------------------------------------------------------
+def test_replace_defines_all_names_in_one_pass():
+    text = (
+        "#define A 1\n"
+        "  #define  B   old value\n"
+        "#define AB 3\n"
+        "int x; // #define A 9\n"
+    )
+    out, missing = replace_defines(text, {"A": 10, "B": "(2U)"})
+    assert out == (
+        "#define A 10\n"
+        "  #define  B   (2U)\n"
+        "#define AB 3\n"
+        "int x; // #define A 9\n"
+    )
+    assert missing == []
+
+
+def test_replace_defines_value_is_literal():
+    # niente interpretazione di \1 o \g<1> nel valore
+    out, _ = replace_defines("#define PATH x\n", {"PATH": r"C:\1\g<1>"})
+    assert out == "#define PATH C:\\1\\g<1>\n"
+
+
+def test_replace_defines_reports_missing_names():
+    out, missing = replace_defines("#define A 1\n", {"A": 2, "MISSING": 3})
+    assert out == "#define A 2\n"
+    assert missing == ["MISSING"]
+    assert replace_defines("#define A 1\n", {}) == ("#define A 1\n", [])
+
+
+# ----------------------------------------------------------------------
+# write_lines_if_changed / write_if_changed
+# ----------------------------------------------------------------------
+def test_unchanged_file_is_not_rewritten(tmp_path):
+    path = tmp_path / "sub" / "out.c"
+    assert write_lines_if_changed(str(path), (f"line {i}\n" for i in range(50_000)))
+    content = path.read_bytes()
+    os.utime(path, ns=(1_000_000_000, 1_000_000_000))
+
+    assert not write_lines_if_changed(str(path), (f"line {i}\n" for i in range(50_000)))
+    assert path.stat().st_mtime_ns == 1_000_000_000
+    assert path.read_bytes() == content
+    assert sorted(p.name for p in path.parent.iterdir()) == ["out.c"]
+
+    assert write_if_changed(str(path), "other\n")
+    assert path.read_bytes() == b"other" + os.linesep.encode()
+
+
+def test_failing_generator_leaves_old_file_and_no_tmp(tmp_path):
+    path = tmp_path / "out.h"
+    write_if_changed(str(path), "old\n")
+
+    def chunks():
+        yield "new\n" * 100_000
+        raise ValueError("boom")
+
+    with pytest.raises(ValueError):
+        write_lines_if_changed(str(path), chunks())
+    assert path.read_bytes() == b"old" + os.linesep.encode()
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["out.h"]
+
+
+# ----------------------------------------------------------------------
+# commit_staged_files
+# ----------------------------------------------------------------------
+OLD_MTIME_NS = 1_000_000_000
+
+
+def _staged(tmp_path, files):
+    staging = tmp_path / "staging"
+    staging.mkdir(exist_ok=True)
+    for name, content in files.items():
+        (staging / name).write_text(content)
+    return staging
+
+
+def _old_output(out, files):
+    out.mkdir()
+    for name, content in files.items():
+        (out / name).write_text(content)
+        os.utime(out / name, ns=(OLD_MTIME_NS, OLD_MTIME_NS))
+
+
+def test_commit_replaces_only_changed_files_in_real_dir(tmp_path):
+    out = tmp_path / "generated"
+    _old_output(out, {"a.h": "same", "b.c": "old", "extra.txt": "user"})
+    staging = _staged(tmp_path, {"a.h": "same", "b.c": "new"})
+
+    changed = commit_staged_files(str(staging), str(out), ["a.h", "b.c"])
+
+    assert changed == [str(out / "b.c")]
+    assert out.is_dir() and not out.is_symlink()
+    assert (out / "a.h").stat().st_mtime_ns == OLD_MTIME_NS
+    assert (out / "b.c").read_text() == "new"
+    assert (out / "extra.txt").read_text() == "user"
+    assert commit_staged_files(str(_staged(tmp_path, {"b.c": "new"})), str(out), ["b.c"]) == []
+
+
+def test_commit_creates_missing_output_dir(tmp_path):
+    out = tmp_path / "deep" / "generated"
+    staging = _staged(tmp_path, {"a.h": "x"})
+    assert commit_staged_files(str(staging), str(out), ["a.h"]) == [str(out / "a.h")]
+    assert (out / "a.h").read_text() == "x"
+
+
+def test_versioned_commit_swaps_the_link(tmp_path):
+    out = tmp_path / "generated"
+    _old_output(out, {"a.h": "same", "b.c": "old", "extra.txt": "user"})
+
+    staging = _staged(tmp_path, {"a.h": "same", "b.c": "new"})
+    assert commit_staged_files(str(staging), str(out), ["a.h", "b.c"], versioned=True) == [str(out / "b.c")]
+    assert out.is_symlink()
+    first = os.readlink(out)
+    assert first.startswith(".generated.v-")
+    assert (out / "a.h").stat().st_mtime_ns == OLD_MTIME_NS
+    assert (out / "b.c").read_text() == "new"
+    assert (out / "extra.txt").read_text() == "user"
+
+    staging = _staged(tmp_path, {"a.h": "same", "b.c": "newer"})
+    commit_staged_files(str(staging), str(out), ["a.h", "b.c"], versioned=True)
+    second = os.readlink(out)
+    assert second != first
+    # la versione precedente viene rimossa, nessun link temporaneo resta
+    assert sorted(p.name for p in tmp_path.iterdir()) == sorted([second, "generated", "staging"])
+    assert (out / "b.c").read_text() == "newer"
+    assert (out / "a.h").stat().st_mtime_ns == OLD_MTIME_NS
+    assert (out / "extra.txt").read_text() == "user"
+
+
+def test_versioned_commit_refuses_foreign_symlink(tmp_path):
+    target = tmp_path / "elsewhere"
+    _old_output(target, {"b.c": "old"})
+    out = tmp_path / "generated"
+    os.symlink("elsewhere", out, target_is_directory=True)
+    staging = _staged(tmp_path, {"b.c": "new"})
+
+    with pytest.raises(RuntimeError):
+        commit_staged_files(str(staging), str(out), ["b.c"], versioned=True)
+    assert os.readlink(out) == "elsewhere"
+    assert (target / "b.c").read_text() == "old"
+
+
+def test_versioned_commit_falls_back_without_symlinks(tmp_path, monkeypatch):
+    def no_symlinks(*args, **kwargs):
+        raise OSError("symlink not permitted")
+
+    monkeypatch.setattr(os, "symlink", no_symlinks)
+    out = tmp_path / "generated"
+    _old_output(out, {"b.c": "old"})
+    staging = _staged(tmp_path, {"b.c": "new"})
+
+    assert commit_staged_files(str(staging), str(out), ["b.c"], versioned=True) == [str(out / "b.c")]
+    assert out.is_dir() and not out.is_symlink()
+    assert (out / "b.c").read_text() == "new"
+
+
+# ----------------------------------------------------------------------
+# Cache dei template
+# ----------------------------------------------------------------------
+def test_template_is_read_once_until_it_changes(tmp_path):
+    path = tmp_path / "os_cfg.h"
+    path.write_text("#define A 1\n")
+    clear_template_cache()
+
+    tpl = load_template(str(path))
+    assert tpl.lines == ("#define A 1\n",)
+    assert load_template(str(tmp_path / "." / "os_cfg.h")) is tpl
+
+    path.write_text("#define A 1\n#define B 2\n")
+    changed = load_template(str(path))
+    assert changed is not tpl and changed.text.endswith("#define B 2\n")
+
+    clear_template_cache()
+    assert load_template(str(path)) is not changed
+
+
+def test_template_anchors_are_indexed_once_per_indexer(tmp_path):
+    path = tmp_path / "os_task_cfg.c"
+    path.write_text("a\n{\nb\n};\n")
+    clear_template_cache()
+    tpl = load_template(str(path))
+    calls = []
+
+    def braces(lines):
+        calls.append(1)
+        return lines.index("{\n"), lines.index("};\n")
+
+    def missing(lines):
+        calls.append(1)
+        raise RuntimeError("ancora mancante")
+
+    assert tpl.anchors(braces) == (1, 3)
+    assert tpl.anchors(braces) == (1, 3)
+    for _ in range(2):
+        with pytest.raises(RuntimeError):
+            tpl.anchors(missing)
+    # l'indice riuscito resta in cache, l'errore no
+    assert len(calls) == 3
@@ -0,0 +1,49 @@
+# tests/test_golden_output.py
+#
+# File generati per test.chaos_cfg confrontati byte per byte con quelli dei
+# generatori originali (golden/test_chaos_cfg, prodotti dai generatori di
+# partenza con gli stessi template): sequenziale, famiglie in parallelo e
+# linea di comando.
+
+from pathlib import Path
+
+import pytest
+
+import chaos_gen
+from project_generator import generate_project, load_project_file
+
+TESTS_DIR = Path(__file__).resolve().parent
+PROJECT_FILE = TESTS_DIR.parent / "test.chaos_cfg"
+GOLDEN_DIR = TESTS_DIR / "golden" / "test_chaos_cfg"
+GOLDEN_FILES = sorted(p.name for p in GOLDEN_DIR.iterdir())
+
+
+def _assert_matches_golden(output_dir: Path):
+    assert sorted(p.name for p in output_dir.iterdir()) == GOLDEN_FILES
+    for name in GOLDEN_FILES:
+        assert (output_dir / name).read_bytes() == (GOLDEN_DIR / name).read_bytes(), name
+
+
+@pytest.mark.parametrize("parallel", [None, "thread", "process"])
+def test_generate_project_matches_golden(tmp_path, parallel):
+    out = tmp_path / "generated"
+    warnings = []
+    changed = generate_project(load_project_file(PROJECT_FILE), output_dir=str(out),
+                               warnings=warnings, parallel=parallel)
+    assert len(changed) == len(GOLDEN_FILES)
+    assert warnings == []
+    _assert_matches_golden(out)
+
+
+def test_regeneration_rewrites_nothing(tmp_path):
+    out = tmp_path / "generated"
+    project = load_project_file(PROJECT_FILE)
+    generate_project(project, output_dir=str(out))
+    assert generate_project(project, output_dir=str(out)) == []
+    _assert_matches_golden(out)
+
+
+def test_command_line_matches_golden(tmp_path):
+    out = tmp_path / "generated"
+    assert chaos_gen.main([str(PROJECT_FILE), "-o", str(out), "-q"]) == 0
+    _assert_matches_golden(out)
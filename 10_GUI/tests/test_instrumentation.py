@@ -0,0 +1,87 @@
+# tests/test_instrumentation.py
+#
+# Record per fase (instrumentation): annidamento, errori, memoria,
+# limite dei record e integrazione con generate_project.
+
+import json
+import tracemalloc
+from pathlib import Path
+
+import pytest
+
+from instrumentation import Instrumentation
+from project_generator import OUTPUT_FILES, generate_project, load_project_file
+
+PROJECT_FILE = Path(__file__).resolve().parent.parent / "test.chaos_cfg"
+
+
+def test_nested_stages_and_errors():
+    instr = Instrumentation()
+    with instr.stage("outer", tasks=3) as outer:
+        with instr.stage("inner"):
+            pass
+        with pytest.raises(ValueError):
+            with instr.stage("failing"):
+                raise ValueError("boom")
+        outer["bytes_written"] = 2048
+
+    record = instr.last("outer")
+    assert record["counts"] == {"tasks": 3} and record["parent_id"] is None
+    assert [r["stage"] for r in instr.children(record)] == ["inner", "failing"]
+    assert instr.last("failing")["error"] == "boom"
+    assert record["peak_kib"] is None
+    line = instr.summary_line("outer")
+    assert line.startswith("outer: ") and "(inner " in line and ", failing " in line
+    assert line.endswith(" | 2.0 KiB written")
+
+
+def test_memory_is_traced_only_during_the_outermost_stage():
+    assert not tracemalloc.is_tracing()
+    instr = Instrumentation(trace_memory=True)
+    with instr.stage("outer"):
+        assert tracemalloc.is_tracing()
+        with instr.stage("inner"):
+            block = bytearray(1 << 20)
+        del block
+        assert tracemalloc.is_tracing()
+    assert not tracemalloc.is_tracing()
+    assert instr.last("inner")["peak_kib"] >= 1024
+    # il picco della fase interna conta anche per quella esterna
+    assert instr.last("outer")["peak_kib"] >= instr.last("inner")["peak_kib"]
+
+
+def test_tracing_started_elsewhere_is_left_running():
+    tracemalloc.start()
+    try:
+        instr = Instrumentation(trace_memory=True)
+        with instr.stage("stage"):
+            pass
+        assert tracemalloc.is_tracing()
+        assert instr.last("stage")["peak_kib"] is not None
+    finally:
+        tracemalloc.stop()
+
+
+def test_only_the_latest_records_are_kept():
+    instr = Instrumentation(max_records=5)
+    for i in range(12):
+        instr.add(f"stage_{i}", 1.0)
+    assert [r["stage"] for r in instr.report()["stages"]] == [f"stage_{i}" for i in range(7, 12)]
+    instr.clear()
+    assert instr.report()["stages"] == []
+
+
+def test_generate_project_records_every_generator(tmp_path):
+    instr = Instrumentation()
+    generate_project(load_project_file(PROJECT_FILE), output_dir=str(tmp_path / "out"),
+                     instrumentation=instr)
+    record = instr.last("generate")
+    stages = [r["stage"] for r in instr.children(record)]
+    assert stages[0] == "normalize_schedule" and stages[-1] == "commit"
+    assert {"generate_os_cfg", "generate_os_task_cfg", "generate_os_sched_tbl_cfg",
+            "generate_os_alarms_cfg"} <= set(stages)
+    assert record["bytes_written"] == sum((tmp_path / "out" / n).stat().st_size for n in OUTPUT_FILES)
+
+    report = tmp_path / "perf.json"
+    instr.write_report(str(report))
+    assert json.loads(report.read_text())["stages"] == instr.report()["stages"]
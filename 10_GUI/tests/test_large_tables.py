@@ -0,0 +1,49 @@
+# tests/test_large_tables.py
+#
+# Tabelle generate in streaming (Tasks[], SchedTable[], Alarm_ID_N,
+# AlarmList[]) per un progetto grande: file piu' lunghi dei blocchi di
+# scrittura, confrontati byte per byte (sha256) con l'output dei
+# generatori originali per lo stesso progetto.
+# os_cfg.h non e' confrontato: con 3000 task SORT_ALGORITHM e' scelto
+# automaticamente (vedi select_sort_config) e non e' piu' quello del template.
+
+import hashlib
+
+from project_generator import generate_project
+
+# sha256 dei file prodotti dai generatori originali per large_project(3000)
+EXPECTED_SHA256 = {
+    "os_task_cfg.h": "1ed648866480b15337d14e9c2c9006a9297cc1d6bf7bcf51274cc669904da636",
+    "os_task_cfg.c": "a3349fe479a391b537ec5c793fa9e5297c1c143b7bab79bdfa678a5de6a7f731",
+    "os_sched_tbl_cfg.h": "8618e83a16ec958a6ad634375fffa65ee0c1423b6a54f8af039cbc5848e21998",
+    "os_sched_tbl_cfg.c": "b6291183a02633ac7b7bf7e408d313759133137a6fe25538e221ccc1f118a405",
+    "os_alarms_cfg.h": "1b893d812c93394b0fe2ee911911a3ba218d16af35a9283a7d1711bbcfdea3b6",
+    "os_alarms_cfg.c": "605f005721909f8f94eb3a47e15edec1412f219a3015788df563a8929d330e39",
+}
+
+
+def large_project(n):
+    """n task e n entry della schedule table, n/4 allarmi di ogni tipo e azione."""
+    tasks = [{"id": str(i), "name": f"Task_{i}", "priority": str(1 + (i * 7) % 13)} for i in range(n)]
+    schedule = [{"task_id": (i * 3) % n, "task_name": f"Task_{(i * 3) % n}", "period_ms": 5 * (1 + i % 12)}
+                for i in range(n)]
+    alarms = []
+    for i in range(n // 4):
+        callback = i % 3 == 0
+        alarms.append({
+            "alarm_id": i, "alarm_type": "ONE_SHOT" if i % 2 else "CYCLIC",
+            "alarm_action": "TRIGGER_CALLBACK" if callback else "ACTIVATE_TASK",
+            "period_ms": 10 * (1 + i % 5), "task_id": None if callback else i % n,
+            "callback": f"AlarmCallback_{i}" if callback else None,
+        })
+    return {"version": 1,
+            "os": {"scheduler_freq": "1000", "tick_ms": "1", "ready_queue": "100",
+                   "hooks": {"startup": True, "shutdown": False, "pre_task": True,
+                             "post_task": False, "error": True}},
+            "tasks": tasks, "schedule": schedule, "alarms": alarms}
+
+
+def test_large_tables_match_original_generators(tmp_path):
+    generate_project(large_project(3000), output_dir=str(tmp_path))
+    for name, digest in EXPECTED_SHA256.items():
+        assert hashlib.sha256((tmp_path / name).read_bytes()).hexdigest() == digest, name
@@ -0,0 +1,37 @@
+# tests/test_project_model.py
+#
+# Dati del progetto fuori dalle pagine del wizard (project_model).
+
+import pytest
+
+from project_model import DEFAULT_OS, ProjectModel
+
+
+def test_initial_values_are_independent_copies():
+    first, second = ProjectModel(), ProjectModel()
+    first.get("os")["hooks"]["startup"] = True
+    first.get("tasks").append({"id": "0"})
+    assert second.get("os")["hooks"]["startup"] is False
+    assert second.get("tasks") == [] and DEFAULT_OS["hooks"]["startup"] is False
+
+
+def test_load_resets_missing_sections():
+    model = ProjectModel()
+    model.set("alarms", [{"alarm_id": 0}])
+    model.load({"tasks": [{"id": "0", "name": "A"}], "os": {"tick_ms": "2"}})
+    assert model.get("tasks") == [{"id": "0", "name": "A"}]
+    assert model.get("alarms") == [] and model.get("normalize_schedule") is False
+    assert model.get("os") == {"tick_ms": "2"}
+
+
+def test_project_layout_and_copies():
+    model = ProjectModel()
+    model.set("schedule", [{"task_id": 0, "period_ms": 10}])
+    project = model.project()
+    assert list(project) == ["version", "os", "tasks", "schedule", "alarms", "normalize_schedule"]
+    assert project["version"] == 1
+    project["schedule"].append({"task_id": 1})
+    assert len(model.get("schedule")) == 1
+
+    with pytest.raises(KeyError):
+        model.set("unknown", [])
@@ -0,0 +1,266 @@
+# tests/test_schedule_analysis.py
+#
+# Analisi temporale del progetto (schedule_analysis): profili per tick
+# confrontati con un conteggio diretto delle attivazioni.
+
+import random
+
+import pytest
+
+from schedule_analysis import (
+    analyze_project,
+    collect_releases,
+    hyperperiod,
+    optimize_offsets,
+    ready_queue_depth,
+    tick_profile,
+)
+
+
+def _project(schedule, alarms=(), wcet=None, tick_ms="1"):
+    task_ids = {e["task_id"] for e in schedule} | {a["task_id"] for a in alarms}
+    tasks = [{"id": str(tid), "name": f"T{tid}", "priority": "1",
+              "wcet_us": "" if wcet is None else str(wcet.get(tid, ""))}
+             for tid in sorted(task_ids)]
+    return {"os": {"tick_ms": tick_ms}, "tasks": tasks,
+            "schedule": list(schedule), "alarms": list(alarms)}
+
+
+def _alarm(task_id, period_ms, alarm_type="CYCLIC"):
+    return {"alarm_type": alarm_type, "alarm_action": "ACTIVATE_TASK",
+            "period_ms": period_ms, "task_id": task_id}
+
+
+# ----------------------------------------------------------------------
+# Attivazioni e iperperiodo
+# ----------------------------------------------------------------------
+def test_schedule_offset_becomes_phase():
+    project = _project([{"task_id": 0, "period_ms": 10, "offset": 3},
+                        {"task_id": 1, "period_ms": 4, "offset": 0}],
+                       alarms=[_alarm(2, 6), _alarm(3, 7, "ONE_SHOT")])
+    rel = collect_releases(project)
+    assert rel["period"].tolist() == [10, 4, 6]
+    # il contatore parte avanti di offset tick: prima attivazione a 10 - 3
+    assert rel["offset"].tolist() == [7, 0, 0]
+    assert rel["source"] == ["schedule", "schedule", "alarm"]
+    assert rel["once_tick"].tolist() == [7] and rel["once_task_id"].tolist() == [3]
+
+
+def test_periods_are_converted_to_ticks():
+    project = _project([{"task_id": 0, "period_ms": 10, "offset": 0}], tick_ms="2")
+    assert collect_releases(project)["period"].tolist() == [5]
+
+
+def test_hyperperiod():
+    assert hyperperiod([]) == 0
+    assert hyperperiod([4, 6, 10]) == 60
+    # oltre int64: mcm in interi Python
+    primes = [1_000_003, 1_000_033, 1_000_037, 1_000_039]
+    assert hyperperiod(primes) == primes[0] * primes[1] * primes[2] * primes[3]
+
+
+def test_tick_profile_matches_direct_count():
+    rng = random.Random(5)
+    period = [rng.choice([1, 2, 3, 5, 6]) for _ in range(20)]
+    offset = [rng.randrange(p) for p in period]
+    weight = [rng.choice([0.5, 1.0, 2.0]) for _ in period]
+    profile = tick_profile(period, offset, weight, 90)
+    expected = [sum(w for p, o, w in zip(period, offset, weight) if t % p == o) for t in range(90)]
+    assert profile.tolist() == pytest.approx(expected)
+
+
+# ----------------------------------------------------------------------
+# analyze_project
+# ----------------------------------------------------------------------
+def test_utilization_and_peaks():
+    project = _project([{"task_id": 0, "period_ms": 4, "offset": 0},
+                        {"task_id": 1, "period_ms": 6, "offset": 0}],
+                       wcet={0: 500, 1: 300})
+    result = analyze_project(project)
+    assert result["hyperperiod_ticks"] == 12
+    assert result["utilization"] == pytest.approx(500 / 4000 + 300 / 6000)
+    assert result["releases_per_hyperperiod"] == 3 + 2
+    # tick 0: entrambi i task
+    assert result["peak_releases"] == 2 and result["peak_releases_tick"] == 0
+    assert result["peak_tick_load"] == pytest.approx(0.8)
+    assert result["missing_wcet"] == []
+    assert result["profiled"]
+
+
+def test_missing_wcet_and_no_wcet():
+    schedule = [{"task_id": 0, "period_ms": 2, "offset": 0},
+                {"task_id": 1, "period_ms": 3, "offset": 0}]
+    partial = analyze_project(_project(schedule, wcet={0: 100}))
+    assert partial["missing_wcet"] == [1]
+    assert partial["utilization"] == pytest.approx(0.05)
+
+    none = analyze_project(_project(schedule))
+    assert none["utilization"] is None and none["peak_tick_load"] is None
+    assert none["peak_releases"] == 2
+
+
+def test_long_hyperperiod_is_not_profiled():
+    project = _project([{"task_id": 0, "period_ms": 1009, "offset": 0},
+                        {"task_id": 1, "period_ms": 1013, "offset": 0}], wcet={0: 1, 1: 1})
+    result = analyze_project(project, max_ticks=1000)
+    assert result["hyperperiod_ticks"] == 1009 * 1013
+    assert result["utilization"] is not None
+    assert not result["profiled"] and result["peak_releases"] is None
+    assert result["releases_per_hyperperiod"] == 1013 + 1009
+
+
+def test_callback_alarms_only_extend_the_hyperperiod():
+    project = _project([{"task_id": 0, "period_ms": 4, "offset": 0}])
+    project["alarms"] = [{"alarm_type": "CYCLIC", "alarm_action": "CALLBACK", "period_ms": 5}]
+    result = analyze_project(project)
+    assert result["hyperperiod_ticks"] == 20
+    assert result["releases_per_hyperperiod"] == 5
+    assert result["peak_releases"] == 1
+
+
+# ----------------------------------------------------------------------
+# optimize_offsets
+# ----------------------------------------------------------------------
+def _with_offsets(project, offsets):
+    schedule = [dict(e, offset=off) if off is not None else e
+                for e, off in zip(project["schedule"], offsets)]
+    return dict(project, schedule=schedule)
+
+
+def test_offsets_spread_releases():
+    project = _project([{"task_id": tid, "period_ms": 4, "offset": 0} for tid in range(4)]
+                       + [{"task_id": 4, "period_ms": 8, "offset": 0}])
+    result = optimize_offsets(project)
+    assert result["objective"] == "releases"
+    assert result["optimized"]
+    assert result["before"] == 5 and result["after"] == 2
+    assert all(0 <= off < 4 for off in result["offsets"][:4])
+    assert sorted(result["offsets"][:4]) == [0, 1, 2, 3]
+    # il picco riportato e' quello del progetto con i nuovi offset
+    optimized = analyze_project(_with_offsets(project, result["offsets"]))
+    assert optimized["peak_releases"] == result["after"]
+
+
+def test_offsets_avoid_fixed_alarms_and_weight_by_wcet():
+    project = _project([{"task_id": 0, "period_ms": 2, "offset": 0},
+                        {"task_id": 1, "period_ms": 4, "offset": 0}],
+                       alarms=[_alarm(2, 2)], wcet={0: 300, 1: 100, 2: 500})
+    result = optimize_offsets(project)
+    assert result["objective"] == "wcet"
+    assert result["before"] == pytest.approx(900)
+    assert result["after"] == pytest.approx(500)
+    optimized = analyze_project(_with_offsets(project, result["offsets"]))
+    assert optimized["peak_tick_load"] * 1000.0 == pytest.approx(result["after"])
+
+
+def test_offsets_unchanged_when_not_improved():
+    project = _project([{"task_id": 0, "period_ms": 2, "offset": 0},
+                        {"task_id": 1, "period_ms": 2, "offset": 1},
+                        {"task_id": 2, "period_ms": 0, "offset": 0}])
+    result = optimize_offsets(project)
+    assert not result["optimized"]
+    assert result["offsets"] == [0, 1, None]
+    assert result["after"] == result["before"] == 1
+
+
+def test_offsets_not_optimized_for_long_hyperperiod():
+    project = _project([{"task_id": 0, "period_ms": 1009, "offset": 0},
+                        {"task_id": 1, "period_ms": 1013, "offset": 0}])
+    result = optimize_offsets(project, max_ticks=1000)
+    assert not result["optimized"] and result["before"] is None
+    assert result["offsets"] == [0, 0]
+
+
+# ----------------------------------------------------------------------
+# ready_queue_depth
+# ----------------------------------------------------------------------
+def _max_occupancy(project, ticks):
+    """
+    Massimo dei task in coda subito dopo le attivazioni di ogni tick,
+    simulando un'esecuzione FIFO (qualsiasi ordine senza CPU inattiva
+    con task pronti da' lo stesso numero di task terminati).
+    """
+    rel = collect_releases(project)
+    tick_us = rel["tick_ms"] * 1000.0
+    wcet = {int(t["id"]): float(t["wcet_us"] or 0) for t in project["tasks"]}
+    jobs = []
+    for period, phase, tid in zip(rel["period"].tolist(), rel["offset"].tolist(),
+                                  rel["task_id"].tolist()):
+        jobs += [(t, tid) for t in range(phase, ticks, period)]
+    jobs += [(t, tid) for t, tid in zip(rel["once_tick"].tolist(), rel["once_task_id"].tolist())
+             if t < ticks]
+    jobs.sort()
+    finish = []
+    now = 0.0
+    for t, tid in jobs:
+        now = max(now, t * tick_us) + wcet.get(tid, 0.0)
+        finish.append(now)
+    best = 0
+    for t in range(ticks):
+        queued = sum(1 for (r, _), f in zip(jobs, finish) if r <= t and f > t * tick_us)
+        best = max(best, queued)
+    return best
+
+
+def test_depth_without_wcet_is_peak_releases():
+    project = _project([{"task_id": 0, "period_ms": 2, "offset": 0},
+                        {"task_id": 1, "period_ms": 3, "offset": 0}],
+                       alarms=[_alarm(2, 6, "ONE_SHOT")])
+    result = ready_queue_depth(project)
+    assert result["method"] == "releases"
+    assert result["depth"] == 3 and result["tick"] == 0
+    assert result["profiled"]
+
+
+def test_depth_with_wcet_counts_the_busy_period():
+    # tre attivazioni a tick 0, 1500 us ciascuna: il terzo task termina a
+    # 4.5 ms, dopo le attivazioni di tick 4
+    project = _project([{"task_id": tid, "period_ms": 10, "offset": 0} for tid in range(3)]
+                       + [{"task_id": 3, "period_ms": 10, "offset": 6}],
+                       wcet={0: 1500, 1: 1500, 2: 1500, 3: 100})
+    result = ready_queue_depth(project)
+    assert result["method"] == "wcet"
+    assert result["depth"] >= _max_occupancy(project, 20) == 3
+    assert result["depth"] <= 4
+
+
+def test_depth_counts_one_shot_after_the_hyperperiod():
+    project = _project([{"task_id": 0, "period_ms": 4, "offset": 0}],
+                       alarms=[_alarm(tid, 30, "ONE_SHOT") for tid in (1, 2, 3)],
+                       wcet={0: 100, 1: 1500, 2: 1500, 3: 1500})
+    assert _max_occupancy(project, 40) == 3
+    result = ready_queue_depth(project)
+    assert result["depth"] >= 3 and result["profiled"]
+
+
+def test_depth_is_an_upper_bound():
+    rng = random.Random(11)
+    checked = 0
+    for _ in range(150):
+        n = rng.randint(1, 5)
+        schedule = [{"task_id": rng.randrange(n), "period_ms": rng.choice([2, 3, 4, 6, 12]),
+                     "offset": rng.randrange(12)} for _ in range(rng.randint(1, 6))]
+        alarms = [_alarm(rng.randrange(n), rng.choice([4, 6, 30]), rng.choice(["CYCLIC", "ONE_SHOT"]))
+                  for _ in range(rng.randint(0, 2))]
+        wcet = {tid: rng.choice([100, 400, 900, 1500]) for tid in range(n)}
+        project = _project(schedule, alarms, wcet)
+        result = ready_queue_depth(project)
+        if result["overload"]:
+            continue
+        h = analyze_project(project)["hyperperiod_ticks"]
+        assert result["depth"] >= _max_occupancy(project, 2 * h), project
+        checked += 1
+    assert checked > 50
+
+
+def test_depth_overload_no_activations_and_long_hyperperiod():
+    overload = _project([{"task_id": 0, "period_ms": 2, "offset": 0}], wcet={0: 2000})
+    result = ready_queue_depth(overload)
+    assert result["overload"] and result["depth"] is None
+
+    assert ready_queue_depth(_project([]))["depth"] == 0
+
+    long = _project([{"task_id": 0, "period_ms": 1009, "offset": 0},
+                     {"task_id": 1, "period_ms": 1013, "offset": 0}], wcet={0: 1, 1: 1})
+    result = ready_queue_depth(long, max_ticks=1000)
+    assert not result["profiled"] and result["depth"] is None
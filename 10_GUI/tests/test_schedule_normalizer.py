@@ -0,0 +1,74 @@
+# tests/test_schedule_normalizer.py
+#
+# Normalizzazione della schedule table: un'entry e' tolta solo se ogni sua
+# attivazione coincide con quella di un'entry mantenuta dello stesso task.
+
+import random
+
+from schedule_normalizer import normalize_schedule, normalized_project
+
+
+def _entry(task_id, period_ms, offset=0):
+    return {"task_id": task_id, "task_name": f"T{task_id}", "period_ms": period_ms, "offset": offset}
+
+
+def _release_ticks(entry, horizon):
+    """Tick delle attivazioni: il contatore parte da offset e scade a periodo."""
+    period, offset = entry["period_ms"], entry["offset"]
+    return {t for t in range(1, horizon + 1) if (t + offset) % period == 0}
+
+
+def test_duplicates_and_harmonics_are_merged():
+    entries = [_entry(0, 10), _entry(0, 20), _entry(0, 10), _entry(1, 20)]
+    kept, merges = normalize_schedule(entries)
+    assert kept == [entries[0], entries[3]]
+    assert [(m["removed"], m["kept"], m["reason"]) for m in merges] == [
+        (1, 0, "harmonic"),
+        (2, 0, "duplicate"),
+    ]
+    assert merges[0]["message"].startswith("row 2 (T0, 20 ms) merged into row 1 (T0, 10 ms)")
+
+
+def test_harmonic_with_incompatible_phase_is_kept():
+    entries = [_entry(0, 10), _entry(0, 20, offset=5), _entry(0, 20, offset=10)]
+    kept, merges = normalize_schedule(entries)
+    assert kept == entries[:2]
+    assert [(m["removed"], m["kept"]) for m in merges] == [(2, 0)]
+
+
+def test_periods_are_compared_in_ticks():
+    entries = [_entry(0, 2), _entry(0, 3)]
+    assert normalize_schedule(entries, tick_ms=1.0) == (entries, [])
+    # con un tick di 3 ms entrambe valgono 1 tick
+    kept, merges = normalize_schedule(entries, tick_ms=3.0)
+    assert kept == [entries[0]] and merges[0]["reason"] == "duplicate"
+
+
+def test_nothing_to_merge_returns_the_same_list():
+    entries = [_entry(0, 10), _entry(1, 10), _entry(2, 0), _entry(2, 0)]
+    assert normalize_schedule(entries)[0] is entries
+
+
+def test_removed_entries_only_release_on_kept_ticks():
+    rng = random.Random(3)
+    horizon = 240
+    for _ in range(300):
+        entries = [_entry(rng.randrange(3), rng.choice([1, 2, 3, 4, 6, 8, 12, 24]), rng.randrange(24))
+                   for _ in range(rng.randint(1, 8))]
+        kept, merges = normalize_schedule(entries)
+        assert len(kept) + len(merges) == len(entries)
+        for task_id in {e["task_id"] for e in entries}:
+            before = set().union(*(_release_ticks(e, horizon) for e in entries if e["task_id"] == task_id))
+            after = set().union(*(_release_ticks(e, horizon) for e in kept if e["task_id"] == task_id))
+            assert before == after
+
+
+def test_normalized_project_is_opt_in_and_copies():
+    schedule = [_entry(0, 10), _entry(0, 10)]
+    project = {"os": {"tick_ms": "1"}, "schedule": schedule}
+    assert normalized_project(project) == (project, [])
+
+    project["normalize_schedule"] = True
+    normalized, merges = normalized_project(project)
+    assert normalized["schedule"] == [schedule[0]] and len(merges) == 1
+    assert project["schedule"] is schedule and len(schedule) == 2
@@ -0,0 +1,147 @@
+# tests/test_scheduler_simulator.py
+#
+# simulate_project (blocchi vettoriali + cluster esatti + regime periodico)
+# confrontato con un simulatore di riferimento ingenuo: una sola coda a
+# priorita' su tutto l'orizzonte, un'attivazione alla volta.
+
+import heapq
+import random
+
+import pytest
+
+from schedule_analysis import collect_releases, task_wcet_us
+from scheduler_simulator import simulate_project, CHUNK_TICKS
+
+
+def reference_simulation(project, ticks):
+    """{task id: [attivazioni, somma, min, max dei tempi di risposta in us]}"""
+    rel = collect_releases(project)
+    tick_us = rel["tick_ms"] * 1000.0
+    wcet = task_wcet_us(project["tasks"])
+    prio = {int(t["id"]): int(t["priority"]) for t in project["tasks"]}
+    task_ids = rel["task_id"].tolist() + rel["once_task_id"].tolist()
+
+    jobs = []
+    for k, (period, phase) in enumerate(zip(rel["period"].tolist(), rel["offset"].tolist())):
+        jobs += [(t, k) for t in range(phase, ticks, period)]
+    n_periodic = rel["period"].size
+    for j, t in enumerate(rel["once_tick"].tolist()):
+        if t < ticks:
+            jobs.append((t, n_periodic + j))
+    # stesso tick: priorita' piu' alta prima, poi ordine della sorgente
+    jobs.sort(key=lambda job: (job[0], -prio.get(task_ids[job[1]], 1), job[1]))
+
+    stats = {}
+    ready = []
+    now = 0.0
+    i = 0
+    while i < len(jobs) or ready:
+        if not ready:
+            now = max(now, jobs[i][0] * tick_us)
+        # le attivazioni del tick in cui la CPU si libera entrano prima
+        while i < len(jobs) and jobs[i][0] * tick_us <= now:
+            heapq.heappush(ready, (-prio.get(task_ids[jobs[i][1]], 1), i))
+            i += 1
+        _, j = heapq.heappop(ready)
+        tick, source = jobs[j]
+        tid = task_ids[source]
+        now += wcet.get(tid, 0.0)
+        response = now - tick * tick_us
+        entry = stats.setdefault(tid, [0, 0.0, float("inf"), 0.0])
+        entry[0] += 1
+        entry[1] += response
+        entry[2] = min(entry[2], response)
+        entry[3] = max(entry[3], response)
+    return stats
+
+
+def random_project(rng):
+    """WCET multipli del tick / mezzo tick: molte fini esattamente su un tick."""
+    n = rng.randint(1, 6)
+    tasks = [
+        {"id": str(i), "name": f"Task_{i}", "priority": str(rng.randint(1, 4)),
+         "wcet_us": str(rng.choice([0, 250, 500, 1000, 2000, 3000]))}
+        for i in range(n)
+    ]
+    schedule = [
+        {"task_id": rng.randrange(n), "period_ms": rng.choice([1, 2, 3, 4, 6, 8, 12]),
+         "offset": rng.randrange(12)}
+        for _ in range(rng.randint(1, 6))
+    ]
+    alarms = [
+        {"alarm_id": i, "alarm_type": rng.choice(["CYCLIC", "ONE_SHOT"]),
+         "alarm_action": "ACTIVATE_TASK", "period_ms": rng.choice([3, 4, 7, 9]),
+         "task_id": rng.randrange(n)}
+        for i in range(rng.randint(0, 3))
+    ]
+    return {"os": {"tick_ms": "1"}, "tasks": tasks, "schedule": schedule, "alarms": alarms}
+
+
+def _check_against_reference(project, ticks, chunk_ticks) -> bool:
+    """Stesse statistiche per task del riferimento; False se in sovraccarico."""
+    result = simulate_project(project, ticks=ticks, chunk_ticks=chunk_ticks)
+    if result["overload"]:
+        return False
+    expected = reference_simulation(project, ticks)
+    got = {t["id"]: t for t in result["tasks"]}
+    assert set(got) == set(expected)
+    for tid, (count, total, low, high) in expected.items():
+        task = got[tid]
+        assert task["activations"] == count, (project, chunk_ticks, tid)
+        assert task["mean_response_ms"] * count * 1000.0 == pytest.approx(total, abs=1e-6)
+        assert task["min_response_ms"] * 1000.0 == pytest.approx(low, abs=1e-6)
+        assert task["max_response_ms"] * 1000.0 == pytest.approx(high, abs=1e-6)
+    return True
+
+
+@pytest.mark.parametrize("chunk_ticks", [1, 3, 48, CHUNK_TICKS])
+def test_random_projects_match_reference(chunk_ticks):
+    rng = random.Random(7)
+    checked = 0
+    for _ in range(300):
+        checked += _check_against_reference(random_project(rng), 200, chunk_ticks)
+    assert checked > 100
+
+
+def test_job_ending_on_tick_lets_that_tick_releases_go_first():
+    # T1 (alta priorita') tiene la CPU occupata al 100%: ogni volta che
+    # finisce, proprio su un tick, e' gia' pronta un'altra attivazione di
+    # T1 e il task a bassa priorita' T0 (WCET 0) non parte mai
+    project = {
+        "os": {"tick_ms": "1"},
+        "tasks": [
+            {"id": "0", "name": "T0", "priority": "2", "wcet_us": "0"},
+            {"id": "1", "name": "T1", "priority": "3", "wcet_us": "2000"},
+        ],
+        "schedule": [
+            {"task_id": 1, "period_ms": 6, "offset": 4},
+            {"task_id": 0, "period_ms": 1, "offset": 10},
+        ],
+        "alarms": [
+            {"alarm_id": 0, "alarm_type": "CYCLIC", "alarm_action": "ACTIVATE_TASK",
+             "period_ms": 3, "task_id": 1},
+        ],
+    }
+    for chunk_ticks in (3, 6, CHUNK_TICKS):
+        assert _check_against_reference(project, 60, chunk_ticks)
+
+
+def test_repeated_steady_state_drains_deferred_activations():
+    project = {
+        "os": {"tick_ms": "1"},
+        "tasks": [
+            {"id": "0", "name": "T0", "priority": "3", "wcet_us": "1000"},
+            {"id": "1", "name": "T1", "priority": "1", "wcet_us": "1000"},
+        ],
+        "schedule": [
+            {"task_id": 1, "period_ms": 6, "offset": 5},
+            {"task_id": 0, "period_ms": 4, "offset": 2},
+            {"task_id": 1, "period_ms": 6, "offset": 3},
+            {"task_id": 0, "period_ms": 5, "offset": 1},
+            {"task_id": 1, "period_ms": 5, "offset": 5},
+        ],
+        "alarms": [],
+    }
+    result = simulate_project(project, ticks=240, chunk_ticks=60)
+    assert result["repeated_ticks"] > 0
+    assert _check_against_reference(project, 240, 60)
@@ -0,0 +1,34 @@
+# tests/test_startup_budget.py
+#
+# Budget di avvio (startup_budget): lettura di python -X importtime e
+# confronto con il budget (la misura vera apre la finestra: non qui).
+
+from startup_budget import check_budget, parse_importtime
+
+IMPORTTIME = """\
+import time: self [us] | cumulative | imported package
+import time:       120 |        120 |   _io
+import time:      2500 |       4100 |     PySide6.QtCore
+import time:       800 |       5000 |   pages.page_tasks
+import time:      3000 |      12000 | wizard
+some other stderr line
+"""
+
+
+def test_parse_importtime():
+    imports = parse_importtime(IMPORTTIME)
+    assert [i["module"] for i in imports] == ["_io", "PySide6.QtCore", "pages.page_tasks", "wizard"]
+    assert [i["depth"] for i in imports] == [1, 2, 1, 0]
+    assert imports[-1]["self_ms"] == 3.0 and imports[-1]["cumulative_ms"] == 12.0
+
+
+def test_check_budget():
+    results = {"window_ms": 450.0, "import_ms": 120.0, "imports": parse_importtime(IMPORTTIME)}
+    assert check_budget(results, {"window_ms": 500.0, "import_ms": 150.0}) == []
+
+    problems = check_budget(dict(results, window_ms=600.0),
+                            {"window_ms": 500.0, "deferred_modules": ["wizard", "numpy"]})
+    assert problems == [
+        "time to window: 600.0 ms over the 500.0 ms budget",
+        "'wizard' is imported before the window opens",
+    ]
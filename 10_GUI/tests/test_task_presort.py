@@ -0,0 +1,55 @@
+# tests/test_task_presort.py
+#
+# Ordinamento di Tasks[] per priorita' in generazione e scelta di
+# SORT_ALGORITHM / SORT_OPTION (os_task_cfg_generator.select_sort_config).
+
+import re
+
+from os_task_cfg_generator import INSERTION_SORT_MAX_TASKS, select_sort_config
+from project_generator import generate_project
+
+
+def _tasks(priorities):
+    return [{"id": str(i), "name": f"Task_{i}", "priority": str(p)} for i, p in enumerate(priorities)]
+
+
+def test_sort_config():
+    small = select_sort_config(_tasks([1, 3, 2]))
+    assert small["algorithm"] == "INSERTION_SORT" and not small["presorted"]
+    assert small["option"] == "SORT_INIT_ONLY"
+
+    many = _tasks([i % 5 for i in range(INSERTION_SORT_MAX_TASKS + 1)])
+    assert select_sort_config(many)["algorithm"] == "MERGE_SORT"
+    assert select_sort_config(many, presort=True)["algorithm"] == "INSERTION_SORT"
+
+    # gia' in ordine decrescente (o senza task): niente da ordinare
+    in_order = select_sort_config(_tasks(range(40, 0, -1)))
+    assert in_order["algorithm"] == "INSERTION_SORT" and in_order["presorted"]
+    assert select_sort_config([])["presorted"]
+
+
+def _generated(tmp_path, tasks, presort):
+    project = {"os": {"tick_ms": "1", "scheduler_freq": "1000", "ready_queue": "10",
+                      "presort_tasks": presort},
+               "tasks": tasks, "schedule": [], "alarms": []}
+    generate_project(project, output_dir=str(tmp_path))
+    os_cfg = (tmp_path / "os_cfg.h").read_text()
+    algorithm = re.search(r"#define\s+SORT_ALGORITHM\s+(\w+)", os_cfg).group(1)
+    option = re.search(r"#define\s+SORT_OPTION\s+(\w+)", os_cfg).group(1)
+    rows = re.findall(r"\{(Task_\d+)_ID,\s+Task_\d+,\s+IDLE,\s+(\d+)\}", (tmp_path / "os_task_cfg.c").read_text())
+    return algorithm, option, rows
+
+
+def test_presorted_tasks_array(tmp_path):
+    priorities = [2, 5, 1, 5, 3] * 5
+    tasks = _tasks(priorities)
+
+    algorithm, option, rows = _generated(tmp_path / "plain", tasks, presort=False)
+    assert (algorithm, option) == ("MERGE_SORT", "SORT_INIT_ONLY")
+    assert [int(p) for _, p in rows] == priorities
+
+    algorithm, _, rows = _generated(tmp_path / "presorted", tasks, presort=True)
+    assert algorithm == "INSERTION_SORT"
+    # priorita' decrescente, a parita' l'ordine della tabella
+    expected = sorted(range(len(tasks)), key=lambda i: -priorities[i])
+    assert [name for name, _ in rows] == [f"Task_{i}" for i in expected]
@@ -0,0 +1,62 @@
+# tests/test_tick_advisor.py
+#
+# Consiglio sul tick OS (tick_advisor) e riscalatura del progetto.
+
+from schedule_analysis import collect_releases
+from tick_advisor import advise_tick, rescale_project
+
+
+def _project(periods, offsets=None, alarms=(), tick_ms="1", freq="1000"):
+    offsets = offsets or [0] * len(periods)
+    schedule = [{"task_id": i, "period_ms": p, "offset": off}
+                for i, (p, off) in enumerate(zip(periods, offsets))]
+    alarms = [{"alarm_type": "ONE_SHOT", "alarm_action": "ACTIVATE_TASK",
+               "period_ms": p, "task_id": 0} for p in alarms]
+    return {"os": {"tick_ms": tick_ms, "scheduler_freq": freq},
+            "tasks": [], "schedule": schedule, "alarms": alarms}
+
+
+def test_longest_exact_tick():
+    advice = advise_tick(_project([10, 20, 30]))
+    assert advice["tick_ms"] == 10 and advice["gcd_ms"] == 10
+    assert advice["timer_counts"] == 10
+    assert advice["rate_hz"] == 100.0 and advice["saving"] == 0.9
+
+
+def test_offsets_and_alarms_must_stay_exact():
+    assert advise_tick(_project([10, 20], offsets=[0, 5]))["tick_ms"] == 5
+    assert advise_tick(_project([10, 20], alarms=[4]))["tick_ms"] == 2
+    # offset in tick: con un tick di 2 ms, 3 tick = 6 ms
+    assert advise_tick(_project([12, 24], offsets=[3, 0], tick_ms="2"))["tick_ms"] == 6
+    # offset non intero in ms: solo il tick di 1 ms
+    assert advise_tick(_project([10], offsets=[1], tick_ms="0.5"))["tick_ms"] == 1
+
+
+def test_tick_limited_by_the_timer():
+    advice = advise_tick(_project([100], freq="10000000"))
+    assert advice["tick_ms"] == 5 and advice["timer_counts"] == 50_000
+    assert "limited to 5 ms by the timer" in advice["reason"]
+    # 300 Hz: conteggi interi solo con tick multipli di 10 ms
+    assert advise_tick(_project([40], freq="300"))["timer_counts"] == 12
+    assert advise_tick(_project([7], freq="300"))["tick_ms"] is None
+
+
+def test_no_advice():
+    assert advise_tick(_project([]))["tick_ms"] is None
+    assert advise_tick(_project([10], freq="0"))["tick_ms"] is None
+
+
+def test_rescale_keeps_every_release_instant():
+    project = _project([10, 20, 30], offsets=[0, 10, 20], alarms=[40])
+    advice = advise_tick(project)
+    assert advice["tick_ms"] == 10
+    rescaled = rescale_project(project, advice["tick_ms"])
+
+    assert rescaled["os"]["tick_ms"] == "10"
+    assert [e["offset"] for e in rescaled["schedule"]] == [0, 1, 2]
+    assert project["schedule"][1]["offset"] == 10 and project["os"]["tick_ms"] == "1"
+
+    before, after = collect_releases(project), collect_releases(rescaled)
+    assert (before["period"] == after["period"] * 10).all()
+    assert (before["offset"] == after["offset"] * 10).all()
+    assert (before["once_tick"] == after["once_tick"] * 10).all()
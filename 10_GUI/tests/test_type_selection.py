@@ -0,0 +1,33 @@
+# tests/test_type_selection.py
+#
+# Controllo dei valori emessi con un cast (type_selection.check_cast) e
+# avvisi di os_cfg.h.
+
+from project_generator import generate_project
+from type_selection import check_cast
+
+
+def test_check_cast():
+    warnings = []
+    check_cast(warnings, "os_cfg.h", "A", "65535", "uint16_t")
+    check_cast(warnings, "os_cfg.h", "B", " 255 ", "uint8_t")
+    assert warnings == []
+
+    check_cast(warnings, "os_cfg.h", "C", 65536, "uint16_t")
+    check_cast(warnings, "os_cfg.h", "D", "-1", "uint8_t")
+    check_cast(warnings, "os_cfg.h", "E", "0.5", "uint32_t")
+    assert warnings[0] == ("os_cfg.h: C = 65536 non sta in uint16_t (0..65535): "
+                           "il cast lo tronca a 0")
+    assert "tronca a 255" in warnings[1]
+    assert warnings[2] == "os_cfg.h: E = '0.5' non e' un intero valido per uint32_t"
+
+    check_cast(None, "os_cfg.h", "F", "x", "uint8_t")
+
+
+def test_os_cfg_warns_about_truncated_values(tmp_path):
+    project = {"os": {"scheduler_freq": "100000", "tick_ms": "1", "ready_queue": "10"},
+               "tasks": [], "schedule": [], "alarms": []}
+    warnings = []
+    generate_project(project, output_dir=str(tmp_path), warnings=warnings)
+    assert len(warnings) == 1 and "SCHED_TIMER_FREQ_HZ = 100000" in warnings[0]
+    assert "((uint16_t)(100000))" in (tmp_path / "os_cfg.h").read_text()
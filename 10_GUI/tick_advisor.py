@@ -0,0 +1,148 @@
+# tick_advisor.py
+#
+# Consiglio sul periodo del tick OS (DESIRED_SCHED_PERIOD_MS): il tick
+# piu' lungo che lascia esatti tutti i periodi della schedule table e degli
+# allarmi (e gli offset gia' configurati), compatibile con il
+# timer dello scheduler:
+#   - SCHED_TIMER_FREQ_HZ * tick / 1000 deve essere un numero intero di
+#     conteggi del timer, al massimo TIMER_MAX_COUNTS (timer a 16 bit)
+#   - il tick viene emesso come ((uint16_t)(tick)) in os_cfg.h
+# Con tutti i periodi multipli di 10 ms, un tick di 10 ms invece di 1 ms
+# divide per dieci gli interrupt del tick.
+# Questo modulo NON deve importare PySide6.
+
+import math
+from typing import Dict, List
+
+from generator_utils import as_int, ms_to_ticks, parse_tick_ms, project_tick_ms
+from type_selection import UINT_MAX
+
+
+# Conteggi massimi del timer dello scheduler per un tick (timer a 16 bit)
+TIMER_MAX_COUNTS = 0xFFFF
+
+
+def _periods_ms(project: Dict) -> List[int]:
+    """
+    Periodi (ms, > 0) della schedule table e degli allarmi: anche il
+    timeout di un allarme ONE_SHOT e' convertito in tick e deve restare esatto.
+    """
+    periods = [as_int(e.get("period_ms", 0)) for e in project.get("schedule", []) or []]
+    periods += [as_int(a.get("period_ms", 0)) for a in project.get("alarms", []) or []]
+    return [p for p in periods if p > 0]
+
+
+def _divisors_desc(n: int):
+    """Divisori di n in ordine decrescente."""
+    small, large = [], []
+    for d in range(1, math.isqrt(n) + 1):
+        if n % d == 0:
+            small.append(d)
+            if d != n // d:
+                large.append(n // d)
+    return large + small[::-1]
+
+
+def advise_tick(project: Dict) -> Dict:
+    """
+    project: dict con il layout di save_project_as
+
+    Ritorna:
+        {"current_ms": tick attuale, "tick_ms": tick consigliato (int, ms),
+         "gcd_ms": mcd di periodi e offset (ms), "timer_counts": conteggi
+         del timer per il tick consigliato, "current_rate_hz", "rate_hz":
+         interrupt del tick al secondo, "saving": frazione di interrupt
+         risparmiati (0..1), "reason": str}
+    tick_ms e' None se non c'e' un tick valido (frequenza del timer non
+    valida o nessun divisore compatibile).
+    """
+    os_cfg = project.get("os", {}) or {}
+    current = parse_tick_ms(os_cfg.get("tick_ms", "1"))
+    freq = as_int(os_cfg.get("scheduler_freq", "1000"))
+    result = {
+        "current_ms": current,
+        "tick_ms": None,
+        "gcd_ms": 0,
+        "timer_counts": 0,
+        "current_rate_hz": 1000.0 / current,
+        "rate_hz": 0.0,
+        "saving": 0.0,
+        "reason": "",
+    }
+    if freq <= 0:
+        result["reason"] = f"invalid scheduler timer frequency '{os_cfg.get('scheduler_freq')}'"
+        return result
+
+    periods = _periods_ms(project)
+    if not periods:
+        result["reason"] = "no periodic events: the tick period is not constrained"
+        return result
+
+    # gli offset sono in tick: in ms valgono offset * tick attuale e devono
+    # restare esatti anche col nuovo tick
+    g = 0
+    for p in periods:
+        g = math.gcd(g, p)
+    for e in project.get("schedule", []) or []:
+        offset_ms = as_int(e.get("offset", 0) or 0) * current
+        # un offset non intero in ms si puo' rappresentare solo col tick di 1 ms
+        g = math.gcd(g, int(offset_ms)) if offset_ms == int(offset_ms) else 1
+    result["gcd_ms"] = g
+
+    for t in _divisors_desc(g):
+        if t > UINT_MAX["uint16_t"] or (freq * t) % 1000:
+            continue
+        counts = freq * t // 1000
+        if counts > TIMER_MAX_COUNTS:
+            continue
+        result.update(tick_ms=t, timer_counts=counts, rate_hz=1000.0 / t,
+                      saving=max(0.0, 1.0 - current / t))
+        if t < g:
+            result["reason"] = (
+                f"periods share {g} ms, limited to {t} ms by the timer "
+                f"({freq} Hz, at most {TIMER_MAX_COUNTS} counts per tick)"
+            )
+        else:
+            result["reason"] = f"greatest common divisor of all periods and offsets: {g} ms"
+        return result
+
+    result["reason"] = f"no common divisor of the periods ({g} ms) fits the {freq} Hz timer"
+    return result
+
+
+def rescale_project(project: Dict, tick_ms: int) -> Dict:
+    """
+    Copia di project con os.tick_ms = tick_ms. I periodi sono in ms e
+    vengono convertiti in tick dai generatori; gli offset della schedule
+    table sono in tick e vengono riscalati (old tick / new tick), in modo
+    che ogni attivazione resti allo stesso istante.
+    Il dict originale non viene modificato.
+    """
+    current = project_tick_ms(project)
+    schedule = []
+    for e in project.get("schedule", []) or []:
+        offset = as_int(e.get("offset", 0) or 0)
+        schedule.append(dict(e, offset=ms_to_ticks(int(round(offset * current)), tick_ms)))
+    return dict(
+        project,
+        os=dict(project.get("os", {}) or {}, tick_ms=str(tick_ms)),
+        schedule=schedule,
+    )
+
+
+def format_tick_advice(advice: Dict) -> str:
+    if advice["tick_ms"] is None:
+        return f"tick advisor: {advice['reason']}"
+    lines = [
+        f"tick advisor: {advice['tick_ms']} ms "
+        f"(current {advice['current_ms']:g} ms, {advice['timer_counts']} timer counts per tick)",
+        f"  {advice['reason']}",
+    ]
+    if advice["saving"] > 0:
+        lines.append(
+            f"  tick interrupts: {advice['current_rate_hz']:g}/s -> {advice['rate_hz']:g}/s "
+            f"({advice['saving']:.0%} fewer)"
+        )
+    else:
+        lines.append("  the current tick is already the longest exact one")
+    return "\n".join(lines)
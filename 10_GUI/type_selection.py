@@ -0,0 +1,36 @@
+# type_selection.py
+#
+# Tipi interi senza segno del C (uint8_t / uint16_t / uint32_t) e controllo
+# dei valori emessi con un cast, es. ((uint16_t)(...)) in os_cfg.h: un valore
+# fuori range verrebbe troncato in silenzio dal compilatore.
+# Questo modulo NON deve importare PySide6.
+
+from typing import List, Optional
+
+
+# Valore massimo dei tipi senza segno
+UINT_MAX = {
+    "uint8_t": 0xFF,
+    "uint16_t": 0xFFFF,
+    "uint32_t": 0xFFFFFFFF,
+}
+
+
+def check_cast(warnings: Optional[List[str]], file_name: str, define: str,
+               value, ctype: str) -> None:
+    """
+    Aggiunge a warnings (se non None) un messaggio se value, emesso come
+    ((ctype)(value)), non e' un intero nel range di ctype.
+    """
+    if warnings is None:
+        return
+    try:
+        number = int(str(value).strip())
+    except ValueError:
+        warnings.append(f"{file_name}: {define} = '{value}' non e' un intero valido per {ctype}")
+        return
+    if not 0 <= number <= UINT_MAX[ctype]:
+        warnings.append(
+            f"{file_name}: {define} = {number} non sta in {ctype} "
+            f"(0..{UINT_MAX[ctype]}): il cast lo tronca a {number & UINT_MAX[ctype]}"
+        )
@@ -1,29 +1,64 @@
 # wizard.py
+#
+# Finestra principale. Per aprire la finestra il prima possibile qui si
+# importano solo Qt e i moduli che servono alla pagina OS: i generatori
+# (project_generator, footprint, ...), le analisi (schedule_analysis, che
+# carica NumPy), json e pathlib vengono importati alla prima Save / Load /
+# Generate o alla prima visita di una pagina. Il budget del tempo di avvio
+# e' controllato da startup_budget.py.
 
-from pathlib import Path
-
-import json
+import time
 
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QStackedWidget, QVBoxLayout, QHBoxLayout,
     QPushButton, QProgressBar, QMessageBox, QFileDialog
 )
 
-from PySide6.QtCore import QTimer
+from PySide6.QtCore import QThreadPool, QTimer, Signal
+
+from pages.task_catalog import TaskCatalog
+
+from project_model import ProjectModel
+from instrumentation import Instrumentation, env_report_path
+
 
-from pages.page_os_configuration import OSConfigurationPage
-from pages.page_task_configuration import TaskConfigurationPage
-from pages.page_schedule_table_configuration import ScheduleTableConfigurationPage
-from pages.page_alarm_configuration import AlarmConfigurationPage
-from pages.page_summary import SummaryPage
+# Caricamento progressivo di un progetto: blocchi di righe dimensionati
+# per durare circa LOAD_SLICE_MS (al massimo LOAD_BATCH_ROWS righe), poi la
+# GUI torna al ciclo degli eventi
+LOAD_SLICE_MS = 40.0
+LOAD_BATCH_ROWS = 500
 
-from os_cfg_generator import generate_os_cfg
-from os_task_cfg_generator import generate_os_task_cfg
-from os_sched_tbl_cfg_generator import generate_os_sched_tbl_cfg
-from os_alarms_cfg_generator import generate_os_alarms_cfg
+# Pagine del wizard, nell'ordine dello stack
+PAGE_OS, PAGE_TASKS, PAGE_SCHEDULE, PAGE_ALARMS, PAGE_SUMMARY = range(5)
+PAGE_COUNT = 5
+
+
+def _create_page(index: int):
+    """
+    Moduli delle pagine importati alla creazione (la Summary importa
+    footprint e quindi i generatori). Import espliciti, non importlib:
+    PyInstaller li trova analizzando il codice.
+    """
+    if index == PAGE_OS:
+        from pages.page_os_configuration import OSConfigurationPage
+        return OSConfigurationPage()
+    if index == PAGE_TASKS:
+        from pages.page_task_configuration import TaskConfigurationPage
+        return TaskConfigurationPage()
+    if index == PAGE_SCHEDULE:
+        from pages.page_schedule_table_configuration import ScheduleTableConfigurationPage
+        return ScheduleTableConfigurationPage()
+    if index == PAGE_ALARMS:
+        from pages.page_alarm_configuration import AlarmConfigurationPage
+        return AlarmConfigurationPage()
+    from pages.page_summary import SummaryPage
+    return SummaryPage()
 
 
 class RTOSWizard(QMainWindow):
+    # emesso quando tutte le pagine di un progetto caricato sono pronte
+    project_loaded = Signal()
+
     def __init__(self):
         super().__init__()
         self.setWindowTitle("CHAOS Configuration Wizard")
@@ -35,27 +70,37 @@ class RTOSWizard(QMainWindow):
         menubar = self.menuBar()
         file_menu = menubar.addMenu("&File")
 
-        act_save_as = file_menu.addAction("Save Project as...")
-        act_load = file_menu.addAction("Load Project")
+        self.act_save_as = file_menu.addAction("Save Project as...")
+        self.act_load = file_menu.addAction("Load Project")
+
+        self.act_save_as.triggered.connect(self.save_project_as)
+        self.act_load.triggered.connect(self.load_project)
 
-        act_save_as.triggered.connect(self.save_project_as)
-        act_load.triggered.connect(self.load_project)
+        # Misure per fase (caricamento, pagine, generatori). Con
+        # CHAOS_PERF_REPORT=<file> il report JSON viene scritto da solo
+        # dopo ogni caricamento/generazione e la memoria e' tracciata.
+        self.instrumentation = Instrumentation(trace_memory=env_report_path() is not None)
+
+        file_menu.addSeparator()
+        self.act_trace_memory = file_menu.addAction("Trace Memory Usage")
+        self.act_trace_memory.setCheckable(True)
+        self.act_trace_memory.setChecked(self.instrumentation.trace_memory)
+        self.act_trace_memory.toggled.connect(self._set_trace_memory)
+        act_perf_report = file_menu.addAction("Save Performance Report...")
+        act_perf_report.triggered.connect(self.save_perf_report)
         
         self.stack = QStackedWidget()
 
-        # Pagine
-        self.page_os = OSConfigurationPage()
-        self.page_tasks = TaskConfigurationPage()
-        self.page_schedule = ScheduleTableConfigurationPage()
-        self.page_alarms = AlarmConfigurationPage()
-        self.page_summary = SummaryPage()
+        # Pagine create alla prima visita (vedi page()): lo stack parte con
+        # segnaposto vuoti e i dati delle pagine non ancora create restano
+        # nel modello del progetto
+        self.project_model = ProjectModel()
+        self._pages = [None] * PAGE_COUNT
+        for _ in range(PAGE_COUNT):
+            self.stack.addWidget(QWidget())
 
-        # Aggiunta pagine allo stack
-        self.stack.addWidget(self.page_os)
-        self.stack.addWidget(self.page_tasks)
-        self.stack.addWidget(self.page_schedule)
-        self.stack.addWidget(self.page_alarms)
-        self.stack.addWidget(self.page_summary)
+        # Catalogo dei task condiviso da Schedule e Alarms
+        self.task_catalog = TaskCatalog(self)
 
         # Pulsanti di navigazione
         nav_layout = QHBoxLayout()
@@ -65,10 +110,16 @@ class RTOSWizard(QMainWindow):
         self.btn_prev.clicked.connect(self.go_prev)
         self.btn_next.clicked.connect(self.go_next)
 
+        # Annulla la generazione in corso (visibile solo durante "Generate")
+        self.btn_cancel = QPushButton("Cancel")
+        self.btn_cancel.clicked.connect(self.cancel_generation)
+        self.btn_cancel.setVisible(False)
+
         nav_layout.addWidget(self.btn_prev)
+        nav_layout.addWidget(self.btn_cancel)
         nav_layout.addWidget(self.btn_next)
 
-        # Progress bar per animazione "Generate"
+        # Progress bar della generazione (file generati / totale)
         self.progress_bar = QProgressBar()
         self.progress_bar.setRange(0, 100)
         self.progress_bar.setVisible(False)
@@ -81,13 +132,97 @@ class RTOSWizard(QMainWindow):
 
         self.setCentralWidget(container)
 
-        # Stato interno per animazione generazione
-        self._generation_done = False
-        self._progress_value = 0
-        self._progress_timer = None
-
+        # Worker della generazione in corso (None se ferma)
+        self._worker = None
+
+        # Caricamento progressivo di un progetto (vedi load_project):
+        # _pages_ready = pagine gia' riempite, le successive non si aprono
+        self._loading = False
+        self._loader = None
+        self._load_steps = None
+        self._pages_ready = self.stack.count()
+        # record "load_project" del report e file in caricamento
+        self._load_record = None
+        self._load_filename = None
+
+        # Profondita' massima della ready queue (None se non calcolata)
+        self._ready_queue_depth = None
+        # analisi -> (analysis_key, risultato), vedi _cached_analysis
+        self._analysis_cache = {}
+
+        self.page(PAGE_OS)
         self.update_buttons()
 
+    # ------------------------------------------------------------------
+    # Pagine create su richiesta
+    # ------------------------------------------------------------------
+    def page(self, index: int, fill: bool = True):
+        """
+        Pagina index dello stack, creata alla prima richiesta.
+        fill: riempie la pagina appena creata con i dati del modello del
+        progetto (False se il chiamante la riempie da se', es. load_project).
+        """
+        page = self._pages[index]
+        if page is not None:
+            return page
+
+        page = _create_page(index)
+        self._pages[index] = page
+        if index == PAGE_OS:
+            page.btn_apply_tick.clicked.connect(self.apply_tick_advice)
+        elif index == PAGE_SCHEDULE:
+            page.set_task_catalog(self.task_catalog)
+            page.btn_optimize.clicked.connect(self.optimize_schedule_offsets)
+        elif index == PAGE_ALARMS:
+            page.set_task_catalog(self.task_catalog)
+        elif index == PAGE_SUMMARY:
+            page.cmb_target.currentIndexChanged.connect(lambda _: self.update_footprint())
+        if fill:
+            self._fill_page(index)
+
+        # al posto del segnaposto, senza cambiare la pagina visibile
+        current = self.stack.currentIndex()
+        placeholder = self.stack.widget(index)
+        self.stack.removeWidget(placeholder)
+        placeholder.deleteLater()
+        self.stack.insertWidget(index, page)
+        self.stack.setCurrentIndex(current)
+        return page
+
+    def _fill_page(self, index: int):
+        page = self._pages[index]
+        model = self.project_model
+        if index == PAGE_OS:
+            page.set_config(model.get("os"))
+        elif index == PAGE_TASKS:
+            page.set_tasks(model.get("tasks"))
+        elif index == PAGE_SCHEDULE:
+            # il catalogo dei task e' gia' aggiornato (uscita dalla pagina Task)
+            page.set_schedule_entries(model.get("schedule"))
+            page.normalize.setChecked(bool(model.get("normalize_schedule")))
+        elif index == PAGE_ALARMS:
+            page.set_alarms(model.get("alarms"))
+
+    @property
+    def page_os(self):
+        return self.page(PAGE_OS)
+
+    @property
+    def page_tasks(self):
+        return self.page(PAGE_TASKS)
+
+    @property
+    def page_schedule(self):
+        return self.page(PAGE_SCHEDULE)
+
+    @property
+    def page_alarms(self):
+        return self.page(PAGE_ALARMS)
+
+    @property
+    def page_summary(self):
+        return self.page(PAGE_SUMMARY)
+
     # ------------------------------------------------------------------
     # Navigazione avanti
     # ------------------------------------------------------------------
@@ -96,20 +231,18 @@ class RTOSWizard(QMainWindow):
         last = self.stack.count() - 1
 
         if idx < last:
-            # Prima di entrare in Schedule, aggiorna i task
-            if idx + 1 == 2:  # 0: OS, 1: Task, 2: Schedule
-                self.page_schedule.set_task_list(self.page_tasks.get_tasks())
-
-            # Prima di entrare in Alarms, aggiorna i task
-            if idx + 1 == 3:  # 3: Alarm Configuration
-                self.page_alarms.set_task_list(self.page_tasks.get_tasks())
+            # Uscendo dalla pagina Task aggiorna il catalogo condiviso da
+            # Schedule e Alarms (nessun effetto se i task non sono cambiati)
+            if idx == PAGE_TASKS:
+                self.task_catalog.set_tasks(self.page_tasks.get_tasks())
 
+            self.page(idx + 1)
             self.stack.setCurrentIndex(idx + 1)
             if idx + 1 == last:
                 self.update_summary()
             self.update_buttons()
         else:
-            self.start_generation_animation()
+            self.start_generation()
 
     # ------------------------------------------------------------------
     # Navigazione indietro
@@ -118,6 +251,8 @@ class RTOSWizard(QMainWindow):
         idx = self.stack.currentIndex()
         if idx > 0:
             self.stack.setCurrentIndex(idx - 1)
+            if idx - 1 == PAGE_OS:
+                self.update_os_hints()
         self.update_buttons()
 
     # ------------------------------------------------------------------
@@ -136,35 +271,49 @@ class RTOSWizard(QMainWindow):
         # Testo del pulsante "Next"
         self.btn_next.setText("Generate" if idx == last else "Next >")
 
+        # Durante un caricamento si va avanti solo sulle pagine gia' riempite
+        if self._worker is None:
+            self.btn_next.setEnabled(not self._loading or idx + 1 < self._pages_ready)
+
 
     # ------------------------------------------------------------------
     # Aggiornamento pagina Summary
     # ------------------------------------------------------------------
     def update_summary(self):
+        from os_task_cfg_generator import select_sort_config
+        from schedule_analysis import analyze_project
+        from schedule_normalizer import normalized_project
+
+        # Dati dal modello del progetto: le pagine non ancora visitate non
+        # vengono create
+        raw_project = self.collect_project()
+
         # OS Configuration
+        os_cfg = raw_project["os"]
         os_config = {
-            "scheduler_freq": self.page_os.scheduler_freq.text(),
-            "tick_ms": self.page_os.tick_ms.text()
+            "scheduler_freq": os_cfg.get("scheduler_freq", ""),
+            "tick_ms": os_cfg.get("tick_ms", "")
         }
         # Hooks
+        hooks_cfg = os_cfg.get("hooks", {})
         hooks = []
-        if self.page_os.startup_hook.isChecked():
+        if hooks_cfg.get("startup"):
             hooks.append("Startup Hook")
-        if self.page_os.shutdown_hook.isChecked():
+        if hooks_cfg.get("shutdown"):
             hooks.append("Shutdown Hook")
-        if self.page_os.pre_task_hook.isChecked():
+        if hooks_cfg.get("pre_task"):
             hooks.append("Pre-task Hook")
-        if self.page_os.post_task_hook.isChecked():
+        if hooks_cfg.get("post_task"):
             hooks.append("Post-task Hook")
-        if self.page_os.error_hook.isChecked():
+        if hooks_cfg.get("error"):
             hooks.append("Error Hook")
 
         # Number of tasks
-        num_tasks = self.page_tasks.table.rowCount()
+        num_tasks = len(raw_project["tasks"])
         # Number of schedule table events
-        num_schedule_events = self.page_schedule.table.rowCount()
+        num_schedule_events = len(raw_project["schedule"])
         # Number of alarms
-        num_alarms = self.page_alarms.table.rowCount()
+        num_alarms = len(raw_project["alarms"])
 
         self.page_summary.update_summary(
             os_config=os_config,
@@ -173,7 +322,200 @@ class RTOSWizard(QMainWindow):
             schedule=num_schedule_events,
             alarms=num_alarms
         )
+
+        # Analisi temporale: iperperiodo, utilizzo CPU, tick di picco,
+        # profondita' massima della ready queue
+        # Le analisi usano la schedule table che verra' generata (normalizzata)
+        project, merges = normalized_project(raw_project)
+        self.page_summary.update_schedule_merges(
+            len(project["schedule"]), merges, project.get("normalize_schedule", False)
+        )
+
+        presort = bool(project["os"].get("presort_tasks", False))
+        self.page_summary.update_sort_config(
+            select_sort_config(project["tasks"], presort), presort
+        )
+
+        self.update_footprint(project)
+
+        with self.instrumentation.stage("analyze_project"):
+            self.page_summary.update_analysis(self._cached_analysis(analyze_project, project))
+            self.update_ready_queue_depth(project)
+        # il tick deve restare esatto per tutte le righe (anche quelle unite)
+        self.update_tick_advice(raw_project)
+
+    # ------------------------------------------------------------------
+    # Analisi temporali nel thread GUI: limite di tick ridotto e risultato
+    # riusato finche' i dati letti dall'analisi non cambiano (le visite di
+    # Summary / OS senza modifiche non rifanno i calcoli)
+    # ------------------------------------------------------------------
+    def _cached_analysis(self, analysis, project: dict) -> dict:
+        from schedule_analysis import analysis_key, GUI_MAX_ANALYSIS_TICKS
+
+        key = analysis_key(project)
+        cached = self._analysis_cache.get(analysis.__name__)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+        result = analysis(project, max_ticks=GUI_MAX_ANALYSIS_TICKS)
+        self._analysis_cache[analysis.__name__] = (key, result)
+        return result
+
+    # ------------------------------------------------------------------
+    # Occupazione di memoria delle tabelle generate (pagina Summary,
+    # aggiornata anche al cambio del profilo di target)
+    # ------------------------------------------------------------------
+    def update_footprint(self, project: dict = None):
+        from footprint import estimate_footprint
+        from schedule_normalizer import normalized_project
+
+        if project is None:
+            project = normalized_project(self.collect_project())[0]
+        self.page_summary.update_footprint(
+            estimate_footprint(project, self.page_summary.target_profile())
+        )
+
+    # ------------------------------------------------------------------
+    # Suggerimenti della pagina OS dal progetto corrente (ready queue, tick)
+    # ------------------------------------------------------------------
+    def update_os_hints(self, project: dict = None):
+        if project is None:
+            project = self.collect_project()
+        self.update_ready_queue_depth(project)
+        self.update_tick_advice(project)
+
+    # ------------------------------------------------------------------
+    # Profondita' massima della ready queue (mostrata accanto al campo
+    # Ready Task Queue della pagina OS)
+    # ------------------------------------------------------------------
+    def update_ready_queue_depth(self, project: dict):
+        from schedule_analysis import ready_queue_depth
+        from schedule_normalizer import normalized_project
+
+        result = self._cached_analysis(ready_queue_depth, normalized_project(project)[0])
+        self._ready_queue_depth = result["depth"]
+
+        if result["overload"]:
+            note = "CPU utilization >= 100%: the queue is unbounded"
+        elif result["depth"] is None:
+            note = "hyperperiod too long to analyze here (see chaos_gen.py --tight-ready-queue)"
+        elif result["method"] == "releases":
+            note = "no WCET: each task assumed to finish in its release tick"
+        else:
+            note = ""
+        self.page_os.set_ready_queue_depth(result["depth"], note)
+
+    def _confirm_ready_queue(self) -> bool:
+        """
+        Se la Ready Task Queue e' piu' piccola della profondita' massima
+        propone di usare quest'ultima. False = generazione annullata.
+        """
+        depth = self._ready_queue_depth
+        try:
+            current = int(self.page_os.ready_queue.text().strip())
+        except ValueError:
+            return True
+        if depth is None or current >= depth:
+            return True
+
+        answer = QMessageBox.question(
+            self,
+            "Ready Task Queue",
+            f"The ready task queue ({current}) is smaller than the worst-case "
+            f"ready-queue depth ({depth}): activations may be lost at runtime.\n\n"
+            f"Use {depth} as MAX_READY_TASKS?",
+            QMessageBox.Yes | QMessageBox.No | QMessageBox.Cancel,
+        )
+        if answer == QMessageBox.Cancel:
+            return False
+        if answer == QMessageBox.Yes:
+            self.page_os.use_ready_queue_depth()
+        return True
         
+    # ------------------------------------------------------------------
+    # Tick consigliato (mostrato accanto al campo Desired OS Tick della
+    # pagina OS); "Apply" imposta il tick e riscala gli offset, che sono in tick
+    # ------------------------------------------------------------------
+    def update_tick_advice(self, project: dict):
+        from tick_advisor import advise_tick
+
+        advice = advise_tick(project)
+        if advice["tick_ms"] is None:
+            self.page_os.set_tick_advice(None, advice["reason"])
+        elif advice["saving"] > 0:
+            self.page_os.set_tick_advice(advice["tick_ms"], f"{advice['saving']:.0%} fewer tick interrupts")
+        else:
+            self.page_os.set_tick_advice(advice["tick_ms"])
+
+    def apply_tick_advice(self):
+        from tick_advisor import advise_tick, format_tick_advice, rescale_project
+
+        project = self.collect_project()
+        advice = advise_tick(project)
+        if advice["tick_ms"] is None:
+            return
+        answer = QMessageBox.question(
+            self,
+            "Desired OS Tick",
+            format_tick_advice(advice) + "\n\n"
+            f"Set the OS tick to {advice['tick_ms']} ms and rescale the schedule-table offsets?",
+            QMessageBox.Yes | QMessageBox.No,
+        )
+        if answer != QMessageBox.Yes:
+            return
+        rescaled = rescale_project(project, advice["tick_ms"])
+        self.page_os.tick_ms.setText(rescaled["os"]["tick_ms"])
+        if self._pages[PAGE_SCHEDULE] is not None:
+            self.page_schedule.set_offsets([e["offset"] for e in rescaled["schedule"]])
+        else:
+            self.project_model.set("schedule", rescaled["schedule"])
+        self.update_os_hints(rescaled)
+
+    # ------------------------------------------------------------------
+    # Offset della schedule table che distribuiscono le attivazioni sui tick
+    # ------------------------------------------------------------------
+    def optimize_schedule_offsets(self):
+        from schedule_analysis import format_offset_report, optimize_offsets, GUI_MAX_ANALYSIS_TICKS
+
+        project = self.collect_project()
+        with self.instrumentation.stage("optimize_offsets", schedule=len(project["schedule"])):
+            result = optimize_offsets(project, max_ticks=GUI_MAX_ANALYSIS_TICKS)
+        if result["optimized"]:
+            self.page_schedule.set_offsets(result["offsets"])
+        QMessageBox.information(self, "Optimize Offsets", format_offset_report(result))
+
+    # ------------------------------------------------------------------
+    # Riversa nel modello del progetto i dati delle pagine gia' create e
+    # ritorna il dict "project" (layout del file .chaos_cfg). Le pagine
+    # non ancora create non vengono costruite: i loro dati sono nel modello
+    # ------------------------------------------------------------------
+    def collect_project(self) -> dict:
+        from project_generator import project_counts
+
+        instr = self.instrumentation
+        model = self.project_model
+        pages = self._pages
+        with instr.stage("collect_project") as record:
+            if pages[PAGE_OS] is not None:
+                with instr.stage("get_config"):
+                    model.set("os", pages[PAGE_OS].get_config())
+            if pages[PAGE_TASKS] is not None:
+                with instr.stage("get_tasks") as rec:
+                    model.set("tasks", pages[PAGE_TASKS].get_tasks())
+                    rec["counts"] = {"tasks": len(model.get("tasks"))}
+            if pages[PAGE_SCHEDULE] is not None:
+                with instr.stage("get_schedule_entries") as rec:
+                    model.set("schedule", pages[PAGE_SCHEDULE].get_schedule_entries())
+                    model.set("normalize_schedule", pages[PAGE_SCHEDULE].normalize.isChecked())
+                    rec["counts"] = {"schedule": len(model.get("schedule"))}
+            if pages[PAGE_ALARMS] is not None:
+                with instr.stage("get_alarms") as rec:
+                    model.set("alarms", pages[PAGE_ALARMS].get_alarms())
+                    rec["counts"] = {"alarms": len(model.get("alarms"))}
+
+            project = model.project()
+            record["counts"] = project_counts(project)
+        return project
+
     def save_project_as(self):
         filename, _ = QFileDialog.getSaveFileName(
             self,
@@ -187,13 +529,9 @@ class RTOSWizard(QMainWindow):
         if not filename.endswith(".chaos_cfg"):
             filename += ".chaos_cfg"
 
-        project = {
-            "version": 1,
-            "os": self.page_os.get_config(),
-            "tasks": self.page_tasks.get_tasks(),
-            "schedule": self.page_schedule.get_schedule_entries(),
-            "alarms": self.page_alarms.get_alarms(),
-        }
+        import json
+
+        project = self.collect_project()
 
         try:
             with open(filename, "w", encoding="utf-8") as f:
@@ -210,169 +548,301 @@ class RTOSWizard(QMainWindow):
             "",
             "CHAOS Config (*.chaos_cfg);;All Files (*.*)",
         )
-        if not filename:
+        if not filename or self._loading or self._worker is not None:
             return
 
+        from load_worker import ProjectLoadWorker
+
+        # Lettura + parsing in background, poi le pagine vengono riempite a
+        # blocchi dal ciclo degli eventi: la finestra resta reattiva e la
+        # pagina OS e' gia' utilizzabile mentre le tabelle si riempiono
+        self._set_loading(True)
+        self.progress_bar.setRange(0, 0)
+        self.progress_bar.setFormat("Reading project...")
+        self.progress_bar.setVisible(True)
+
+        self._loader = ProjectLoadWorker(filename)
+        self._loader.signals.finished.connect(
+            lambda project, ms: self._on_project_parsed(filename, project, ms)
+        )
+        self._loader.signals.failed.connect(self._on_project_load_failed)
+        QThreadPool.globalInstance().start(self._loader)
+
+    def _set_loading(self, loading: bool):
+        self._loading = loading
+        self._pages_ready = 0 if loading else self.stack.count()
+        self.act_load.setEnabled(not loading)
+        self.act_save_as.setEnabled(not loading)
+        if not loading:
+            self._loader = None
+            self._load_steps = None
+            self.progress_bar.setVisible(False)
+        self.update_buttons()
+
+    def _on_project_load_failed(self, message: str):
+        self._set_loading(False)
+        QMessageBox.critical(self, "Load Project", f"Error loading project:\n{message}")
+
+    def _on_project_parsed(self, filename: str, project: dict, read_ms: float):
+        from project_generator import project_counts
+
+        instr = self.instrumentation
+        # fasi eseguite a blocchi: registrate con la durata totale alla fine
+        self._load_record = instr.add("load_project", read_ms, **project_counts(project))
+        instr.add("read_project_file", read_ms, parent=self._load_record)
+        self._load_filename = filename
+        self._load_steps = self._project_load_steps(project)
+        QTimer.singleShot(0, self._load_next_batch)
+
+    def _load_next_batch(self):
         try:
-            with open(filename, "r", encoding="utf-8") as f:
-                project = json.load(f)
+            done, total, label = next(self._load_steps)
+        except StopIteration:
+            self._finish_load()
+            return
         except Exception as e:
+            self._set_loading(False)
             QMessageBox.critical(self, "Load Project", f"Error loading project:\n{e}")
             return
 
+        self.progress_bar.setRange(0, max(total, 1))
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"Loading {label}  %v/%m")
+        QTimer.singleShot(0, self._load_next_batch)
+
+    def _project_load_steps(self, project: dict):
+        """
+        Riempie le pagine nell'ordine del wizard, a blocchi di circa
+        LOAD_SLICE_MS; dopo ogni blocco cede il controllo al ciclo degli
+        eventi con yield (righe caricate, righe totali, tabella).
+        _pages_ready = pagine complete: si puo' andare avanti solo fin li'.
+        """
+        tasks = project.get("tasks", []) or []
+        schedule = project.get("schedule", []) or []
+        alarms = project.get("alarms", []) or []
+        total = len(tasks) + len(schedule) + len(alarms)
+        done = 0
+        timings = {}
+
+        def timed(stage, fn, *args):
+            t0 = time.perf_counter()
+            fn(*args)
+            ms = (time.perf_counter() - t0) * 1000.0
+            timings[stage] = timings.get(stage, 0.0) + ms
+            return ms
+
+        def fill(rows, stage, append, label):
+            nonlocal done
+            i, size = 0, 50
+            while i < len(rows):
+                batch = rows[i:i + size]
+                ms = timed(stage, append, batch)
+                i += len(batch)
+                done += len(batch)
+                # prossimo blocco dimensionato sulla durata di questo
+                size = max(10, min(LOAD_BATCH_ROWS, int(len(batch) * LOAD_SLICE_MS / max(ms, 1.0))))
+                yield done, total, label
+
+        # Le pagine non ancora create restano da creare se il progetto non
+        # ha righe per loro: alla prima visita si riempiono dal modello
+        self.project_model.load(project)
+
+        def target(index, rows):
+            if self._pages[index] is None and not rows:
+                return None
+            return self.page(index, fill=False)
+
+        page_tasks = target(PAGE_TASKS, tasks)
+        page_schedule = target(PAGE_SCHEDULE, schedule)
+        page_alarms = target(PAGE_ALARMS, alarms)
+
         # OS
-        os_cfg = project.get("os", {})
-        self.page_os.set_config(os_cfg)
+        timed("set_config", self.page_os.set_config, self.project_model.get("os"))
+        if page_tasks is not None:
+            page_tasks.set_tasks([])
+        if page_schedule is not None:
+            page_schedule.set_schedule_entries([])
+        if page_alarms is not None:
+            page_alarms.set_alarms([])
+        self._pages_ready = 1
+        self.update_buttons()
 
         # Tasks
-        tasks = project.get("tasks", [])
-        self.page_tasks.set_tasks(tasks)
+        if page_tasks is not None:
+            yield from fill(tasks, "set_tasks", page_tasks.append_tasks, "tasks")
 
-        # aggiorna lista task per schedule/alarms
-        self.page_schedule.set_task_list(self.page_tasks.get_tasks())
-        self.page_alarms.set_task_list(self.page_tasks.get_tasks())
+        # catalogo dei task per schedule/alarms
+        timed("set_task_catalog", self.task_catalog.set_tasks,
+              page_tasks.get_tasks() if page_tasks is not None else [])
+        self._pages_ready = 2
+        self.update_buttons()
 
         # Schedule
-        schedule = project.get("schedule", [])
-        self.page_schedule.set_schedule_entries(schedule)
+        if page_schedule is not None:
+            yield from fill(schedule, "set_schedule_entries",
+                            page_schedule.append_schedule_entries, "schedule table")
+            page_schedule.normalize.setChecked(bool(self.project_model.get("normalize_schedule")))
+        self._pages_ready = 3
+        self.update_buttons()
 
         # Alarms
-        alarms = project.get("alarms", [])
-        self.page_alarms.set_alarms(alarms)
+        if page_alarms is not None:
+            yield from fill(alarms, "set_alarms", page_alarms.append_alarms, "alarms")
+        self._pages_ready = 4
+        self.update_buttons()
 
-        # aggiorna Summary se siamo sull'ultima pagina
-        self.update_summary()
-        self.current_project_path = filename
-        QMessageBox.information(self, "Load Project", "Project loaded successfully.")
-        
+        # Summary (se non e' ancora stata visitata, solo i suggerimenti
+        # della pagina OS)
+        if self._pages[PAGE_SUMMARY] is not None:
+            timed("update_summary", self.update_summary)
+        else:
+            timed("update_os_hints", self.update_os_hints)
+
+        counts = {"set_tasks": {"tasks": len(tasks)}, "set_task_catalog": {"tasks": len(tasks)},
+                  "set_schedule_entries": {"schedule": len(schedule)},
+                  "set_alarms": {"alarms": len(alarms)}}
+        for stage, ms in timings.items():
+            self.instrumentation.add(stage, ms, parent=self._load_record, **counts.get(stage, {}))
+            self._load_record["ms"] = round(self._load_record["ms"] + ms, 3)
+
+    def _finish_load(self):
+        self.current_project_path = self._load_filename
+        self._set_loading(False)
+        self._write_env_perf_report()
+        # niente finestra modale: l'utente puo' gia' essere al lavoro su una pagina
+        self.statusBar().showMessage(
+            "Project loaded successfully. " + self.instrumentation.summary_line("load_project")
+        )
+        self.project_loaded.emit()
+
+    # ------------------------------------------------------------------
+    # Report delle misure (JSON)
+    # ------------------------------------------------------------------
+    def _set_trace_memory(self, enabled: bool):
+        self.instrumentation.trace_memory = enabled
+
+    def _write_env_perf_report(self):
+        path = env_report_path()
+        if path:
+            try:
+                self.instrumentation.write_report(path)
+            except OSError as e:
+                self.statusBar().showMessage(f"Cannot write performance report: {e}")
+
+    def save_perf_report(self):
+        filename, _ = QFileDialog.getSaveFileName(
+            self,
+            "Save Performance Report",
+            "",
+            "JSON (*.json);;All Files (*.*)",
+        )
+        if not filename:
+            return
+
+        try:
+            self.instrumentation.write_report(filename)
+        except OSError as e:
+            QMessageBox.critical(self, "Performance Report", f"Error saving report:\n{e}")
 
     # ------------------------------------------------------------------
-    # Avvia animazione e schedula la generazione reale del codice
+    # Avvia la generazione in background (QThreadPool): la GUI resta
+    # reattiva e la progress bar segue i file realmente generati
     # ------------------------------------------------------------------
-    def start_generation_animation(self):
-        # Disabilita i pulsanti durante la generazione
+    def start_generation(self):
+        if not self._confirm_ready_queue():
+            return
+
+        from pathlib import Path
+        from generation_worker import GenerationWorker
+
+        # Disabilita i pulsanti durante la generazione (e Load / Save: il
+        # progetto non deve cambiare mentre il worker lo genera)
         self.btn_next.setEnabled(False)
         self.btn_prev.setEnabled(False)
+        self.act_load.setEnabled(False)
+        self.act_save_as.setEnabled(False)
+        self.btn_cancel.setEnabled(True)
+        self.btn_cancel.setVisible(True)
 
+        self.progress_bar.setRange(0, 100)
         self.progress_bar.setValue(0)
+        self.progress_bar.setFormat("%p%")
         self.progress_bar.setVisible(True)
 
-        self._generation_done = False
-        self._progress_value = 0
-
-        # Timer per animare la progress bar
-        self._progress_timer = QTimer(self)
-        self._progress_timer.timeout.connect(self._update_progress_bar)
-        self._progress_timer.start(60)  # ogni 60 ms aumenta un po'
-
-        # Schedula la vera generazione del codice dopo un attimo
-        # così la UI ha il tempo di ridisegnarsi
-        QTimer.singleShot(80, self._run_generate_code)
-
-    def _run_generate_code(self):
-        # Esegue la vera generazione (OS, Task, Sched, Alarms)
-        self.generate_code()
-        # Segnala al timer che la generazione è conclusa
-        self._generation_done = True
-
-    def _update_progress_bar(self):
-        if not self._generation_done:
-            # Finché generate_code() non ha finito, sali fino al 90%
-            if self._progress_value < 90:
-                self._progress_value += 5
-                self.progress_bar.setValue(self._progress_value)
-        else:
-            # Generazione finita -> porta la barra al 100% e chiudi
-            self._progress_timer.stop()
-            self.progress_bar.setValue(100)
-            QTimer.singleShot(300, self._finish_generation_animation)
-
-    def _finish_generation_animation(self):
+        # I dati vanno letti dai widget nel thread GUI, prima di partire
+        self._worker = GenerationWorker(
+            self.collect_project(),
+            output_dir=str(Path("generated")),
+            templates_dir=str(Path("templates")),
+            instrumentation=self.instrumentation,
+        )
+        self._worker.signals.progress.connect(self._on_generation_progress)
+        self._worker.signals.finished.connect(self._on_generation_finished)
+        self._worker.signals.failed.connect(self._on_generation_failed)
+        self._worker.signals.cancelled.connect(self._on_generation_cancelled)
+        QThreadPool.globalInstance().start(self._worker)
+
+    def cancel_generation(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            self.btn_cancel.setEnabled(False)
+
+    def _on_generation_progress(self, done: int, total: int, label: str):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
+        self.progress_bar.setFormat(f"%v/%m  {label}")
+
+    def _end_generation(self):
+        self._write_env_perf_report()
+        self.statusBar().showMessage(self.instrumentation.summary_line("generate"))
+        self._worker = None
         self.progress_bar.setVisible(False)
+        self.btn_cancel.setVisible(False)
         self.btn_next.setEnabled(True)
         self.btn_prev.setEnabled(True)
+        self.act_load.setEnabled(True)
+        self.act_save_as.setEnabled(True)
 
+    def _on_generation_cancelled(self):
+        self._end_generation()
         QMessageBox.information(
             self,
             "Code Generation",
-            "Configuration code has been generated in the 'generated' folder."
+            "Code generation cancelled, the 'generated' folder was not modified."
         )
 
-    # ------------------------------------------------------------------
-    # Generazione effettiva dei file di configurazione
-    # ------------------------------------------------------------------
-    def generate_code(self):
-        # ---- OS CONFIGURATION (GUI → dict) ----
-        os_config = {
-            "scheduler_freq": self.page_os.scheduler_freq.text(),
-            "tick_ms": self.page_os.tick_ms.text(),
-            "ready_queue": self.page_os.ready_queue.text(),
-        }
-
-        hooks = {
-            "startup": self.page_os.startup_hook.isChecked(),
-            "shutdown": self.page_os.shutdown_hook.isChecked(),
-            "pre_task": self.page_os.pre_task_hook.isChecked(),
-            "post_task": self.page_os.post_task_hook.isChecked(),
-            "error": self.page_os.error_hook.isChecked(),
-        }
-
-        # ---------------- OS CFG ----------------
-        os_template_path = Path("templates") / "os_cfg.h"
-        os_output_path = Path("generated") / "os_cfg.h"
-
-        generate_os_cfg(
-            template_path=str(os_template_path),
-            output_path=str(os_output_path),
-            os_config=os_config,
-            hooks=hooks,
+    def _on_generation_failed(self, errors: dict):
+        self._end_generation()
+        # errori raccolti per famiglia: la cartella generated non e' stata toccata
+        details = "\n".join(f"{family}: {err}" for family, err in errors.items())
+        QMessageBox.critical(
+            self,
+            "Code Generation",
+            "Code generation failed, the 'generated' folder was not modified.\n\n"
+            + details
         )
 
-        # ---------------- TASK CFG ----------------
-        task_rows = self.page_tasks.get_tasks()  # [{id, name, priority}, ...]
+    def _on_generation_finished(self, result: dict):
+        from pathlib import Path
 
-        task_template_h = Path("templates") / "os_task_cfg.h"
-        task_template_c = Path("templates") / "os_task_cfg.c"
-        task_output_h = Path("generated") / "os_task_cfg.h"
-        task_output_c = Path("generated") / "os_task_cfg.c"
+        self._end_generation()
 
-        generate_os_task_cfg(
-            template_h=str(task_template_h),
-            template_c=str(task_template_c),
-            output_h=str(task_output_h),
-            output_c=str(task_output_c),
-            tasks=task_rows,
-        )
-
-        # ---------------- SCHEDULE TABLE CFG ----------------
-        sched_entries = self.page_schedule.get_schedule_entries()
-        # [{"task_id": int, "period_ms": int}, ...]
-
-        sched_template_h = Path("templates") / "os_sched_tbl_cfg.h"
-        sched_template_c = Path("templates") / "os_sched_tbl_cfg.c"
-        sched_output_h = Path("generated") / "os_sched_tbl_cfg.h"
-        sched_output_c = Path("generated") / "os_sched_tbl_cfg.c"
-
-        generate_os_sched_tbl_cfg(
-            template_h=str(sched_template_h),
-            template_c=str(sched_template_c),
-            output_h=str(sched_output_h),
-            output_c=str(sched_output_c),
-            schedule_entries=sched_entries,
-        )
-
-        # ---------------- ALARMS CFG ----------------
-        alarms = self.page_alarms.get_alarms()
+        # Riporta solo i file effettivamente cambiati (gli altri non
+        # sono stati toccati, quindi make non li ricompila)
+        if result["changed"]:
+            changed = "\n".join(Path(p).name for p in result["changed"])
+            details = f"Updated files:\n{changed}"
+        else:
+            details = "All files were already up to date."
+        if result["warnings"]:
+            details += "\n\nWarnings:\n" + "\n".join(result["warnings"])
 
-        alarms_template_h = Path("templates") / "os_alarms_cfg.h"
-        alarms_template_c = Path("templates") / "os_alarms_cfg.c"
-        alarms_output_h = Path("generated") / "os_alarms_cfg.h"
-        alarms_output_c = Path("generated") / "os_alarms_cfg.c"
+        # Durata di ogni fase (generatori + commit), su una riga
+        details += "\n\n" + self.instrumentation.summary_line("generate")
 
-        generate_os_alarms_cfg(
-            template_h=str(alarms_template_h),
-            template_c=str(alarms_template_c),
-            output_h=str(alarms_output_h),
-            output_c=str(alarms_output_c),
-            alarms=alarms,
+        QMessageBox.information(
+            self,
+            "Code Generation",
+            "Configuration code has been generated in the 'generated' folder.\n\n"
+            + details
         )